@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Decode Karşılaştırması - tam çözünürlük / JPEG draft (DCT ölçekleme)
+Her görsel için ön işleme süresini ve decode tamponunun tepe boyutunu ölçer.
+"""
+
+import argparse
+import multiprocessing as mp
+import statistics
+import sys
+import tempfile
+import time
+
+def _peak_rss_mb():
+    """Sürecin tepe RSS değeri (MB), ölçülemezse None"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux KB, macOS bayt döndürür
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        return None
+
+def _decoded_buffer_mb(image_file, max_size, fast_decode):
+    """Decode sırasında bellekte oluşan en büyük görsel tamponu (MB)"""
+    from PIL import Image
+    from image_analysis import ImageUtils
+    
+    with Image.open(image_file) as img:
+        if fast_decode:
+            ImageUtils.draft_for_size(img, max_size)
+        width, height = img.size
+        bands = len(img.getbands())
+    return width * height * bands / (1024 * 1024)
+
+def _run_mode(fast_decode, image_files, max_size, resample, runs, queue):
+    """
+    Tek modu ayrı bir süreçte çalıştır (RSS ölçümü modlar arasında karışmasın)
+    """
+    from image_analysis import ImageUtils
+    
+    per_image = {}
+    for image_file in image_files:
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            ImageUtils.load_image(image_file, max_size, resample, fast_decode)
+            timings.append(time.perf_counter() - start)
+        per_image[image_file] = {
+            'median_ms': statistics.median(timings) * 1000,
+            'buffer_mb': _decoded_buffer_mb(image_file, max_size, fast_decode)
+        }
+    
+    queue.put({
+        'fast_decode': fast_decode,
+        'per_image': per_image,
+        'peak_rss_mb': _peak_rss_mb()
+    })
+
+def _synthetic_images(directory, count):
+    """Kamera boyutunda (24 MP) örnek JPEG'ler üret"""
+    import numpy as np
+    from PIL import Image
+    
+    rng = np.random.default_rng(0)
+    image_files = []
+    for i in range(count):
+        base = rng.integers(0, 255, (60, 90, 3), dtype=np.uint8)
+        image_file = f"{directory}/synthetic_{i}.jpg"
+        Image.fromarray(base).resize((6000, 4000), Image.Resampling.BICUBIC).save(image_file, quality=90)
+        image_files.append(image_file)
+    return image_files
+
+def main():
+    """
+    Komut satırı arayüzü
+    """
+    parser = argparse.ArgumentParser(
+        description="Görsel ön işleme: tam decode ve JPEG draft modunu karşılaştır"
+    )
+    parser.add_argument('--folder', '-f', help='Görsel klasörü (verilmezse 24 MP örnek JPEG üretilir)')
+    parser.add_argument('--max-size', type=int, default=512, help='Hedef maksimum boyut')
+    parser.add_argument('--resample', default='lanczos', help='Küçültme filtresi')
+    parser.add_argument('--runs', type=int, default=5, help='Görsel başına tekrar sayısı')
+    parser.add_argument('--synthetic', type=int, default=3, help='Üretilecek örnek görsel sayısı')
+    
+    args = parser.parse_args()
+    
+    from image_analysis import FileUtils
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.folder:
+            image_files = sorted(FileUtils.find_images_in_directory(args.folder))
+        else:
+            print(f"🖼️ {args.synthetic} adet 6000x4000 örnek JPEG üretiliyor...")
+            image_files = _synthetic_images(tmp_dir, args.synthetic)
+        
+        if not image_files:
+            print(f"❌ {args.folder} klasöründe görsel dosyası bulunamadı")
+            sys.exit(1)
+        
+        print(f"📁 {len(image_files)} görsel, {args.runs} tekrar, "
+              f"max_size={args.max_size}, filtre={args.resample}")
+        
+        ctx = mp.get_context("spawn")
+        results = {}
+        for fast_decode in (False, True):
+            queue = ctx.Queue()
+            process = ctx.Process(
+                target=_run_mode,
+                args=(fast_decode, image_files, args.max_size, args.resample, args.runs, queue)
+            )
+            process.start()
+            results[fast_decode] = queue.get()
+            process.join()
+    
+    full, draft = results[False], results[True]
+    
+    print("\n" + "=" * 84)
+    print(f"{'Görsel':<30}{'Tam (ms)':>10}{'Draft (ms)':>12}{'Hızlanma':>10}"
+          f"{'Tam MB':>11}{'Draft MB':>11}")
+    print("-" * 84)
+    for image_file in image_files:
+        f, d = full['per_image'][image_file], draft['per_image'][image_file]
+        name = image_file.rsplit('/', 1)[-1][:28]
+        print(f"{name:<30}{f['median_ms']:>10.1f}{d['median_ms']:>12.1f}"
+              f"{f['median_ms'] / d['median_ms']:>9.1f}x"
+              f"{f['buffer_mb']:>11.1f}{d['buffer_mb']:>11.1f}")
+    print("-" * 84)
+    for label, r in (("Tam decode", full), ("Draft decode", draft)):
+        rss = f"{r['peak_rss_mb']:.0f} MB" if r['peak_rss_mb'] is not None else "-"
+        print(f"{label:<30}tepe RSS: {rss}")
+    print("=" * 84)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Hassasiyet Karşılaştırması - float32 / bfloat16 / int8
+Her mod için gecikme, bellek (RSS) ve float32'ye göre açıklama sapmasını ölçer.
+"""
+
+import argparse
+import difflib
+import multiprocessing as mp
+import queue as queue_module
+import sys
+import time
+
+def _peak_rss_mb():
+    """Sürecin tepe RSS değeri (MB), ölçülemezse None"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux KB, macOS bayt döndürür
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        return None
+
+def _run_mode(mode, model_name, image_files, runs, queue):
+    """
+    Tek modu ayrı bir süreçte çalıştır (RSS ölçümü modlar arasında karışmasın)
+    """
+    from image_analysis import ImageAnalyzer, ModelConfig, AnalysisConfig
+    
+    if mode == "int8":
+        model_config = ModelConfig(model_name=model_name, device="cpu", quantization="int8")
+    else:
+        model_config = ModelConfig(model_name=model_name, device="cpu", torch_dtype=mode)
+    
+    # Önbellek kapalı: her çalıştırma modeli gerçekten çağırsın
+    analysis_config = AnalysisConfig(show_progress=False, cache_size=0)
+    
+    load_start = time.perf_counter()
+    analyzer = ImageAnalyzer(model_config, analysis_config)
+    load_time = time.perf_counter() - load_start
+    
+    # Isınma
+    analyzer.analyze_image(image_files[0])
+    
+    latencies = []
+    captions = {}
+    for _ in range(runs):
+        for image_file in image_files:
+            start = time.perf_counter()
+            result = analyzer.analyze_image(image_file)
+            latencies.append(time.perf_counter() - start)
+            captions[image_file] = f"{result['title']} | {result['caption']}"
+    
+    latencies.sort()
+    queue.put({
+        'mode': mode,
+        'dtype': analyzer.get_model_info()['dtype'],
+        'load_time': load_time,
+        'mean_latency': sum(latencies) / len(latencies),
+        'p50_latency': latencies[len(latencies) // 2],
+        'peak_rss_mb': _peak_rss_mb(),
+        'captions': captions
+    })
+
+def _collect_result(process, queue, mode, timeout):
+    """
+    Alt sürecin sonucunu bekle; süreç çökerse veya süre dolarsa hata kaydı döndür
+    
+    Model yükleme/quantization sırasında OOM ya da desteklenmeyen backend
+    hatasıyla ölen süreç sonuç yazmaz; sonsuza kadar beklemek yerine
+    exitcode kontrol edilir.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return queue.get(timeout=1.0)
+        except queue_module.Empty:
+            pass
+        
+        if not process.is_alive():
+            # Süreç tam çıkarken yazdığı sonuç kuyrukta olabilir
+            try:
+                return queue.get(timeout=1.0)
+            except queue_module.Empty:
+                return {'mode': mode, 'error': f"süreç sonuç yazmadan çıktı (exitcode {process.exitcode})"}
+        
+        if time.monotonic() > deadline:
+            process.terminate()
+            return {'mode': mode, 'error': f"{timeout:.0f} sn içinde tamamlanmadı"}
+
+def _caption_drift(reference, captions):
+    """float32 referansına göre tam eşleşme oranı ve ortalama metin benzerliği"""
+    exact = 0
+    similarity = 0.0
+    for image_file, ref_caption in reference.items():
+        caption = captions.get(image_file, "")
+        exact += int(caption == ref_caption)
+        similarity += difflib.SequenceMatcher(None, ref_caption, caption).ratio()
+    count = len(reference) or 1
+    return exact / count, similarity / count
+
+def main():
+    """
+    Komut satırı arayüzü
+    """
+    parser = argparse.ArgumentParser(
+        description="BLIP hassasiyet modlarını karşılaştır (CPU)"
+    )
+    parser.add_argument('--folder', '-f', default='captioned_images', help='Görsel klasörü')
+    parser.add_argument('--model', '-m', default='Salesforce/blip-image-captioning-base', help='Model adı')
+    parser.add_argument('--modes', nargs='+', default=['float32', 'bfloat16', 'int8'],
+                        help='Karşılaştırılacak modlar (float32, bfloat16, int8)')
+    parser.add_argument('--runs', type=int, default=3, help='Görsel başına tekrar sayısı')
+    parser.add_argument('--timeout', type=float, default=1800, help='Mod başına en uzun süre (sn)')
+    
+    args = parser.parse_args()
+    
+    from image_analysis import FileUtils
+    image_files = sorted(FileUtils.find_images_in_directory(args.folder))
+    if not image_files:
+        print(f"❌ {args.folder} klasöründe görsel dosyası bulunamadı")
+        sys.exit(1)
+    
+    modes = list(args.modes)
+    if 'float32' not in modes:
+        modes.insert(0, 'float32')
+    
+    print(f"📁 {len(image_files)} görsel, {args.runs} tekrar, modlar: {', '.join(modes)}")
+    
+    ctx = mp.get_context("spawn")
+    results = []
+    failed = []
+    for mode in modes:
+        queue = ctx.Queue()
+        process = ctx.Process(
+            target=_run_mode,
+            args=(mode, args.model, image_files, args.runs, queue)
+        )
+        process.start()
+        result = _collect_result(process, queue, mode, args.timeout)
+        process.join()
+        
+        if 'error' in result:
+            print(f"❌ {mode} modu başarısız: {result['error']}")
+            failed.append(result)
+        else:
+            results.append(result)
+    
+    if not results:
+        print("❌ Hiçbir mod tamamlanamadı")
+        sys.exit(1)
+    
+    # float32 başarısızsa sapma hesaplanamaz
+    reference = next((r['captions'] for r in results if r['mode'] == 'float32'), None)
+    
+    print("\n" + "=" * 86)
+    print(f"{'Mod':<10}{'dtype':<10}{'Yükleme (s)':>12}{'Ort. (ms)':>12}{'p50 (ms)':>12}"
+          f"{'Tepe RSS (MB)':>15}{'Eşleşme':>9}{'Benzerlik':>11}")
+    print("-" * 86)
+    for r in results:
+        rss = f"{r['peak_rss_mb']:.0f}" if r['peak_rss_mb'] is not None else "-"
+        if reference is not None:
+            exact, similarity = _caption_drift(reference, r['captions'])
+            drift = f"{exact:>9.0%}{similarity:>11.3f}"
+        else:
+            drift = f"{'-':>9}{'-':>11}"
+        print(f"{r['mode']:<10}{r['dtype']:<10}{r['load_time']:>12.2f}"
+              f"{r['mean_latency'] * 1000:>12.1f}{r['p50_latency'] * 1000:>12.1f}"
+              f"{rss:>15}{drift}")
+    for r in failed:
+        print(f"{r['mode']:<10}❌ {r['error']}")
+    print("=" * 86)
+
+if __name__ == "__main__":
+    main()
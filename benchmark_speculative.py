@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Spekülatif Üretim Karşılaştırması - düz üretim / taslak model destekli (assisted) üretim
+Aynı istemlerde saniye başına token, gecikme ve çıktı uyuşmasını ölçer.
+"""
+
+import argparse
+import statistics
+import time
+
+DEFAULT_PROMPTS = [
+    "Merhaba, bugün nasılsın?",
+    "Python'da bir listeyi nasıl sıralarım?",
+    "Bana kısa bir hikaye anlatır mısın?",
+    "Yapay zeka gelecekte hangi meslekleri değiştirecek?",
+    "Hafta sonu için bir kitap önerir misin?"
+]
+
+def _run_bot(bot, prompts, runs):
+    """
+    Her istemi runs kez üret; süre ve üretilen token sayısını topla
+    """
+    # Isınma
+    _, inputs = bot._prepare_input(prompts[0])
+    bot._run_generate(inputs)
+    
+    latencies = []
+    total_tokens = 0
+    total_time = 0.0
+    outputs = {}
+    for _ in range(runs):
+        for prompt in prompts:
+            _, inputs = bot._prepare_input(prompt)
+            start = time.perf_counter()
+            sequences = bot._run_generate(inputs)
+            elapsed = time.perf_counter() - start
+            
+            new_tokens = sequences.shape[-1] - inputs.shape[-1]
+            latencies.append(elapsed)
+            total_tokens += new_tokens
+            total_time += elapsed
+            outputs[prompt] = sequences[0, inputs.shape[-1]:].tolist()
+    
+    return {
+        'tokens_per_second': total_tokens / total_time if total_time else 0.0,
+        'p50_latency': statistics.median(latencies),
+        'total_tokens': total_tokens,
+        'outputs': outputs
+    }
+
+def main():
+    """
+    Komut satırı arayüzü
+    """
+    parser = argparse.ArgumentParser(
+        description="Sohbet botu: düz üretim ile taslak model destekli üretimi karşılaştır"
+    )
+    parser.add_argument('--model', default='microsoft/DialoGPT-large', help='Ana model')
+    parser.add_argument('--draft', default='microsoft/DialoGPT-small', help='Taslak model')
+    parser.add_argument('--device', default='cpu', help='Cihaz (cpu/cuda/auto)')
+    parser.add_argument('--max-new-tokens', type=int, default=64, help='Yanıt başına maksimum token')
+    parser.add_argument('--runs', type=int, default=3, help='İstem başına tekrar sayısı')
+    parser.add_argument('--prompt', action='append', help='İstem (birden fazla verilebilir)')
+    
+    args = parser.parse_args()
+    prompts = args.prompt or DEFAULT_PROMPTS
+    
+    from chatbot_module import ChatGPTLikeBot, ChatbotConfig
+    
+    def make_config(draft_model_name=None):
+        # Greedy: iki mod aynı çıktıyı üretmeli, sadece hız farklı olmalı
+        return ChatbotConfig(
+            model_name=args.model,
+            device=args.device,
+            max_new_tokens=args.max_new_tokens,
+            do_sample=False,
+            repetition_penalty=1.0,
+            response_timeout=0,
+            kv_cache_reuse=False,
+            continuous_batching=False,
+            draft_model_name=draft_model_name
+        )
+    
+    print(f"🤖 Ana model: {args.model} - taslak model: {args.draft}")
+    print(f"📝 {len(prompts)} istem, {args.runs} tekrar, max_new_tokens={args.max_new_tokens}")
+    
+    plain_bot = ChatGPTLikeBot(make_config())
+    assisted_bot = ChatGPTLikeBot(make_config(args.draft))
+    
+    results = {
+        'Düz üretim': _run_bot(plain_bot, prompts, args.runs),
+        'Spekülatif': _run_bot(assisted_bot, prompts, args.runs)
+    }
+    
+    plain_bot.close()
+    assisted_bot.close()
+    
+    plain, assisted = results['Düz üretim'], results['Spekülatif']
+    matching = sum(
+        plain['outputs'][prompt] == assisted['outputs'][prompt] for prompt in prompts
+    )
+    
+    print("\n" + "=" * 64)
+    print(f"{'Mod':<20}{'Token/sn':>12}{'p50 (sn)':>12}{'Token':>10}")
+    print("-" * 64)
+    for label, r in results.items():
+        print(f"{label:<20}{r['tokens_per_second']:>12.1f}{r['p50_latency']:>12.2f}"
+              f"{r['total_tokens']:>10}")
+    print("-" * 64)
+    if plain['tokens_per_second']:
+        print(f"Hızlanma: {assisted['tokens_per_second'] / plain['tokens_per_second']:.2f}x")
+    print(f"Aynı çıktı: {matching}/{len(prompts)} istem")
+    print("=" * 64)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Metin İşleme Karşılaştırması - eski alt dizgi taraması / derlenmiş niyet deseni
+Mesaj başına clean_text ve niyet tespiti maliyetini ölçer (tekli ve toplu).
+"""
+
+import argparse
+import random
+import re
+import statistics
+import time
+
+DEFAULT_MESSAGES = [
+    "Merhaba, bugün nasılsın?",
+    "Python'da bir listeyi nasıl sıralarım?",
+    "Bana kısa bir hikaye anlatır mısın",
+    "Yapay zeka gelecekte hangi meslekleri değiştirecek?",
+    "Hafta sonu için bir kitap önerir misin",
+    "Çok teşekkürler, harika oldu!!!",
+    "Görüşürüz, iyi akşamlar",
+    "Bugün neşe dolu bir gün geçirdim",
+    "Bayram tatilinde memlekete gideceğim",
+    "Gene aynı hatayı aldım   ###   ne yapmalıyım"
+]
+
+def _legacy_clean_text(text):
+    """Eski clean_text: desenler her çağrıda re.sub ile çözülür"""
+    text = re.sub(r'\s+', ' ', text.strip())
+    text = re.sub(r'([.!?])\1+', r'\1', text)
+    text = re.sub(r'[^\w\s\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF.,!?;:()"-]', '', text)
+    return text.strip()
+
+def _legacy_extract_intent(text):
+    """Eski extract_intent: kelime listelerinde alt dizgi taraması"""
+    text_lower = text.lower()
+    if any(w in text_lower for w in ['merhaba', 'selam', 'günaydın', 'iyi günler', 'naber', 'nasılsın']):
+        return 'greeting'
+    if any(w in text_lower for w in ['görüşürüz', 'bay', 'güle güle', 'hoşça kal', 'elveda']):
+        return 'farewell'
+    if any(w in text_lower for w in ['nasıl', 'ne', 'neden', 'nerede', 'kim', 'hangi', 'kaç']) or text.endswith('?'):
+        return 'question'
+    if any(w in text_lower for w in ['yardım', 'help', 'nasıl yapılır', 'öğren', 'anlat']):
+        return 'help_request'
+    if any(w in text_lower for w in ['teşekkür', 'sağol', 'mersi', 'thanks']):
+        return 'thanks'
+    return 'general'
+
+def _per_message_us(func, messages, runs):
+    """func'ı tüm mesajlarda runs kez çalıştır; mesaj başına medyan süre (µs)"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(messages)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) / len(messages) * 1e6
+
+def main():
+    """
+    Komut satırı arayüzü
+    """
+    parser = argparse.ArgumentParser(
+        description="ChatUtils: eski metin işleme ile derlenmiş niyet desenini karşılaştır"
+    )
+    parser.add_argument('--messages', type=int, default=10000, help='Ölçülecek mesaj sayısı')
+    parser.add_argument('--runs', type=int, default=5, help='Tekrar sayısı')
+    parser.add_argument('--message', action='append', help='Örnek mesaj (birden fazla verilebilir)')
+    
+    args = parser.parse_args()
+    samples = args.message or DEFAULT_MESSAGES
+    
+    from chatbot_module import ChatUtils
+    
+    rng = random.Random(0)
+    messages = [rng.choice(samples) for _ in range(args.messages)]
+    
+    print(f"📝 {len(messages)} mesaj ({len(samples)} farklı örnek), {args.runs} tekrar")
+    
+    results = {
+        'clean_text (eski)': _per_message_us(
+            lambda ms: [_legacy_clean_text(m) for m in ms], messages, args.runs),
+        'clean_text': _per_message_us(
+            lambda ms: [ChatUtils.clean_text(m) for m in ms], messages, args.runs),
+        'extract_intent (eski)': _per_message_us(
+            lambda ms: [_legacy_extract_intent(m) for m in ms], messages, args.runs),
+        'extract_intent': _per_message_us(
+            lambda ms: [ChatUtils.extract_intent(m) for m in ms], messages, args.runs),
+        'extract_intents (toplu)': _per_message_us(
+            ChatUtils.extract_intents, messages, args.runs)
+    }
+    
+    print("\n" + "=" * 64)
+    print(f"{'İşlem':<32}{'µs/mesaj':>12}{'Mesaj/sn':>16}")
+    print("-" * 64)
+    for label, us in results.items():
+        print(f"{label:<32}{us:>12.2f}{1e6 / us:>16,.0f}")
+    print("-" * 64)
+    
+    changed = [
+        (m, _legacy_extract_intent(m), ChatUtils.extract_intent(m)) for m in samples
+        if _legacy_extract_intent(m) != ChatUtils.extract_intent(m)
+    ]
+    print(f"Niyeti değişen örnek: {len(changed)}/{len(samples)}")
+    for message, old, new in changed:
+        print(f"  {message[:40]:<42}{old} → {new}")
+    print("=" * 64)
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,9 @@
 ChatGPT benzeri sohbet botu için Gradio arayüzü
 """
 
+from model_loader import BackgroundLoader, mark_startup, startup_timings
 import gradio as gr
-from chatbot_module import ChatGPTLikeBot, ModelPresets, ConversationManager
-from image_analysis import ImageAnalyzer
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Iterator
 import json
 import os
 
@@ -15,81 +14,133 @@ conversation_manager = None
 image_analyzer = None
 current_conversation_id = None
 
+def _load_chatbot():
+    """Varsayılan sohbet botunu yükle"""
+    from chatbot_module import ChatGPTLikeBot, ModelPresets
+    return ChatGPTLikeBot(ModelPresets.conversational_model())
+
+def _load_conversation_manager():
+    """Konuşma yöneticisini ve varsayılan botları yükle"""
+    from chatbot_module import ConversationManager, ModelPresets
+    
+    manager = ConversationManager()
+    # Varsayılan botları oluştur
+    manager.create_bot("assistant", ModelPresets.helpful_assistant())
+    manager.create_bot("creative", ModelPresets.creative_writer())
+    manager.create_bot("technical", ModelPresets.technical_expert())
+    
+    # Aynı modeli kullanan botlar ağırlıkları paylaşır
+    for stats in manager.get_model_stats():
+        print(f"🧠 {stats['model_name']} ({stats['device']}, {stats['dtype']}): "
+              f"{stats['refcount']} bot, {stats['memory_mb']:.0f} MB")
+    return manager
+
+def _warmup_conversation_manager(manager):
+    """Paylaşılan her modeli bir kez ısıt"""
+    warmed = set()
+    for bot_id in manager.list_bots():
+        bot = manager.get_bot(bot_id)
+        if bot.model_key not in warmed:
+            bot.warmup()
+            warmed.add(bot.model_key)
+
+def _load_image_analyzer():
+    """Görsel analiz kuyruğunu yükle"""
+    from image_analysis import ImageAnalyzer, MicroBatcher
+    return MicroBatcher(ImageAnalyzer())
+
+# Modeller arka planda yüklenir; sunucu beklemeden dinlemeye başlar
+chatbot_loader = BackgroundLoader("Sohbet botu", _load_chatbot, lambda bot: bot.warmup())
+conversation_loader = BackgroundLoader(
+    "Sohbet botları", _load_conversation_manager, _warmup_conversation_manager
+)
+image_analyzer_loader = BackgroundLoader(
+    "Görsel analiz", _load_image_analyzer, lambda batcher: batcher.analyzer.warmup()
+)
+
 def initialize_chatbot():
     """
-    Sohbet botunu başlat
+    Sohbet botunu başlat (hazır değilse yüklenmesini bekle)
     """
     global chatbot
-    if chatbot is None:
-        config = ModelPresets.conversational_model()
-        chatbot = ChatGPTLikeBot(config)
+    chatbot = chatbot_loader.get()
     return chatbot
 
 def initialize_conversation_manager():
     """
-    Konuşma yöneticisini başlat
+    Konuşma yöneticisini başlat (hazır değilse yüklenmesini bekle)
     """
     global conversation_manager
-    if conversation_manager is None:
-        conversation_manager = ConversationManager()
-        # Varsayılan botları oluştur
-        conversation_manager.create_bot("assistant", ModelPresets.helpful_assistant())
-        conversation_manager.create_bot("creative", ModelPresets.creative_writer())
-        conversation_manager.create_bot("technical", ModelPresets.technical_expert())
+    conversation_manager = conversation_loader.get()
     return conversation_manager
 
 def initialize_image_analyzer():
     """
-    Görsel analiz botunu başlat
+    Görsel analiz botunu başlat (hazır değilse yüklenmesini bekle)
     """
     global image_analyzer
-    if image_analyzer is None:
-        from image_analysis import ImageAnalyzer
-        image_analyzer = ImageAnalyzer()
+    image_analyzer = image_analyzer_loader.get()
     return image_analyzer
 
-def chat_with_bot(message: str, chat_history: List[Tuple[str, str]], bot_type: str = "assistant") -> Tuple[List[Tuple[str, str]], str]:
+def get_loader_status() -> str:
     """
-    Sohbet botu ile konuşma
+    Model yükleyicilerinin hazır olma durumu ve başlangıç süreleri
+    
+    Returns:
+        str: HTML durum satırları
+    """
+    lines = [
+        f"<p>{loader.describe()}</p>"
+        for loader in (chatbot_loader, conversation_loader, image_analyzer_loader)
+    ]
+    for event, seconds in startup_timings().items():
+        lines.append(f"<p><b>⏱️ Başlangıç → {event}:</b> {seconds:.1f} sn</p>")
+    return "\n".join(lines)
+
+def chat_with_bot(message: str, chat_history: List[Tuple[str, str]], bot_type: str = "assistant") -> Iterator[Tuple[List[Tuple[str, str]], str]]:
+    """
+    Sohbet botu ile konuşma (yanıt üretildikçe akışlı güncellenir)
     
     Args:
         message (str): Kullanıcı mesajı
         chat_history (List): Sohbet geçmişi
         bot_type (str): Bot türü
         
-    Returns:
+    Yields:
         Tuple: Güncellenmiş sohbet geçmişi ve boş input
     """
     try:
         if not message.strip():
-            return chat_history, ""
+            yield chat_history, ""
+            return
         
         # Conversation manager'ı başlat
         manager = initialize_conversation_manager()
         
-        # Bot ile sohbet et
-        response = manager.chat_with_bot(bot_type, message)
-        
-        # Sohbet geçmişini güncelle
-        chat_history.append((message, response))
-        
-        return chat_history, ""
+        # Bot ile sohbet et, kısmi yanıtı son satırda güncelle
+        chat_history.append((message, ""))
+        for partial_response in manager.chat_stream_with_bot(bot_type, message):
+            chat_history[-1] = (message, partial_response)
+            yield chat_history, ""
         
     except Exception as e:
         error_response = f"Üzgünüm, bir hata oluştu: {str(e)}"
-        chat_history.append((message, error_response))
-        return chat_history, ""
+        if chat_history and chat_history[-1][0] == message:
+            chat_history[-1] = (message, error_response)
+        else:
+            chat_history.append((message, error_response))
+        yield chat_history, ""
 
-def analyze_image_and_chat(image, message: str, chat_history: List[Tuple[str, str]]) -> Tuple[List[Tuple[str, str]], str]:
+def analyze_image_and_chat(image, message: str, chat_history: List[Tuple[str, str]]) -> Iterator[Tuple[List[Tuple[str, str]], str]]:
     """
-    Görsel analiz et ve sohbet et
+    Görsel analiz et ve sohbet et (yanıt akışlı güncellenir)
     
     Args:
         image: Yüklenen görsel
         message (str): Kullanıcı mesajı
         chat_history (List): Sohbet geçmişi
         
-    Returns:
+    Yields:
         Tuple: Güncellenmiş sohbet geçmişi ve boş input
     """
     try:
@@ -97,6 +148,7 @@ def analyze_image_and_chat(image, message: str, chat_history: List[Tuple[str, st
         if image is not None:
             img_analyzer = initialize_image_analyzer()
             result = img_analyzer.analyze_image(image)
+            user_label = f"📸 [Görsel yüklendi] {message}" if message else "📸 [Görsel yüklendi]"
             
             if result['success']:
                 image_description = f"📸 Görsel Analizi:\n🏷️ Başlık: {result['title']}\n📝 Açıklama: {result['caption']}"
@@ -109,23 +161,26 @@ def analyze_image_and_chat(image, message: str, chat_history: List[Tuple[str, st
                 
                 # Chatbot ile konuş
                 manager = initialize_conversation_manager()
-                response = manager.chat_with_bot("assistant", combined_message)
-                
-                chat_history.append((f"📸 [Görsel yüklendi] {message}" if message else "📸 [Görsel yüklendi]", response))
+                chat_history.append((user_label, ""))
+                for partial_response in manager.chat_stream_with_bot("assistant", combined_message):
+                    chat_history[-1] = (user_label, partial_response)
+                    yield chat_history, ""
+                return
             else:
                 error_msg = "Görsel analiz edilemedi. Lütfen başka bir görsel deneyin."
-                chat_history.append((f"📸 [Görsel yüklendi] {message}" if message else "📸 [Görsel yüklendi]", error_msg))
+                chat_history.append((user_label, error_msg))
         else:
             # Sadece metin mesajı
             if message.strip():
-                return chat_with_bot(message, chat_history)
+                yield from chat_with_bot(message, chat_history)
+                return
         
-        return chat_history, ""
+        yield chat_history, ""
         
     except Exception as e:
         error_response = f"Hata oluştu: {str(e)}"
         chat_history.append((f"📸 [Görsel] {message}" if message else "📸 [Görsel]", error_response))
-        return chat_history, ""
+        yield chat_history, ""
 
 def get_conversation_list() -> str:
     """
@@ -136,13 +191,13 @@ def get_conversation_list() -> str:
     """
     try:
         bot = initialize_chatbot()
-        conversations = bot.get_conversation_list()
+        conversations = bot.get_conversation_list(limit=10)  # Son 10 konuşma
         
         if not conversations:
             return "Henüz konuşma yok."
         
         formatted_list = "📋 **Konuşma Geçmişi:**\n\n"
-        for conv in conversations[:10]:  # Son 10 konuşma
+        for conv in conversations:
             title = conv['title'][:50] + "..." if len(conv['title']) > 50 else conv['title']
             date = conv['created_at'][:19].replace('T', ' ')
             formatted_list += f"• **{title}**\n  📅 {date}\n\n"
@@ -152,6 +207,39 @@ def get_conversation_list() -> str:
     except Exception as e:
         return f"Konuşma listesi alınamadı: {str(e)}"
 
+def search_conversations(query: str) -> str:
+    """
+    Konuşma geçmişinde ara
+    
+    Args:
+        query (str): Arama metni
+    
+    Returns:
+        str: Formatlanmış arama sonuçları
+    """
+    if not query or not query.strip():
+        return get_conversation_list()
+    
+    try:
+        bot = initialize_chatbot()
+        results = bot.search_conversations(query.strip(), limit=20)
+        
+        if not results:
+            return f"🔎 \"{query.strip()}\" için sonuç bulunamadı."
+        
+        formatted_list = f"🔎 **Arama Sonuçları ({len(results)}):**\n\n"
+        for result in results:
+            title = result['title'][:50] + "..." if len(result['title']) > 50 else result['title']
+            content = result['content'][:120] + "..." if len(result['content']) > 120 else result['content']
+            speaker = "👤" if result['role'] == 'user' else "🤖"
+            date = result['timestamp'][:19].replace('T', ' ')
+            formatted_list += f"• **{title}**\n  {speaker} {content}\n  📅 {date}\n\n"
+        
+        return formatted_list
+        
+    except Exception as e:
+        return f"Arama yapılamadı: {str(e)}"
+
 def clear_conversation() -> Tuple[List, str]:
     """
     Konuşmayı temizle
@@ -254,7 +342,15 @@ def create_chatbot_interface():
                 stats_display = gr.HTML()
                 refresh_stats_btn = gr.Button("🔄 Yenile", variant="secondary")
                 
-                # Konuşma geçmişi
+                # Konuşma geçmişi ve arama
+                with gr.Row():
+                    search_input = gr.Textbox(
+                        label="🔎 Geçmişte Ara",
+                        placeholder="Kelime yazın (ör. kitap önerisi)",
+                        scale=4
+                    )
+                    search_btn = gr.Button("🔎 Ara", variant="secondary", scale=1)
+                
                 conversation_history = gr.Textbox(
                     label="📋 Konuşma Geçmişi",
                     lines=15,
@@ -288,6 +384,19 @@ def create_chatbot_interface():
             outputs=conversation_history
         )
         
+        # Geçmişte arama
+        search_btn.click(
+            search_conversations,
+            inputs=search_input,
+            outputs=conversation_history
+        )
+        
+        search_input.submit(
+            search_conversations,
+            inputs=search_input,
+            outputs=conversation_history
+        )
+        
         # Görsel analiz
         analyze_btn.click(
             analyze_image_and_chat,
@@ -298,15 +407,39 @@ def create_chatbot_interface():
         # İstatistik yenileme
         def update_stats():
             try:
+                # Yükleme sürerken sayfayı bekletme; sadece durumu göster
+                if not chatbot_loader.is_ready:
+                    return f"""
+                    <div style="padding: 15px; background: #fff8dc; border-radius: 10px;">
+                        <h4>⏳ Modeller Yükleniyor</h4>
+                        {get_loader_status()}
+                    </div>
+                    """
+                
                 bot = initialize_chatbot()
                 info = bot.get_model_info()
                 
+                # Akışlı yanıtların ilk token süreleri (bot başına)
+                ttft_html = ""
+                if conversation_manager is not None:
+                    for bot_id in conversation_manager.list_bots():
+                        generation_stats = conversation_manager.get_bot(bot_id).get_generation_stats()
+                        if generation_stats['avg_ttft_ms'] is not None:
+                            ttft_html += (
+                                f"<p><b>⏱️ {bot_id} ilk token:</b> "
+                                f"ort. {generation_stats['avg_ttft_ms']:.0f} ms, "
+                                f"p50 {generation_stats['p50_ttft_ms']:.0f} ms "
+                                f"({generation_stats['streamed_responses']} yanıt)</p>"
+                            )
+                
                 stats_html = f"""
                 <div style="padding: 15px; background: #f0f8ff; border-radius: 10px;">
                     <h4>🤖 Model Bilgileri</h4>
                     <p><b>Model:</b> {info['model_name']}</p>
                     <p><b>Device:</b> {info['device']}</p>
                     <p><b>CUDA:</b> {'✅ Mevcut' if info['cuda_available'] else '❌ Mevcut değil'}</p>
+                    {ttft_html}
+                    {get_loader_status()}
                 </div>
                 """
                 return stats_html
@@ -329,23 +462,40 @@ def create_chatbot_interface():
 def launch_chatbot_app(
     server_name: str = "0.0.0.0",
     server_port: int = 7861,
-    share: bool = False
+    share: bool = False,
+    concurrency_limit: int = 8
 ):
     """
     Sohbet botu uygulamasını başlat
     
+    Modeller arka planda yüklenir; sunucu yükleme bitmeden dinlemeye başlar
+    ve ilk istekler modeller hazır olana kadar bekler.
+    
     Args:
         server_name (str): Sunucu adı
         server_port (int): Port numarası
         share (bool): Public link oluştur
+        concurrency_limit (int): Eşzamanlı istek sayısı (ChatbotConfig.max_batch_size)
     """
     print("🚀 ChatGPT Benzeri Sohbet Botu başlatılıyor...")
     
+    conversation_loader.start()
+    chatbot_loader.start()
+    
     interface = create_chatbot_interface()
     
+    # Akışlı (generator) yanıtlar kuyruk üzerinden iletilir; eşzamanlı
+    # istekler modelin batch zamanlayıcısında tek batch'te birleşir
+    interface.queue(default_concurrency_limit=concurrency_limit)
+    
     interface.launch(
         server_name=server_name,
         server_port=server_port,
         share=share,
-        show_api=False
-    )
\ No newline at end of file
+        show_api=False,
+        prevent_thread_lock=True
+    )
+    
+    # Modeller hâlâ yüklenirken sunucu istek kabul ediyor
+    mark_startup("dinleme")
+    interface.block_thread()
@@ -13,7 +13,12 @@ Kullanım:
 
 from .chatbot import ChatGPTLikeBot, ConversationManager
 from .config import ChatbotConfig, ModelPresets
-from .utils import ChatUtils, ConversationHistory
+from .utils import ChatUtils, ConversationHistory, IntentMatcher
+from .storage import ConversationStore
+from .retention import ConversationArchive, RetentionManager
+from .registry import ModelRegistry, model_registry
+from .kv_cache import ConversationKVCache
+from .batching import ContinuousBatcher
 from .exceptions import ChatbotError, ModelLoadError
 
 __version__ = "1.0.0"
@@ -27,7 +32,15 @@ __all__ = [
     'ChatbotConfig',
     'ModelPresets',
     'ChatUtils',
+    'IntentMatcher',
     'ConversationHistory',
+    'ConversationStore',
+    'ConversationArchive',
+    'RetentionManager',
+    'ModelRegistry',
+    'model_registry',
+    'ConversationKVCache',
+    'ContinuousBatcher',
     'ChatbotError',
     'ModelLoadError'
 ]
@@ -0,0 +1,399 @@
+"""
+Sürekli (iterasyon düzeyinde) toplu üretim - Eşzamanlı sohbet isteklerini tek batch'te birleştirir
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+import torch
+import torch.nn.functional as F
+from transformers import (
+    LogitsProcessorList,
+    RepetitionPenaltyLogitsProcessor,
+    TemperatureLogitsWarper,
+    TopKLogitsWarper,
+    TopPLogitsWarper
+)
+
+logger = logging.getLogger(__name__)
+
+class _Sequence:
+    """Batch'teki tek bir isteğin durumu"""
+    
+    def __init__(
+        self,
+        input_ids: torch.Tensor,
+        generation_kwargs: Dict[str, Any],
+        past_key_values=None,
+        deadline: Optional[float] = None
+    ):
+        self.input_ids = input_ids
+        self.tokens: List[int] = input_ids[0].tolist()
+        self.past_key_values = past_key_values
+        self.future: Future = Future()
+        self.generated = 0
+        self.finished = False
+        self.deadline = deadline
+        self.timed_out = False
+        
+        self.streamer = generation_kwargs.get('streamer')
+        self.max_new_tokens = generation_kwargs.get('max_new_tokens', 100)
+        self.eos_token_id = generation_kwargs.get('eos_token_id')
+        self.do_sample = generation_kwargs.get('do_sample', False)
+        
+        # model.generate ile aynı sıra: önce ceza, sonra örnekleme dönüştürücüleri
+        self.processors = LogitsProcessorList()
+        repetition_penalty = generation_kwargs.get('repetition_penalty', 1.0)
+        if repetition_penalty != 1.0:
+            self.processors.append(RepetitionPenaltyLogitsProcessor(repetition_penalty))
+        if self.do_sample:
+            temperature = generation_kwargs.get('temperature', 1.0)
+            top_k = generation_kwargs.get('top_k', 0)
+            top_p = generation_kwargs.get('top_p', 1.0)
+            if temperature != 1.0:
+                self.processors.append(TemperatureLogitsWarper(temperature))
+            if top_k:
+                self.processors.append(TopKLogitsWarper(top_k))
+            if top_p < 1.0:
+                self.processors.append(TopPLogitsWarper(top_p))
+        
+        if self.streamer is not None:
+            self.streamer.put(input_ids.cpu())
+    
+    def next_token(self, logits: torch.Tensor) -> None:
+        """Son adımın logit'lerinden sıradaki token'ı seç"""
+        ids = torch.tensor([self.tokens], device=logits.device)
+        scores = self.processors(ids, logits.float())
+        
+        if self.do_sample:
+            token = torch.multinomial(F.softmax(scores, dim=-1), num_samples=1)
+        else:
+            token = torch.argmax(scores, dim=-1)
+        token = int(token.reshape(-1)[0])
+        
+        self.tokens.append(token)
+        self.generated += 1
+        if self.streamer is not None:
+            self.streamer.put(torch.tensor([token]))
+        
+        self.finished = token == self.eos_token_id or self.generated >= self.max_new_tokens
+        if not self.finished and self.expired():
+            self.finished = self.timed_out = True
+    
+    def expired(self) -> bool:
+        """Süre sınırı geçti mi?"""
+        return self.deadline is not None and time.monotonic() >= self.deadline
+    
+    def complete(self, past_key_values) -> None:
+        """Sonucu çağırana ilet"""
+        if self.streamer is not None:
+            self.streamer.end()
+        sequence = torch.tensor([self.tokens], device=self.input_ids.device)
+        self.future.set_result((sequence, past_key_values, self.timed_out))
+    
+    def fail(self, error: Exception) -> None:
+        """Hatayı çağırana ilet"""
+        if self.streamer is not None:
+            self.streamer.end()
+        if not self.future.done():
+            self.future.set_exception(error)
+
+class ContinuousBatcher:
+    """
+    Aynı model üzerindeki eşzamanlı üretimleri tek batch'te yürüten zamanlayıcı
+    
+    Her adımda aktif dizilerin son token'ları tek bir forward ile işlenir.
+    Biten diziler batch'ten hemen çıkarılır, bekleyen istekler bir sonraki
+    adımda kabul edilir (iterasyon düzeyinde batching). Farklı uzunluktaki
+    diziler KV önbelleğinde soldan doldurulur ve attention mask ile gizlenir.
+    """
+    
+    def __init__(self, model, max_batch_size: int = 8):
+        """
+        Zamanlayıcıyı başlat
+        
+        Args:
+            model: Causal LM modeli
+            max_batch_size (int): Aynı anda işlenecek en fazla dizi
+        """
+        self.model = model
+        self.max_batch_size = max(1, max_batch_size)
+        
+        self._cond = threading.Condition()
+        self._waiting: "deque[_Sequence]" = deque()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        
+        # Sadece zamanlayıcı thread'i tarafından kullanılır
+        self._active: List[_Sequence] = []
+        self._layers: Optional[List[List[torch.Tensor]]] = None
+        self._mask: Optional[torch.Tensor] = None
+        
+        self.requests = 0
+        self.steps = 0
+        self.batched_rows = 0
+        self.peak_batch_size = 0
+    
+    def generate(
+        self,
+        input_ids: torch.Tensor,
+        generation_kwargs: Dict[str, Any],
+        past_key_values=None,
+        deadline: Optional[float] = None
+    ) -> Tuple[torch.Tensor, Any, bool]:
+        """
+        İsteği batch'e ekle ve bitmesini bekle
+        
+        Args:
+            input_ids (torch.Tensor): Tam giriş token'ları (1 x N)
+            generation_kwargs (dict): Üretim parametreleri (streamer dahil)
+            past_key_values: Girişin önekine ait önbellek (opsiyonel)
+            deadline (float, optional): time.monotonic() cinsinden son an
+        
+        Returns:
+            Tuple: (giriş + üretilen token'lar, dizinin past_key_values değeri,
+                süre sınırı aşıldı mı)
+        """
+        return self.submit(input_ids, generation_kwargs, past_key_values, deadline).result()
+    
+    def submit(
+        self,
+        input_ids: torch.Tensor,
+        generation_kwargs: Dict[str, Any],
+        past_key_values=None,
+        deadline: Optional[float] = None
+    ) -> Future:
+        """
+        İsteği kuyruğa ekle
+        
+        Süre sınırı geçtiğinde dizi o ana kadar üretilen token'larla
+        tamamlanır; sınır kuyrukta beklerken geçerse hiç token üretilmez.
+        
+        Args:
+            input_ids (torch.Tensor): Tam giriş token'ları (1 x N)
+            generation_kwargs (dict): Üretim parametreleri (streamer dahil)
+            past_key_values: Girişin önekine ait önbellek (opsiyonel)
+            deadline (float, optional): time.monotonic() cinsinden son an
+        
+        Returns:
+            Future: (token'lar, past_key_values, süre aşımı) sonucunu taşıyan future
+        """
+        sequence = _Sequence(input_ids, generation_kwargs, past_key_values, deadline)
+        
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Batch zamanlayıcısı kapatıldı")
+            
+            self._waiting.append(sequence)
+            self.requests += 1
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="continuous-batcher", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+        
+        return sequence.future
+    
+    def close(self) -> None:
+        """Bekleyen istekleri iptal et ve zamanlayıcıyı durdur"""
+        with self._cond:
+            self._closed = True
+            waiting = list(self._waiting)
+            self._waiting.clear()
+            self._cond.notify()
+        
+        for sequence in waiting:
+            sequence.fail(RuntimeError("Batch zamanlayıcısı kapatıldı"))
+        
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+    
+    def _run(self) -> None:
+        """Zamanlayıcı döngüsü: kabul et, bir adım üret, bitenleri çıkar"""
+        while True:
+            with self._cond:
+                while not self._waiting and not self._active and not self._closed:
+                    self._cond.wait()
+                
+                if self._closed and not self._active:
+                    return
+                
+                admitted = []
+                while self._waiting and len(self._active) + len(admitted) < self.max_batch_size:
+                    admitted.append(self._waiting.popleft())
+            
+            with torch.no_grad():
+                for sequence in admitted:
+                    self._admit(sequence)
+                
+                if self._active:
+                    self._step()
+    
+    def _admit(self, sequence: _Sequence) -> None:
+        """Yeni diziyi tek başına prefill et ve batch önbelleğine ekle"""
+        if sequence.expired():
+            # Kuyrukta beklerken süre doldu; önbellek değişmeden geri verilir
+            sequence.timed_out = True
+            sequence.complete(sequence.past_key_values)
+            return
+        
+        try:
+            past = sequence.past_key_values
+            past_length = 0 if past is None else self._seq_length(past)
+            total_length = sequence.input_ids.shape[-1]
+            device = sequence.input_ids.device
+            
+            outputs = self.model(
+                input_ids=sequence.input_ids[:, past_length:],
+                past_key_values=self._model_cache(past),
+                attention_mask=torch.ones((1, total_length), dtype=torch.long, device=device),
+                position_ids=torch.arange(past_length, total_length, device=device).unsqueeze(0),
+                use_cache=True
+            )
+            layers = self._to_layers(outputs.past_key_values)
+            sequence.past_key_values = None
+            sequence.next_token(outputs.logits[:, -1, :])
+        except Exception as e:
+            logger.error(f"❌ Prefill hatası: {str(e)}")
+            sequence.fail(e)
+            return
+        
+        if sequence.finished:
+            sequence.complete(self._model_cache(layers))
+            return
+        
+        mask = torch.ones((1, total_length), dtype=torch.long, device=device)
+        if self._layers is None:
+            self._layers, self._mask = layers, mask
+        else:
+            # Kısa olan taraf soldan doldurulur
+            width = max(self._mask.shape[1], total_length)
+            self._layers = [
+                [
+                    torch.cat([self._left_pad(old, width), self._left_pad(new, width)], dim=0)
+                    for old, new in zip(old_layer, new_layer)
+                ]
+                for old_layer, new_layer in zip(self._layers, layers)
+            ]
+            self._mask = torch.cat([
+                F.pad(self._mask, (width - self._mask.shape[1], 0)),
+                F.pad(mask, (width - total_length, 0))
+            ], dim=0)
+        self._active.append(sequence)
+    
+    def _step(self) -> None:
+        """Aktif dizilerin hepsi için tek token üret"""
+        active = self._active
+        try:
+            device = self._mask.device
+            input_ids = torch.tensor([[s.tokens[-1]] for s in active], device=device)
+            mask = torch.cat([self._mask, self._mask.new_ones((len(active), 1))], dim=1)
+            
+            outputs = self.model(
+                input_ids=input_ids,
+                past_key_values=self._model_cache(self._layers),
+                attention_mask=mask,
+                position_ids=mask.sum(dim=1, keepdim=True) - 1,
+                use_cache=True
+            )
+            self._layers = self._to_layers(outputs.past_key_values)
+            self._mask = mask
+            
+            logits = outputs.logits[:, -1, :]
+            for i, sequence in enumerate(active):
+                sequence.next_token(logits[i:i + 1])
+        except Exception as e:
+            logger.error(f"❌ Batch üretim hatası: {str(e)}")
+            for sequence in active:
+                sequence.fail(e)
+            self._active, self._layers, self._mask = [], None, None
+            return
+        
+        self.steps += 1
+        self.batched_rows += len(active)
+        self.peak_batch_size = max(self.peak_batch_size, len(active))
+        
+        keep = [i for i, sequence in enumerate(active) if not sequence.finished]
+        if len(keep) == len(active):
+            return
+        
+        for i, sequence in enumerate(active):
+            if sequence.finished:
+                length = int(self._mask[i].sum())
+                # Kopya: dilim tüm batch'in belleğini KV önbelleğinde canlı tutmasın
+                sequence.complete(self._model_cache([
+                    [tensor[i:i + 1, :, -length:, :].clone() for tensor in layer]
+                    for layer in self._layers
+                ]))
+        
+        if not keep:
+            self._active, self._layers, self._mask = [], None, None
+            return
+        
+        # Biten satırları çıkar, tamamen dolgu olan sol sütunları kırp
+        index = torch.tensor(keep, device=self._mask.device)
+        mask = self._mask.index_select(0, index)
+        start = int((mask.sum(dim=0) > 0).nonzero()[0])
+        self._mask = mask[:, start:]
+        self._layers = [
+            [tensor.index_select(0, index)[:, :, start:, :] for tensor in layer]
+            for layer in self._layers
+        ]
+        self._active = [active[i] for i in keep]
+    
+    @staticmethod
+    def _left_pad(tensor: torch.Tensor, width: int) -> torch.Tensor:
+        """(B, H, T, D) önbellek tensörünü T ekseninde soldan sıfırla doldur"""
+        return F.pad(tensor, (0, 0, width - tensor.shape[-2], 0))
+    
+    @staticmethod
+    def _seq_length(past) -> int:
+        """Önbellekteki token sayısı"""
+        if hasattr(past, 'get_seq_length'):
+            return past.get_seq_length()
+        return past[0][0].shape[-2]
+    
+    @staticmethod
+    def _to_layers(past) -> List[List[torch.Tensor]]:
+        """Model önbelleğini katman başına [key, value] listesine çevir"""
+        if hasattr(past, 'to_legacy_cache'):
+            past = past.to_legacy_cache()
+        return [list(layer) for layer in past]
+    
+    def _model_cache(self, layers):
+        """Katman listesini modelin beklediği önbellek biçimine çevir"""
+        if layers is None:
+            return None
+        if not isinstance(layers, (list, tuple)):
+            return layers
+        
+        legacy = tuple(tuple(layer) for layer in layers)
+        if getattr(self.model, '_supports_cache_class', False):
+            from transformers import DynamicCache
+            return DynamicCache.from_legacy_cache(legacy)
+        return legacy
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Zamanlayıcı istatistikleri
+        
+        Returns:
+            dict: İstek/adım sayıları ve ortalama batch boyutu
+        """
+        with self._cond:
+            waiting = len(self._waiting)
+        
+        return {
+            'requests': self.requests,
+            'steps': self.steps,
+            'avg_batch_size': self.batched_rows / self.steps if self.steps else 0.0,
+            'peak_batch_size': self.peak_batch_size,
+            'active': len(self._active),
+            'waiting': waiting,
+            'max_batch_size': self.max_batch_size
+        }
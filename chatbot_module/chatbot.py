@@ -3,14 +3,26 @@ Ana ChatGPT benzeri sohbet botu sınıfı
 """
 
 import torch
-from transformers import AutoTokenizer, AutoModelForCausalLM, GPT2LMHeadModel, GPT2Tokenizer
-from typing import Optional, Dict, Any, List
+from transformers import (
+    AutoTokenizer, 
+    AutoModelForCausalLM, 
+    GPT2LMHeadModel, 
+    GPT2Tokenizer, 
+    TextIteratorStreamer
+)
+from collections import deque
+from typing import Optional, Dict, Any, List, Iterator, Tuple
+from contextlib import contextmanager
 import logging
+import queue
 import time
 import threading
 
 from .config import ChatbotConfig, ConversationConfig
 from .utils import ChatUtils, ConversationHistory, ResponseGenerator
+from .registry import model_registry
+from .kv_cache import ConversationKVCache
+from .batching import ContinuousBatcher
 from .exceptions import (
     ModelLoadError, 
     ConversationError, 
@@ -33,7 +45,8 @@ class ChatGPTLikeBot:
     def __init__(
         self, 
         config: Optional[ChatbotConfig] = None,
-        model_name: Optional[str] = None
+        model_name: Optional[str] = None,
+        conversation_config: Optional[ConversationConfig] = None
     ):
         """
         Sohbet botunu başlat
@@ -41,6 +54,7 @@ class ChatGPTLikeBot:
         Args:
             config (ChatbotConfig, optional): Bot konfigürasyonu
             model_name (str, optional): Kullanılacak model adı
+            conversation_config (ConversationConfig, optional): Konuşma geçmişi ayarları
         """
         # Konfigürasyon ayarla
         if config is None:
@@ -51,59 +65,139 @@ class ChatGPTLikeBot:
         
         self.config = config
         
+        # Akış metrikleri (ilk token süresi vb.)
+        self._metrics_lock = threading.Lock()
+        self._ttft_samples: deque = deque(maxlen=100)
+        self._generation_samples: deque = deque(maxlen=100)
+        self._timeouts = 0
+        
+        # Konuşma başına KV önbelleği: yeni turda sadece yeni token'lar işlenir
+        self.kv_cache = None
+        if config.kv_cache_reuse:
+            self.kv_cache = ConversationKVCache(config.kv_cache_max_mb * 1024 * 1024)
+        
         # Model ve tokenizer'ı yükle
         self._load_model()
         
-        # Konuşma geçmişini başlat
-        self.conversation_history = ConversationHistory()
+        # Konuşma geçmişini başlat (max_conversations üzeri arşive taşınır)
+        conversation_config = conversation_config or ConversationConfig()
+        self.conversation_history = ConversationHistory(
+            conversation_config.conversation_file,
+            max_conversations=conversation_config.max_conversations,
+            archive_segment_mb=conversation_config.archive_segment_mb
+        )
         
         logger.info(f"✅ ChatGPT-like Bot başlatıldı - Model: {self.config.model_name}")
     
     def _load_model(self) -> None:
-        """Model ve tokenizer'ı yükle"""
+        """Model ve tokenizer'ı paylaşılan kayıttan al (gerekirse yükle)"""
         try:
-            logger.info(f"🤖 Model yükleniyor: {self.config.model_name}")
-            
             # Device ayarları
             if self.config.device == "auto":
                 self.device = "cuda" if torch.cuda.is_available() else "cpu"
             else:
                 self.device = self.config.device
             
-            # Model türüne göre yükleme
-            if "DialoGPT" in self.config.model_name:
-                self.tokenizer = AutoTokenizer.from_pretrained(
-                    self.config.model_name,
-                    cache_dir=self.config.cache_dir,
-                    padding_side='left'
-                )
-                self.model = AutoModelForCausalLM.from_pretrained(
-                    self.config.model_name,
-                    cache_dir=self.config.cache_dir
-                )
-            else:
-                # Genel GPT modelleri için
-                self.tokenizer = GPT2Tokenizer.from_pretrained(
-                    self.config.model_name,
-                    cache_dir=self.config.cache_dir
-                )
-                self.model = GPT2LMHeadModel.from_pretrained(
-                    self.config.model_name,
-                    cache_dir=self.config.cache_dir
-                )
+            self.dtype = self._resolve_dtype()
             
-            # Pad token ayarla
-            if self.tokenizer.pad_token is None:
-                self.tokenizer.pad_token = self.tokenizer.eos_token
+            # Aynı (model, device, dtype) için ağırlıklar botlar arasında paylaşılır
+            self.model_key = (self.config.model_name, self.device, str(self.dtype).replace("torch.", ""))
+            # Model bellek bütçesi için kayıtta kalır; her üretimde _use_models ile alınır
+            self.tokenizer, _ = model_registry.acquire(self.model_key, self._load_weights)
             
-            self.model.to(self.device)
-            self.model.eval()
+            # Taslak model de kayıttan paylaşılır (ör. fast_chat botunun DialoGPT-small'u)
+            self.draft_key = None
+            if self.config.draft_model_name:
+                self.draft_key = (self.config.draft_model_name, self.device, self.model_key[2])
+                model_registry.acquire(
+                    self.draft_key,
+                    lambda: self._load_weights(self.config.draft_model_name)
+                )
+                logger.info(f"🚀 Spekülatif üretim: taslak model {self.config.draft_model_name}")
             
-            logger.info(f"📱 Device: {self.device}")
+            logger.info(f"📱 Device: {self.device} - dtype: {self.model_key[2]}")
             
         except Exception as e:
             raise ModelLoadError(self.config.model_name, str(e))
     
+    def _resolve_dtype(self) -> torch.dtype:
+        """Konfigürasyondaki torch_dtype değerini cihaza göre çözümle"""
+        requested = self.config.torch_dtype
+        if requested == "auto":
+            return torch.float16 if self.device == "cuda" else torch.float32
+        
+        dtype = getattr(torch, requested, None)
+        if not isinstance(dtype, torch.dtype):
+            raise ValueError(f"Geçersiz torch_dtype: {requested}")
+        
+        if dtype == torch.float16 and self.device == "cpu":
+            logger.warning("⚠️ float16 CPU'da desteklenmiyor, float32 kullanılıyor")
+            return torch.float32
+        return dtype
+    
+    def _load_weights(self, model_name: Optional[str] = None):
+        """Model ve tokenizer'ı diskten/hub'dan yükle"""
+        model_name = model_name or self.config.model_name
+        logger.info(f"🤖 Model yükleniyor: {model_name}")
+        
+        # Model türüne göre yükleme
+        if "DialoGPT" in model_name:
+            tokenizer = AutoTokenizer.from_pretrained(
+                model_name,
+                cache_dir=self.config.cache_dir,
+                padding_side='left'
+            )
+            model = AutoModelForCausalLM.from_pretrained(
+                model_name,
+                cache_dir=self.config.cache_dir,
+                torch_dtype=self.dtype
+            )
+        else:
+            # Genel GPT modelleri için
+            tokenizer = GPT2Tokenizer.from_pretrained(
+                model_name,
+                cache_dir=self.config.cache_dir
+            )
+            model = GPT2LMHeadModel.from_pretrained(
+                model_name,
+                cache_dir=self.config.cache_dir,
+                torch_dtype=self.dtype
+            )
+        
+        # Pad token ayarla
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token
+        
+        model.to(self.device)
+        model.eval()
+        return tokenizer, model
+    
+    @contextmanager
+    def _use_models(self) -> Iterator[Tuple[Any, Any]]:
+        """
+        Ana ve taslak modeli üretim süresince bellekte tut
+        
+        Yields:
+            Tuple: (model, taslak model ya da None)
+        """
+        with model_registry.use(self.model_key) as (_, model):
+            if self.draft_key is None:
+                yield model, None
+            else:
+                with model_registry.use(self.draft_key) as (_, draft_model):
+                    yield model, draft_model
+    
+    def close(self) -> None:
+        """Paylaşılan model referansını bırak"""
+        if getattr(self, 'model_key', None) is not None:
+            model_registry.release(self.model_key)
+            self.model_key = None
+        if getattr(self, 'draft_key', None) is not None:
+            model_registry.release(self.draft_key)
+            self.draft_key = None
+        if self.kv_cache is not None:
+            self.kv_cache.clear()
+    
     def chat(
         self, 
         message: str, 
@@ -130,13 +224,7 @@ class ChatGPTLikeBot:
             intent = ChatUtils.extract_intent(message)
             
             # Konuşma geçmişine ekle
-            if conversation_id is None and use_history:
-                conversation_id = self.conversation_history.current_conversation_id
-                if conversation_id is None:
-                    conversation_id = self.conversation_history.create_conversation()
-            
-            if use_history and conversation_id:
-                self.conversation_history.add_message("user", message, conversation_id)
+            conversation_id = self._begin_turn(message, conversation_id, use_history)
             
             # Yanıt üret
             response = self._generate_response(message, conversation_id if use_history else None)
@@ -152,15 +240,256 @@ class ChatGPTLikeBot:
             return formatted_response
             
         except Exception as e:
-            error_msg = str(e)
-            logger.error(f"❌ Sohbet hatası: {error_msg}")
+            return self._fallback_response(message, e)
+    
+    def chat_stream(
+        self, 
+        message: str, 
+        conversation_id: Optional[str] = None,
+        use_history: bool = True
+    ) -> Iterator[str]:
+        """
+        Kullanıcı ile sohbet et, yanıtı üretildikçe parça parça döndür
+        
+        Her adımda o ana kadar üretilen metnin tamamı döndürülür; son
+        değer chat() ile aynı biçimde formatlanmış yanıttır.
+        
+        Args:
+            message (str): Kullanıcı mesajı
+            conversation_id (str, optional): Konuşma ID'si
+            use_history (bool): Konuşma geçmişi kullanılsın mı
             
-            # Fallback yanıt
-            try:
-                intent = ChatUtils.extract_intent(message) if message else 'general'
-                return ResponseGenerator.generate_fallback_response(intent, message)
-            except:
-                return "Üzgünüm, şu anda size yardımcı olamıyorum. Lütfen daha sonra tekrar deneyin."
+        Yields:
+            str: Kısmi (birikimli) bot yanıtı
+        """
+        try:
+            # Girişi doğrula
+            if not message or not message.strip():
+                raise InvalidInputError("message", "Boş mesaj")
+            
+            message = ChatUtils.clean_text(message)
+            intent = ChatUtils.extract_intent(message)
+            
+            conversation_id = self._begin_turn(message, conversation_id, use_history)
+            
+            response = ""
+            for response in self._stream_response(message, conversation_id if use_history else None):
+                yield response
+            
+            # Boş yanıt kontrolü
+            if not response or len(response.strip()) < 2:
+                raise ConversationError("response_generation", "Boş yanıt üretildi")
+            
+            formatted_response = ChatUtils.format_response(response.strip(), intent)
+            
+            if use_history and conversation_id:
+                self.conversation_history.add_message("assistant", formatted_response, conversation_id)
+            
+            logger.info(f"✅ Yanıt üretildi (akış) - Intent: {intent}")
+            yield formatted_response
+            
+        except Exception as e:
+            yield self._fallback_response(message, e)
+    
+    def _begin_turn(self, message: str, conversation_id: Optional[str], use_history: bool) -> Optional[str]:
+        """Konuşmayı belirle (gerekirse oluştur) ve kullanıcı mesajını kaydet"""
+        if conversation_id is None and use_history:
+            conversation_id = self.conversation_history.current_conversation_id
+            if conversation_id is None:
+                conversation_id = self.conversation_history.create_conversation()
+        
+        if use_history and conversation_id:
+            self.conversation_history.add_message("user", message, conversation_id)
+        
+        return conversation_id
+    
+    def _fallback_response(self, message: str, error: Exception) -> str:
+        """Hata durumunda niyete uygun yedek yanıt"""
+        error_msg = str(error)
+        logger.error(f"❌ Sohbet hatası: {error_msg}")
+        
+        # Fallback yanıt
+        try:
+            intent = ChatUtils.extract_intent(message) if message else 'general'
+            return ResponseGenerator.generate_fallback_response(intent, message)
+        except:
+            return "Üzgünüm, şu anda size yardımcı olamıyorum. Lütfen daha sonra tekrar deneyin."
+    
+    def _prepare_input(self, message: str, conversation_id: str = None) -> Tuple[str, torch.Tensor]:
+        """
+        Konuşma geçmişiyle birlikte model girişini hazırla
+        
+        Args:
+            message (str): Kullanıcı mesajı
+            conversation_id (str, optional): Konuşma ID'si
+            
+        Returns:
+            Tuple: (giriş metni, token tensörü)
+        """
+        # Konuşma geçmişini al
+        chat_history = []
+        if conversation_id and self.kv_cache is not None:
+            # Pencere her turda kaymaz; önek sabit kaldıkça KV önbelleği geçerli olur
+            # Sadece pencere içindeki mesajlar depodan okunur
+            start = self._history_window_start(self.conversation_history.count_messages(conversation_id))
+            messages = self.conversation_history.get_messages(conversation_id, start)
+            chat_history = [msg['content'] for msg in messages]
+        elif conversation_id:
+            recent_messages = self.conversation_history.get_recent_messages(
+                self.config.conversation_history_limit, 
+                conversation_id
+            )
+            chat_history = [msg['content'] for msg in recent_messages[-5:]]  # Son 5 mesaj
+        
+        # Input metni hazırla
+        if "DialoGPT" in self.config.model_name:
+            # DialoGPT için özel format
+            if chat_history:
+                input_text = " <|endoftext|> ".join(chat_history + [message]) + " <|endoftext|>"
+            else:
+                input_text = message + " <|endoftext|>"
+        else:
+            # Genel GPT için
+            if chat_history:
+                input_text = f"Konuşma geçmişi: {' '.join(chat_history[-3:])} Kullanıcı: {message} Asistan:"
+            else:
+                input_text = f"Kullanıcı: {message} Asistan:"
+        
+        # Tokenize et
+        inputs = self.tokenizer.encode(
+            input_text, 
+            return_tensors="pt",
+            max_length=self.config.max_length - self.config.max_new_tokens,
+            truncation=True
+        ).to(self.device)
+        
+        return input_text, inputs
+    
+    def _history_window_start(self, message_count: int, keep: int = 5) -> int:
+        """
+        Geçmiş penceresinin başlangıç indeksi
+        
+        Pencere en az son 'keep' mesajı içerir ve conversation_history_limit
+        dolduğunda tek seferde ileri atlar. Böylece ardışık turların girişi
+        aynı önekle başlar; önek sadece atlama turunda değişir.
+        """
+        step = max(1, self.config.conversation_history_limit - keep)
+        return (max(0, message_count - keep) // step) * step
+    
+    def _generation_kwargs(self) -> Dict[str, Any]:
+        """model.generate için üretim parametreleri"""
+        return {
+            'max_new_tokens': self.config.max_new_tokens,
+            'num_beams': self.config.num_beams,
+            'do_sample': self.config.do_sample,
+            'temperature': self.config.temperature,
+            'top_p': self.config.top_p,
+            'top_k': self.config.top_k,
+            'repetition_penalty': self.config.repetition_penalty,
+            'pad_token_id': self.tokenizer.eos_token_id,
+            'eos_token_id': self.tokenizer.eos_token_id,
+            'early_stopping': True
+        }
+    
+    def _run_generate(
+        self,
+        inputs: torch.Tensor,
+        conversation_id: Optional[str] = None,
+        **extra_kwargs
+    ) -> torch.Tensor:
+        """
+        model.generate çağrısı; mümkünse konuşmanın KV önbelleğini yeniden kullan
+        
+        Args:
+            inputs (torch.Tensor): Tam giriş token'ları
+            conversation_id (str, optional): Konuşma ID'si
+            **extra_kwargs: Ek üretim parametreleri (streamer vb.)
+            
+        Returns:
+            torch.Tensor: Giriş + üretilen token'lar
+        """
+        generation_kwargs = self._generation_kwargs()
+        generation_kwargs.update(extra_kwargs)
+        
+        # Her adımda duvar saati kontrol edilir; süre dolunca üretim kısmi çıktıyla biter
+        timeout = self.config.response_timeout
+        deadline = time.monotonic() + timeout if timeout and timeout > 0 else None
+        if deadline is not None:
+            generation_kwargs['max_time'] = float(timeout)
+        
+        # Bütçe nedeniyle çıkarılmış model burada yeniden yüklenir; üretim sürerken çıkarılmaz
+        with self._use_models() as (model, draft_model):
+            # Taslak model tek dizi üzerinde kendi önbelleğiyle çalışır
+            assisted = draft_model is not None and self.config.num_beams == 1
+            if assisted:
+                generation_kwargs['assistant_model'] = draft_model
+            
+            # Beam search önbelleği ışın sayısı kadar çoğaltır; yeniden kullanılmaz
+            use_kv_cache = (
+                self.kv_cache is not None
+                and conversation_id is not None
+                and self.config.num_beams == 1
+                and not assisted
+            )
+            batcher = self._get_batcher(draft_model)
+            
+            if not use_kv_cache and batcher is None:
+                with torch.no_grad():
+                    sequences = model.generate(inputs, **generation_kwargs)
+                timed_out = deadline is not None and time.monotonic() >= deadline
+                self._check_timeout(timed_out, inputs, sequences)
+                return sequences
+            
+            # Önbellekteki önek giriş token'larıyla karşılaştırılır; uyuşmazsa tam prefill
+            past_key_values = self.kv_cache.take(conversation_id, inputs) if use_kv_cache else None
+            
+            if batcher is not None:
+                generation_kwargs.pop('max_time', None)
+                sequences, past_key_values, timed_out = batcher.generate(
+                    inputs, generation_kwargs, past_key_values, deadline
+                )
+            else:
+                if past_key_values is not None:
+                    generation_kwargs['past_key_values'] = past_key_values
+            
+                with torch.no_grad():
+                    outputs = model.generate(
+                        inputs,
+                        attention_mask=torch.ones_like(inputs),
+                        return_dict_in_generate=True,
+                        **generation_kwargs
+                    )
+                sequences, past_key_values = outputs.sequences, outputs.past_key_values
+                timed_out = deadline is not None and time.monotonic() >= deadline
+            
+            if use_kv_cache:
+                self.kv_cache.put(conversation_id, sequences[0], past_key_values)
+            self._check_timeout(timed_out, inputs, sequences)
+            return sequences
+    
+    def _check_timeout(self, timed_out: bool, inputs: torch.Tensor, sequences: torch.Tensor) -> None:
+        """Süre aşımını kaydet; hiç token üretilmediyse GenerationTimeoutError fırlat"""
+        if not timed_out:
+            return
+        
+        with self._metrics_lock:
+            self._timeouts += 1
+        
+        new_tokens = sequences.shape[-1] - inputs.shape[-1]
+        if new_tokens <= 0:
+            raise GenerationTimeoutError(self.config.response_timeout)
+        logger.warning(f"⏰ Yanıt süresi aşıldı ({self.config.response_timeout} sn), "
+                       f"kısmi yanıt döndürülüyor ({new_tokens} token)")
+    
+    def _get_batcher(self, draft_model=None) -> Optional[ContinuousBatcher]:
+        """Modelin paylaşılan batch zamanlayıcısı (kapalıysa None)"""
+        if (not self.config.continuous_batching or self.config.num_beams > 1
+                or draft_model is not None or not self.model_key):
+            return None
+        return model_registry.get_batcher(
+            self.model_key,
+            lambda loaded: ContinuousBatcher(loaded, self.config.max_batch_size)
+        )
     
     def _generate_response(self, message: str, conversation_id: str = None) -> str:
         """
@@ -174,52 +503,10 @@ class ChatGPTLikeBot:
             str: Üretilen yanıt
         """
         try:
-            # Konuşma geçmişini al
-            chat_history = []
-            if conversation_id:
-                recent_messages = self.conversation_history.get_recent_messages(
-                    self.config.conversation_history_limit, 
-                    conversation_id
-                )
-                chat_history = [msg['content'] for msg in recent_messages[-5:]]  # Son 5 mesaj
-            
-            # Input metni hazırla
-            if "DialoGPT" in self.config.model_name:
-                # DialoGPT için özel format
-                if chat_history:
-                    input_text = " <|endoftext|> ".join(chat_history + [message]) + " <|endoftext|>"
-                else:
-                    input_text = message + " <|endoftext|>"
-            else:
-                # Genel GPT için
-                if chat_history:
-                    input_text = f"Konuşma geçmişi: {' '.join(chat_history[-3:])} Kullanıcı: {message} Asistan:"
-                else:
-                    input_text = f"Kullanıcı: {message} Asistan:"
-            
-            # Tokenize et
-            inputs = self.tokenizer.encode(
-                input_text, 
-                return_tensors="pt",
-                max_length=self.config.max_length - self.config.max_new_tokens,
-                truncation=True
-            ).to(self.device)
+            input_text, inputs = self._prepare_input(message, conversation_id)
             
             # Yanıt üret
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    inputs,
-                    max_new_tokens=self.config.max_new_tokens,
-                    num_beams=self.config.num_beams,
-                    do_sample=self.config.do_sample,
-                    temperature=self.config.temperature,
-                    top_p=self.config.top_p,
-                    top_k=self.config.top_k,
-                    repetition_penalty=self.config.repetition_penalty,
-                    pad_token_id=self.tokenizer.eos_token_id,
-                    eos_token_id=self.tokenizer.eos_token_id,
-                    early_stopping=True
-                )
+            outputs = self._run_generate(inputs, conversation_id)
             
             # Yanıtı decode et
             response = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
@@ -238,9 +525,121 @@ class ChatGPTLikeBot:
             
             return response.strip()
             
+        except GenerationTimeoutError:
+            raise
         except Exception as e:
             raise ConversationError("response_generation", str(e))
     
+    def _stream_response(self, message: str, conversation_id: str = None) -> Iterator[str]:
+        """
+        Yanıtı arka plan thread'inde üret, token'lar geldikçe döndür
+        
+        Args:
+            message (str): Kullanıcı mesajı
+            conversation_id (str, optional): Konuşma ID'si
+            
+        Yields:
+            str: O ana kadar üretilen yanıt metni
+        """
+        # Beam search akışı desteklemez; yanıtı tek parça döndür
+        if self.config.num_beams > 1:
+            yield self._generate_response(message, conversation_id)
+            return
+        
+        _, inputs = self._prepare_input(message, conversation_id)
+        
+        streamer = TextIteratorStreamer(
+            self.tokenizer,
+            skip_prompt=True,
+            skip_special_tokens=True,
+            timeout=self.config.response_timeout
+        )
+        errors: List[Exception] = []
+        
+        def generate():
+            try:
+                self._run_generate(inputs, conversation_id, streamer=streamer)
+            except Exception as e:
+                errors.append(e)
+                streamer.end()
+        
+        start = time.perf_counter()
+        thread = threading.Thread(target=generate, daemon=True)
+        thread.start()
+        
+        response = ""
+        first_token_time = None
+        try:
+            for text in streamer:
+                if not text:
+                    continue
+                if first_token_time is None:
+                    first_token_time = time.perf_counter() - start
+                    self._record_ttft(first_token_time)
+                response += text
+                yield response
+        except queue.Empty:
+            raise GenerationTimeoutError(self.config.response_timeout)
+        
+        thread.join()
+        if errors:
+            if isinstance(errors[0], GenerationTimeoutError):
+                raise errors[0]
+            raise ConversationError("response_generation", str(errors[0]))
+        
+        self._record_generation_time(time.perf_counter() - start)
+    
+    def _record_ttft(self, seconds: float) -> None:
+        """İlk token süresini kaydet"""
+        with self._metrics_lock:
+            self._ttft_samples.append(seconds)
+        logger.info(f"⏱️ İlk token süresi: {seconds * 1000:.0f} ms")
+    
+    def _record_generation_time(self, seconds: float) -> None:
+        """Toplam akış süresini kaydet"""
+        with self._metrics_lock:
+            self._generation_samples.append(seconds)
+    
+    def get_generation_stats(self) -> Dict[str, Any]:
+        """
+        Akışlı yanıt metrikleri (son 100 yanıt)
+        
+        Returns:
+            dict: İlk token süresi (TTFT), toplam üretim süresi ve süre aşımı sayısı
+        """
+        with self._metrics_lock:
+            last_ttft = self._ttft_samples[-1] if self._ttft_samples else None
+            ttft = sorted(self._ttft_samples)
+            total = list(self._generation_samples)
+            timeouts = self._timeouts
+        
+        return {
+            'streamed_responses': len(ttft),
+            'last_ttft_ms': last_ttft * 1000 if last_ttft is not None else None,
+            'avg_ttft_ms': sum(ttft) / len(ttft) * 1000 if ttft else None,
+            'p50_ttft_ms': ttft[len(ttft) // 2] * 1000 if ttft else None,
+            'avg_generation_ms': sum(total) / len(total) * 1000 if total else None,
+            'timeouts': timeouts
+        }
+    
+    def warmup(self) -> float:
+        """
+        Kısa sentetik bir istemle üretimi bir kez çalıştır
+        
+        İlk gerçek isteğin çekirdek seçimi ve bellek ayırma maliyetini
+        önceden öder. Konuşma geçmişine ve KV önbelleğine dokunmaz.
+        
+        Returns:
+            float: Isınma süresi (saniye)
+        """
+        start = time.perf_counter()
+        _, inputs = self._prepare_input("Merhaba")
+        self._run_generate(inputs, max_new_tokens=4)
+        
+        elapsed = time.perf_counter() - start
+        logger.info(f"🔥 Isınma tamamlandı: {elapsed:.2f} sn")
+        return elapsed
+    
     def start_new_conversation(self, title: str = None) -> str:
         """
         Yeni konuşma başlat
@@ -253,14 +652,31 @@ class ChatGPTLikeBot:
         """
         return self.conversation_history.create_conversation(title)
     
-    def get_conversation_list(self) -> List[Dict]:
+    def get_conversation_list(self, limit: int = 50, cursor: Optional[str] = None) -> List[Dict]:
         """
-        Konuşma listesini getir
+        Konuşma listesini getir (en son güncellenen önce)
+        
+        Args:
+            limit (int): Konuşma sayısı limiti
+            cursor (str, optional): Sayfalama imleci (list_conversations_page)
         
         Returns:
             list: Konuşma listesi
         """
-        return self.conversation_history.list_conversations()
+        return self.conversation_history.list_conversations(limit, cursor)
+    
+    def search_conversations(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        Konuşma geçmişinde ara
+        
+        Args:
+            query (str): Arama metni
+            limit (int): En fazla sonuç sayısı
+        
+        Returns:
+            list: Eşleşen mesajlar (en yeni önce)
+        """
+        return self.conversation_history.search(query, limit)
     
     def get_conversation(self, conversation_id: str) -> Dict:
         """
@@ -284,6 +700,8 @@ class ChatGPTLikeBot:
         Returns:
             bool: Başarılı ise True
         """
+        if self.kv_cache is not None:
+            self.kv_cache.drop(conversation_id)
         return self.conversation_history.delete_conversation(conversation_id)
     
     def get_model_info(self) -> Dict[str, Any]:
@@ -296,7 +714,11 @@ class ChatGPTLikeBot:
         return {
             'model_name': self.config.model_name,
             'device': self.device,
+            'dtype': str(self.dtype).replace("torch.", ""),
             'cuda_available': torch.cuda.is_available(),
+            'shared_refcount': model_registry.refcount(self.model_key) if self.model_key else 0,
+            'draft_model': self.config.draft_model_name if self.draft_key is not None else None,
+            'kv_cache': self.kv_cache.get_stats() if self.kv_cache is not None else None,
             'config': self.config.to_dict()
         }
 
@@ -331,7 +753,7 @@ class ConversationManager:
         Returns:
             ChatGPTLikeBot: Oluşturulan bot
         """
-        bot = ChatGPTLikeBot(config)
+        bot = ChatGPTLikeBot(config, conversation_config=self.config)
         self.bots[bot_id] = bot
         return bot
     
@@ -347,6 +769,53 @@ class ConversationManager:
         """
         return self.bots.get(bot_id)
     
+    def remove_bot(self, bot_id: str) -> bool:
+        """
+        Bot'u kaldır ve paylaşılan model referansını bırak
+        
+        Args:
+            bot_id (str): Bot ID'si
+            
+        Returns:
+            bool: Başarılı ise True
+        """
+        bot = self.bots.pop(bot_id, None)
+        if bot is None:
+            return False
+        bot.close()
+        return True
+    
+    def delete_conversation(self, conversation_id: str) -> bool:
+        """
+        Konuşmayı paylaşılan depodan sil ve tüm botların KV önbelleğinden çıkar
+        
+        Args:
+            conversation_id (str): Konuşma ID'si
+        
+        Returns:
+            bool: Başarılı ise True
+        """
+        for bot in self.bots.values():
+            if bot.kv_cache is not None:
+                bot.kv_cache.drop(conversation_id)
+        
+        # Depo dosya başına paylaşılır; bu örnek botlarınkiyle aynı depoyu açar
+        history = ConversationHistory(
+            self.config.conversation_file,
+            max_conversations=self.config.max_conversations,
+            archive_segment_mb=self.config.archive_segment_mb
+        )
+        return history.delete_conversation(conversation_id)
+    
+    def get_model_stats(self) -> List[Dict[str, Any]]:
+        """
+        Paylaşılan modellerin referans sayıları ve bellek kullanımı
+        
+        Returns:
+            list: Model başına istatistikler
+        """
+        return model_registry.get_stats()
+    
     def chat_with_bot(
         self, 
         bot_id: str, 
@@ -370,6 +839,29 @@ class ConversationManager:
         
         return bot.chat(message, conversation_id)
     
+    def chat_stream_with_bot(
+        self, 
+        bot_id: str, 
+        message: str, 
+        conversation_id: str = None
+    ) -> Iterator[str]:
+        """
+        Belirli bir bot ile akışlı sohbet et
+        
+        Args:
+            bot_id (str): Bot ID'si
+            message (str): Kullanıcı mesajı
+            conversation_id (str, optional): Konuşma ID'si
+            
+        Yields:
+            str: Kısmi (birikimli) bot yanıtı
+        """
+        bot = self.get_bot(bot_id)
+        if not bot:
+            raise ConversationError(f"Bot bulunamadı: {bot_id}")
+        
+        yield from bot.chat_stream(message, conversation_id)
+    
     def list_bots(self) -> List[str]:
         """
         Bot listesini getir
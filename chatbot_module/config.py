@@ -13,6 +13,7 @@ class ChatbotConfig:
     model_name: str = "microsoft/DialoGPT-medium"
     device: str = "auto"  # "auto", "cpu", "cuda"
     cache_dir: Optional[str] = None
+    torch_dtype: str = "float32"  # "auto", "float32", "bfloat16", "float16"
     
     # Generation parametreleri
     max_length: int = 1000
@@ -28,6 +29,18 @@ class ChatbotConfig:
     conversation_history_limit: int = 10
     response_timeout: int = 30
     
+    # Turlar arası KV önbelleği (sadece num_beams=1 iken kullanılır)
+    kv_cache_reuse: bool = True
+    kv_cache_max_mb: int = 256
+    
+    # Eşzamanlı isteklerin aynı modelde tek batch'te üretilmesi (num_beams=1)
+    continuous_batching: bool = True
+    max_batch_size: int = 8
+    
+    # Spekülatif (assisted) üretim: küçük taslak model token önerir, ana model doğrular.
+    # Taslak model aynı tokenizer'ı kullanmalı (ör. DialoGPT-large için DialoGPT-small)
+    draft_model_name: Optional[str] = None
+    
     # Sistem mesajı
     system_message: str = "Sen yardımsever bir yapay zeka asistanısın. Türkçe olarak yanıt ver."
     
@@ -37,6 +50,7 @@ class ChatbotConfig:
             'model_name': self.model_name,
             'device': self.device,
             'cache_dir': self.cache_dir,
+            'torch_dtype': self.torch_dtype,
             'max_length': self.max_length,
             'max_new_tokens': self.max_new_tokens,
             'num_beams': self.num_beams,
@@ -47,6 +61,11 @@ class ChatbotConfig:
             'repetition_penalty': self.repetition_penalty,
             'conversation_history_limit': self.conversation_history_limit,
             'response_timeout': self.response_timeout,
+            'kv_cache_reuse': self.kv_cache_reuse,
+            'kv_cache_max_mb': self.kv_cache_max_mb,
+            'continuous_batching': self.continuous_batching,
+            'max_batch_size': self.max_batch_size,
+            'draft_model_name': self.draft_model_name,
             'system_message': self.system_message
         }
 
@@ -60,6 +79,9 @@ class ConversationConfig:
     max_conversations: int = 100
     auto_save: bool = True
     
+    # Fazla konuşmalar sıkıştırılmış arşiv segmentlerine taşınır
+    archive_segment_mb: int = 64
+    
     # Konuşma formatı
     timestamp_format: str = "%Y-%m-%d %H:%M:%S"
     conversation_title_length: int = 50
@@ -71,6 +93,7 @@ class ConversationConfig:
             'conversation_file': self.conversation_file,
             'max_conversations': self.max_conversations,
             'auto_save': self.auto_save,
+            'archive_segment_mb': self.archive_segment_mb,
             'timestamp_format': self.timestamp_format,
             'conversation_title_length': self.conversation_title_length
         }
@@ -166,17 +189,41 @@ class TurkishLanguageConfig:
     Türkçe dil özel ayarları
     """
     
+    # "iyi akşamlar" / "iyi geceler" çoğunlukla vedalaşmada kullanılır; selamlama
+    # önceliği daha yüksek olduğundan yalnızca veda listesinde tutulur
     GREETING_PATTERNS = [
         "merhaba", "selam", "selamlar", "naber", "nasılsın",
-        "günaydın", "iyi günler", "iyi akşamlar", "iyi geceler"
+        "günaydın", "iyi günler"
     ]
     
     FAREWELL_PATTERNS = [
-        "görüşürüz", "hoşça kal", "bay bay", "elveda", "güle güle",
+        "görüşürüz", "hoşça kal", "bay", "bay bay", "elveda", "güle güle",
         "iyi günler", "iyi akşamlar", "iyi geceler"
     ]
     
     POLITENESS_WORDS = [
         "lütfen", "teşekkürler", "sağol", "mersi", "rica ederim",
         "özür dilerim", "pardon", "kusura bakma"
-    ]
\ No newline at end of file
+    ]
+    
+    # Niyet tespiti: kalıplar kelime sınırlarında eşleşir ("ne", "neşe" içinde bulunmaz)
+    QUESTION_WORDS = [
+        "nasıl", "ne", "neden", "nerede", "kim", "hangi", "kaç"
+    ]
+    
+    HELP_PATTERNS = [
+        "yardım", "yardımcı", "help", "nasıl yapılır", "öğren", "öğrenmek",
+        "anlat", "anlatır mısın", "açıkla"
+    ]
+    
+    THANKS_PATTERNS = [
+        "teşekkür", "teşekkürler", "teşekkür ederim", "sağol", "sağolun",
+        "sağ ol", "mersi", "thanks"
+    ]
+    
+    # Arama için harf katlama: büyük/küçük harf ve Türkçe karakter farkı gözetilmez
+    UPPER_TO_LOWER = {"I": "ı", "İ": "i"}
+    SEARCH_FOLDING = {
+        "ç": "c", "ğ": "g", "ı": "i", "ö": "o", "ş": "s", "ü": "u",
+        "â": "a", "î": "i", "û": "u"
+    }
@@ -0,0 +1,203 @@
+"""
+Konuşma başına KV önbelleği - Turlar arası past_key_values yeniden kullanımı
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+class ConversationKVCache:
+    """
+    Konuşma başına işlenmiş token'ları ve past_key_values değerlerini tutan LRU önbellek
+    
+    Yeni turda model girişi, önbellekteki token dizisiyle ortak önekini
+    paylaştığı ölçüde yeniden kullanılır; sadece yeni kısım (son yanıt ve
+    yeni kullanıcı mesajı) modelden geçirilir. Geçmiş penceresi kaydığında
+    veya kırpma öneki değiştirdiğinde ortak önek kalmaz ve tam prefill yapılır.
+    Toplam boyut max_bytes'ı aşarsa en uzun süre kullanılmayan konuşma atılır.
+    """
+    
+    def __init__(self, max_bytes: int):
+        """
+        Önbelleği başlat
+        
+        Args:
+            max_bytes (int): Tüm konuşmalar için toplam bellek bütçesi (bayt)
+        """
+        self.max_bytes = max(0, max_bytes)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._total_bytes = 0
+        
+        self.hits = 0
+        self.misses = 0
+        self.fallbacks = 0
+        self.evictions = 0
+        self.reused_tokens = 0
+        self.prefilled_tokens = 0
+    
+    @staticmethod
+    def _seq_length(past) -> int:
+        """Önbellekteki token sayısı"""
+        if hasattr(past, 'get_seq_length'):
+            return past.get_seq_length()
+        return past[0][0].shape[-2]
+    
+    @staticmethod
+    def _crop(past, length: int):
+        """Önbelleği ilk length token'a kırp"""
+        if hasattr(past, 'crop'):
+            past.crop(length)
+            return past
+        return tuple(
+            tuple(tensor[..., :length, :] for tensor in layer)
+            for layer in past
+        )
+    
+    @staticmethod
+    def _nbytes(past) -> int:
+        """
+        Önbelleğin bellekteki boyutu (bayt)
+        
+        Kırpılmış/dilimlenmiş tensörler görünüm olabilir; bu yüzden görünümün
+        değil, canlı tuttuğu depolamanın boyutu sayılır (ortak depolama bir kez).
+        """
+        if hasattr(past, 'key_cache'):
+            layers = zip(past.key_cache, past.value_cache)
+        else:
+            layers = past
+        storages = {}
+        for layer in layers:
+            for tensor in layer:
+                storage = tensor.untyped_storage()
+                storages[storage.data_ptr()] = storage.nbytes()
+        return sum(storages.values())
+    
+    def take(self, conversation_id: str, input_ids: torch.Tensor) -> Optional[Any]:
+        """
+        Konuşmanın önbelleğini al ve yeni girişle ortak önekine kırp
+        
+        Kayıt önbellekten çıkarılır; üretim bitince put() ile geri konur.
+        Böylece aynı önbellek iki üretim tarafından aynı anda değiştirilmez.
+        
+        Args:
+            conversation_id (str): Konuşma ID'si
+            input_ids (torch.Tensor): Yeni turun tam giriş token'ları (1 x N)
+        
+        Returns:
+            past_key_values: Yeniden kullanılabilir önbellek (yoksa None)
+        """
+        with self._lock:
+            entry = self._entries.pop(conversation_id, None)
+            if entry is not None:
+                self._total_bytes -= entry['nbytes']
+        
+        input_length = input_ids.shape[-1]
+        if entry is None:
+            self._count(misses=1, prefilled_tokens=input_length)
+            return None
+        
+        # En az bir token modelden geçmeli (ilk logit'ler için)
+        cached_ids = entry['ids']
+        n = min(cached_ids.shape[-1], input_length - 1)
+        same = (cached_ids[:n] == input_ids[0, :n].cpu()).tolist()
+        prefix = same.index(False) if False in same else n
+        
+        if prefix == 0:
+            # Öneki değişti (pencere kaydı/kırpma): tam prefill
+            self._count(fallbacks=1, prefilled_tokens=input_length)
+            logger.debug(f"KV önbelleği geçersiz, tam prefill: {conversation_id}")
+            return None
+        
+        self._count(hits=1, reused_tokens=prefix, prefilled_tokens=input_length - prefix)
+        return self._crop(entry['past'], prefix)
+    
+    def _count(self, **counters: int) -> None:
+        """Sayaçları artır (thread-safe)"""
+        with self._lock:
+            for name, value in counters.items():
+                setattr(self, name, getattr(self, name) + value)
+    
+    def put(self, conversation_id: str, sequence: torch.Tensor, past) -> None:
+        """
+        Üretim sonrası önbelleği sakla
+        
+        Args:
+            conversation_id (str): Konuşma ID'si
+            sequence (torch.Tensor): Giriş + üretilen token'lar (1 boyutlu)
+            past: Üretimin döndürdüğü past_key_values
+        """
+        if past is None:
+            return
+        
+        length = self._seq_length(past)
+        nbytes = self._nbytes(past)
+        if nbytes > self.max_bytes:
+            return
+        
+        entry = {
+            'ids': sequence[:length].cpu(),
+            'past': past,
+            'nbytes': nbytes
+        }
+        
+        with self._lock:
+            old = self._entries.pop(conversation_id, None)
+            if old is not None:
+                self._total_bytes -= old['nbytes']
+            
+            self._entries[conversation_id] = entry
+            self._total_bytes += nbytes
+            
+            while self._total_bytes > self.max_bytes and self._entries:
+                evicted_id, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= evicted['nbytes']
+                self.evictions += 1
+                logger.debug(f"KV önbelleğinden çıkarıldı: {evicted_id}")
+    
+    def drop(self, conversation_id: str) -> None:
+        """
+        Konuşmanın önbelleğini sil
+        
+        Args:
+            conversation_id (str): Konuşma ID'si
+        """
+        with self._lock:
+            entry = self._entries.pop(conversation_id, None)
+            if entry is not None:
+                self._total_bytes -= entry['nbytes']
+    
+    def clear(self) -> None:
+        """Tüm önbelleği temizle"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Önbellek istatistikleri
+        
+        Returns:
+            dict: İsabet/ıska sayıları, yeniden kullanılan token oranı ve bellek kullanımı
+        """
+        with self._lock:
+            stats = {
+                'conversations': len(self._entries),
+                'memory_mb': self._total_bytes / (1024 * 1024),
+                'max_memory_mb': self.max_bytes / (1024 * 1024),
+                'hits': self.hits,
+                'misses': self.misses,
+                'fallbacks': self.fallbacks,
+                'evictions': self.evictions,
+                'reused_tokens': self.reused_tokens,
+                'prefilled_tokens': self.prefilled_tokens
+            }
+        
+        processed = stats['reused_tokens'] + stats['prefilled_tokens']
+        stats['reuse_ratio'] = stats['reused_tokens'] / processed if processed else 0.0
+        return stats
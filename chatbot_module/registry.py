@@ -0,0 +1,375 @@
+"""
+Paylaşılan model ağırlıkları kaydı - Aynı model bir kez yüklenir
+"""
+
+import gc
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ModelKey = Tuple[str, str, str]
+
+class ModelRegistry:
+    """
+    (model_name, device, dtype) başına tek model/tokenizer örneği tutan kayıt
+    
+    Sadece üretim parametreleri farklı olan botlar (ModelPresets) aynı
+    ağırlıkları paylaşır. Her bot bir referans alır; son referans
+    bırakıldığında model kayıttan çıkarılır ve bellek serbest kalır.
+    
+    Bellek bütçesi verilirse yüklü modellerin parametre belleği bütçeyi
+    aştığında en uzun süredir kullanılmayan boştaki model bellekten
+    çıkarılır; tokenizer ve referanslar kalır, model bir sonraki
+    kullanımda (use) aynı loader ile yeniden yüklenir. Modeli kendisi
+    tutan sahipler (ör. birleşik uygulamadaki BLIP analyzer'ı) on_evict ile
+    referanslarını bırakır ve çıkarılabilir.
+    """
+    
+    def __init__(self, memory_budget_mb: Optional[float] = None):
+        """
+        Kaydı oluştur
+        
+        Args:
+            memory_budget_mb (float, optional): Model belleği bütçesi (MB).
+                Verilmezse MODEL_MEMORY_BUDGET_MB ortam değişkeni okunur; o da
+                yoksa sınır yoktur.
+        """
+        self._lock = threading.Lock()
+        self._entries: Dict[ModelKey, Dict[str, Any]] = {}
+        self._loading: Dict[ModelKey, threading.Lock] = {}
+        self._evictions = 0
+        self._reloads = 0
+        
+        if memory_budget_mb is None and os.environ.get("MODEL_MEMORY_BUDGET_MB"):
+            memory_budget_mb = float(os.environ["MODEL_MEMORY_BUDGET_MB"])
+        self.memory_budget: Optional[int] = None
+        self.set_memory_budget(memory_budget_mb)
+    
+    def set_memory_budget(self, memory_budget_mb: Optional[float]) -> None:
+        """
+        Model belleği bütçesini ayarla (None veya 0: sınırsız)
+        
+        Args:
+            memory_budget_mb (float, optional): Bütçe (MB)
+        """
+        budget = int(memory_budget_mb * 1024 * 1024) if memory_budget_mb else None
+        with self._lock:
+            self.memory_budget = budget
+            evicted = self._make_room(0)
+        self._collect(evicted)
+        
+        if budget is not None:
+            logger.info(f"💾 Model bellek bütçesi: {memory_budget_mb:.0f} MB")
+    
+    def acquire(
+        self,
+        key: ModelKey,
+        loader: Callable[[], Tuple[Any, Any]],
+        on_evict: Optional[Callable[[], None]] = None
+    ) -> Tuple[Any, Any]:
+        """
+        Modeli referans alarak getir; yüklü değilse loader ile bir kez yükle
+        
+        Dönen model bütçe nedeniyle sonradan bellekten çıkarılabilir; uzun
+        süre tutmak yerine her kullanımda use() ile alınmalıdır.
+        
+        Args:
+            key (tuple): (model_name, device, dtype)
+            loader (callable): (tokenizer, model) döndüren yükleme fonksiyonu
+            on_evict (callable, optional): Model bellekten çıkarılırken çağrılır;
+                modeli kendi referansıyla tutan sahip (ör. ImageAnalyzer) onu bırakır
+        
+        Returns:
+            Tuple: (tokenizer, model)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = {
+                    'tokenizer': None,
+                    'model': None,
+                    'loader': loader,
+                    'on_evict': on_evict,
+                    'refcount': 0,
+                    'in_use': 0,
+                    'last_used': time.monotonic(),
+                    'load_time': 0.0,
+                    'memory_bytes': 0,
+                    'loads': 0,
+                    'evictions': 0
+                }
+                self._entries[key] = entry
+            entry['refcount'] += 1
+            if entry['refcount'] > 1:
+                logger.info(f"♻️ Paylaşılan model kullanılıyor: {key[0]} "
+                            f"({key[1]}, {key[2]}) - referans: {entry['refcount']}")
+        
+        try:
+            tokenizer, model = self._ensure_loaded(key)
+        except Exception:
+            self.release(key)
+            raise
+        return tokenizer, model
+    
+    @contextmanager
+    def use(self, key: ModelKey) -> Iterator[Tuple[Any, Any]]:
+        """
+        Modeli kullanım süresince bellekte tut; çıkarılmışsa yeniden yükle
+        
+        Kullanımdaki model bütçe aşılsa bile bellekten çıkarılmaz.
+        
+        Args:
+            key (tuple): (model_name, device, dtype)
+        
+        Yields:
+            Tuple: (tokenizer, model)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                raise KeyError(f"Model kayıtlı değil: {key[0]} ({key[1]}, {key[2]})")
+            entry['in_use'] += 1
+        
+        try:
+            yield self._ensure_loaded(key)
+        finally:
+            # Kullanım sırasında aşılan bütçe model boşa çıkınca geri kazanılır
+            with self._lock:
+                entry['in_use'] -= 1
+                entry['last_used'] = time.monotonic()
+                evicted = self._make_room(0)
+            self._collect(evicted)
+    
+    def _ensure_loaded(self, key: ModelKey) -> Tuple[Any, Any]:
+        """Model yüklü değilse (ilk kez ya da çıkarıldıktan sonra) loader ile yükle"""
+        with self._lock:
+            load_lock = self._loading.setdefault(key, threading.Lock())
+        
+        # Aynı model için eşzamanlı istekler tek yüklemeyi bekler
+        with load_lock:
+            with self._lock:
+                entry = self._entries[key]
+                entry['last_used'] = time.monotonic()
+                if entry['model'] is not None:
+                    return entry['tokenizer'], entry['model']
+                
+                # Yeniden yüklemede boyut bilinir; yer önceden açılır
+                reload = entry['loads'] > 0
+                evicted = self._make_room(entry['memory_bytes'], exclude=key)
+            self._collect(evicted)
+            
+            start = time.perf_counter()
+            tokenizer, model = entry['loader']()
+            load_time = time.perf_counter() - start
+            
+            with self._lock:
+                # Botlar tokenizer'ı tuttuğu için ilk yüklenen korunur
+                if entry['tokenizer'] is None:
+                    entry['tokenizer'] = tokenizer
+                entry['model'] = model
+                entry['load_time'] = load_time
+                entry['memory_bytes'] = self._model_memory(model)
+                entry['loads'] += 1
+                entry['last_used'] = time.monotonic()
+                if reload:
+                    self._reloads += 1
+                
+                # İlk yüklemede boyut ancak şimdi bilinir
+                evicted = self._make_room(0, exclude=key)
+            self._collect(evicted)
+            
+            if reload:
+                logger.info(f"🔄 Model yeniden yüklendi: {key[0]} ({key[1]}, {key[2]}) - "
+                            f"{entry['memory_bytes'] / (1024 * 1024):.0f} MB, {load_time:.2f} sn")
+            return entry['tokenizer'], entry['model']
+    
+    def _make_room(self, needed_bytes: int, exclude: Optional[ModelKey] = None) -> List[Dict[str, Any]]:
+        """
+        Bütçe aşılıyorsa boştaki modelleri LRU sırasıyla bellekten çıkar (kilit altında)
+        
+        Args:
+            needed_bytes (int): Yüklenecek model için ayrılacak bellek
+            exclude (tuple, optional): Çıkarılmayacak model
+        
+        Returns:
+            list: Çıkarılan kayıtlar (zamanlayıcıları kilit dışında kapatılır)
+        """
+        evicted = []
+        if self.memory_budget is None:
+            return evicted
+        
+        loaded = sum(e['memory_bytes'] for e in self._entries.values() if e['model'] is not None)
+        while loaded + needed_bytes > self.memory_budget:
+            candidates = [
+                (k, e) for k, e in self._entries.items()
+                if k != exclude and e['model'] is not None and e['in_use'] == 0
+            ]
+            if not candidates:
+                logger.warning(f"⚠️ Model bellek bütçesi aşıldı "
+                               f"({(loaded + needed_bytes) / (1024 * 1024):.0f} / "
+                               f"{self.memory_budget / (1024 * 1024):.0f} MB) - "
+                               f"çıkarılabilecek boşta model yok")
+                break
+            
+            key, entry = min(candidates, key=lambda item: item[1]['last_used'])
+            loaded -= entry['memory_bytes']
+            entry['model'] = None
+            entry['evictions'] += 1
+            self._evictions += 1
+            evicted.append({
+                'key': key,
+                'batcher': entry.pop('batcher', None),
+                'on_evict': entry['on_evict'],
+                'memory_bytes': entry['memory_bytes'],
+                'idle': time.monotonic() - entry['last_used']
+            })
+        return evicted
+    
+    @staticmethod
+    def _collect(evicted: List[Dict[str, Any]]) -> None:
+        """Çıkarılan modellerin zamanlayıcılarını kapat, belleği geri ver ve süreyi logla"""
+        if not evicted:
+            return
+        
+        start = time.perf_counter()
+        for item in evicted:
+            if item['batcher'] is not None:
+                item['batcher'].close()
+            if item['on_evict'] is not None:
+                item['on_evict']()
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+        elapsed = time.perf_counter() - start
+        
+        for item in evicted:
+            key = item['key']
+            logger.info(f"🗑️ Model bellekten çıkarıldı (bütçe): {key[0]} ({key[1]}, {key[2]}) - "
+                        f"{item['memory_bytes'] / (1024 * 1024):.0f} MB, "
+                        f"{item['idle']:.0f} sn boşta, {elapsed:.2f} sn")
+    
+    def release(self, key: ModelKey) -> None:
+        """
+        Referansı bırak; son referanssa modeli kayıttan çıkar
+        
+        Args:
+            key (tuple): (model_name, device, dtype)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            
+            entry['refcount'] -= 1
+            if entry['refcount'] > 0:
+                return
+            
+            del self._entries[key]
+            self._loading.pop(key, None)
+            logger.info(f"🗑️ Model bellekten çıkarıldı: {key[0]} ({key[1]}, {key[2]})")
+        
+        if entry.get('batcher') is not None:
+            entry['batcher'].close()
+    
+    def get_batcher(self, key: ModelKey, factory: Callable[[Any], Any]) -> Optional[Any]:
+        """
+        Modelin paylaşılan batch zamanlayıcısını getir (yoksa oluştur)
+        
+        Aynı ağırlıkları kullanan tüm botların istekleri tek zamanlayıcıda
+        birleşir. Model bellekten çıkarılırken zamanlayıcı da kapatılır;
+        bu yüzden use() bloğu içinde çağrılmalıdır.
+        
+        Args:
+            key (tuple): (model_name, device, dtype)
+            factory (callable): Modeli alıp zamanlayıcıyı oluşturan fonksiyon
+        
+        Returns:
+            ContinuousBatcher: Zamanlayıcı (model yüklü değilse None)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry['model'] is None:
+                return None
+            if entry.get('batcher') is None:
+                entry['batcher'] = factory(entry['model'])
+            return entry['batcher']
+    
+    @staticmethod
+    def _model_memory(model) -> int:
+        """Parametre ve buffer'ların toplam boyutu (bayt)"""
+        try:
+            tensors = list(model.parameters()) + list(model.buffers())
+            return sum(t.numel() * t.element_size() for t in tensors)
+        except Exception:
+            return 0
+    
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """
+        Yüklü modellerin referans sayıları ve bellek kullanımı
+        
+        Returns:
+            list: Model başına istatistikler
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    'model_name': key[0],
+                    'device': key[1],
+                    'dtype': key[2],
+                    'refcount': entry['refcount'],
+                    'loaded': entry['model'] is not None,
+                    'in_use': entry['in_use'],
+                    'idle_seconds': now - entry['last_used'],
+                    'memory_mb': entry['memory_bytes'] / (1024 * 1024),
+                    'load_time': entry['load_time'],
+                    'loads': entry['loads'],
+                    'evictions': entry['evictions'],
+                    'batching': entry['batcher'].get_stats() if entry.get('batcher') else None
+                }
+                for key, entry in self._entries.items()
+            ]
+    
+    def get_memory_stats(self) -> Dict[str, Any]:
+        """
+        Bellek bütçesi özeti
+        
+        Returns:
+            dict: Bütçe, yüklü model belleği, çıkarma ve yeniden yükleme sayıları
+        """
+        with self._lock:
+            loaded = [e for e in self._entries.values() if e['model'] is not None]
+            return {
+                'budget_mb': self.memory_budget / (1024 * 1024) if self.memory_budget else None,
+                'loaded_mb': sum(e['memory_bytes'] for e in loaded) / (1024 * 1024),
+                'loaded_models': len(loaded),
+                'registered_models': len(self._entries),
+                'evictions': self._evictions,
+                'reloads': self._reloads
+            }
+    
+    def refcount(self, key: ModelKey) -> int:
+        """
+        Modelin güncel referans sayısı
+        
+        Args:
+            key (tuple): (model_name, device, dtype)
+        
+        Returns:
+            int: Referans sayısı (yüklü değilse 0)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry['refcount'] if entry else 0
+
+# Süreç genelinde paylaşılan kayıt
+model_registry = ModelRegistry()
@@ -0,0 +1,334 @@
+"""
+Konuşma saklama politikası - Eski konuşmaları sıkıştırılmış arşiv segmentlerine taşır
+"""
+
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .storage import ConversationStore
+
+logger = logging.getLogger(__name__)
+
+class ConversationArchive:
+    """
+    Sadece ekleme yapılan, gzip sıkıştırılmış arşiv segmentleri
+    
+    Her konuşma ayrı bir gzip üyesi olarak segmentin sonuna yazılır;
+    (segment, offset, length) ile tek konuşma tüm dosya açılmadan okunur.
+    Her süreç kendi segmentine yazar, segment dolunca yenisi açılır.
+    """
+    
+    def __init__(self, directory: str, segment_max_bytes: int = 64 * 1024 * 1024):
+        """
+        Arşivi aç (klasör yoksa oluştur)
+        
+        Args:
+            directory (str): Segment klasörü
+            segment_max_bytes (int): Segment başına en büyük boyut
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes
+        self._lock = threading.Lock()
+        self._segment: Optional[Path] = None
+    
+    def _current_segment(self) -> Path:
+        """Yazılacak segment (dolduysa yenisini aç)"""
+        if self._segment is None or (
+            self._segment.exists() and self._segment.stat().st_size >= self.segment_max_bytes
+        ):
+            self._segment = self.directory / f"segment-{time.time_ns()}-{os.getpid()}.jsonl.gz"
+        return self._segment
+    
+    def append(self, conversations: List[Dict[str, Any]]) -> List[Tuple[str, int, int]]:
+        """
+        Konuşmaları segmentin sonuna yaz ve diske zorla
+        
+        Args:
+            conversations (list): Mesajlarıyla birlikte konuşmalar
+        
+        Returns:
+            list: Konuşma başına (segment adı, offset, length)
+        """
+        with self._lock:
+            segment = self._current_segment()
+            locations = []
+            with open(segment, 'ab') as f:
+                offset = f.tell()
+                for conversation in conversations:
+                    data = gzip.compress(
+                        json.dumps(conversation, ensure_ascii=False).encode('utf-8') + b"\n"
+                    )
+                    f.write(data)
+                    locations.append((segment.name, offset, len(data)))
+                    offset += len(data)
+                f.flush()
+                os.fsync(f.fileno())
+            return locations
+    
+    def read(self, segment: str, offset: int, length: int) -> Dict[str, Any]:
+        """
+        Tek konuşmayı arşivden oku
+        
+        Args:
+            segment (str): Segment adı
+            offset (int): Konuşmanın segmentteki başlangıcı
+            length (int): Sıkıştırılmış boyut
+        
+        Returns:
+            dict: Mesajlarıyla birlikte konuşma
+        """
+        with open(self.directory / segment, 'rb') as f:
+            f.seek(offset)
+            data = f.read(length)
+        return json.loads(gzip.decompress(data).decode('utf-8'))
+    
+    def size_bytes(self) -> int:
+        """Tüm segmentlerin toplam boyutu"""
+        return sum(p.stat().st_size for p in self.directory.glob("segment-*.jsonl.gz"))
+
+class RetentionManager:
+    """
+    ConversationConfig.max_conversations sınırını uygulayan saklama motoru
+    
+    Birincil depoda en son güncellenen max_conversations konuşma kalır;
+    fazlası arka plan thread'inde arşive yazılır, sonra kısa işlemlerle
+    depodan silinir. add_message sadece bu kısa işlemler kadar bekler.
+    Arşivdeki konuşmalar istendiğinde okunur, yeni mesaj gelirse geri
+    taşınır.
+    """
+    
+    def __init__(
+        self,
+        store: ConversationStore,
+        max_conversations: int,
+        archive_dir: Optional[str] = None,
+        segment_max_bytes: int = 64 * 1024 * 1024,
+        batch_size: int = 100
+    ):
+        """
+        Saklama motorunu başlat (thread ilk ihtiyaçta başlar)
+        
+        Args:
+            store (ConversationStore): Birincil depo
+            max_conversations (int): Depoda tutulacak konuşma sayısı
+            archive_dir (str, optional): Segment klasörü (varsayılan: <db>_archive)
+            segment_max_bytes (int): Segment başına en büyük boyut
+            batch_size (int): İşlem başına taşınacak konuşma sayısı
+        """
+        if archive_dir is None:
+            db_path = Path(store.db_path)
+            archive_dir = str(db_path.with_name(f"{db_path.stem}_archive"))
+        
+        self.store = store
+        self.max_conversations = max(1, max_conversations)
+        self.batch_size = batch_size
+        self.archive = ConversationArchive(archive_dir, segment_max_bytes)
+        
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        
+        self.runs = 0
+        self.archived_conversations = 0
+        self.archived_bytes = 0
+        self.compressed_bytes = 0
+        self.reclaimed_bytes = 0
+        self.released_bytes = 0
+        self.total_seconds = 0.0
+        self.restored = 0
+        self.last_run: Optional[Dict[str, Any]] = None
+    
+    @classmethod
+    def shared(cls, store: ConversationStore, max_conversations: int, **kwargs) -> "RetentionManager":
+        """
+        Depo başına tek saklama motoru (en son verilen sınır geçerlidir)
+        
+        Args:
+            store (ConversationStore): Birincil depo
+            max_conversations (int): Depoda tutulacak konuşma sayısı
+            **kwargs: RetentionManager parametreleri
+        
+        Returns:
+            RetentionManager: Paylaşılan motor
+        """
+        with ConversationStore._instances_lock:
+            manager = getattr(store, 'retention', None)
+            if manager is None:
+                manager = cls(store, max_conversations, **kwargs)
+                store.retention = manager
+            else:
+                manager.max_conversations = max(1, max_conversations)
+            return manager
+    
+    def notify(self) -> None:
+        """Sınır aşıldıysa arka plan sıkıştırmasını tetikle"""
+        if self.store.count_conversations() <= self.max_conversations:
+            return
+        
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="conversation-retention", daemon=True
+                )
+                self._thread.start()
+        self._wakeup.set()
+    
+    def _run(self) -> None:
+        """Tetiklendikçe sıkıştırma yap"""
+        while not self._stopped.is_set():
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break
+            try:
+                self.compact()
+            except Exception as e:
+                logger.error(f"❌ Konuşma arşivleme hatası: {str(e)}")
+    
+    def compact(self) -> Dict[str, Any]:
+        """
+        Sınırı aşan en eski konuşmaları arşive taşı ve boşalan alanı geri ver
+        
+        Returns:
+            dict: archived, archived_bytes, compressed_bytes, reclaimed_bytes,
+                released_bytes, seconds
+        """
+        with self._compact_lock:
+            return self._compact()
+    
+    def _compact(self) -> Dict[str, Any]:
+        """Tek sıkıştırma turu (_compact_lock altında)"""
+        start = time.perf_counter()
+        archived = archived_bytes = compressed_bytes = reclaimed = 0
+        
+        while True:
+            candidates = self.store.get_archive_candidates(self.max_conversations, self.batch_size)
+            if not candidates:
+                break
+            
+            # Dosya yazımı depo kilidi dışında; depodan silme kısa bir işlem
+            locations = self.archive.append(candidates)
+            for conversation, (segment, offset, length) in zip(candidates, locations):
+                archived_bytes += len(json.dumps(conversation, ensure_ascii=False).encode('utf-8'))
+                compressed_bytes += length
+                conversation.update({'segment': segment, 'offset': offset, 'length': length})
+            
+            moved, freed = self.store.move_to_archive(candidates)
+            archived += moved
+            reclaimed += freed
+            if moved == 0:
+                # Adayların hepsi bu arada güncellendi; sonraki tetiklemeye bırak
+                break
+        
+        released = self.store.release_free_pages() if archived else 0
+        elapsed = time.perf_counter() - start
+        
+        stats = {
+            'archived': archived,
+            'archived_bytes': archived_bytes,
+            'compressed_bytes': compressed_bytes,
+            'reclaimed_bytes': reclaimed,
+            'released_bytes': released,
+            'seconds': elapsed
+        }
+        
+        with self._lock:
+            self.runs += 1
+            self.archived_conversations += archived
+            self.archived_bytes += archived_bytes
+            self.compressed_bytes += compressed_bytes
+            self.reclaimed_bytes += reclaimed
+            self.released_bytes += released
+            self.total_seconds += elapsed
+            self.last_run = stats
+        
+        if archived:
+            logger.info(
+                f"🗄️ {archived} konuşma arşivlendi: {archived_bytes / 1024:.0f} KB → "
+                f"{compressed_bytes / 1024:.0f} KB sıkıştırılmış, "
+                f"{reclaimed / 1024:.0f} KB geri kazanıldı ({released / 1024:.0f} KB dosyadan), "
+                f"{elapsed:.2f} sn"
+            )
+        return stats
+    
+    def load(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Arşivlenmiş konuşmayı oku
+        
+        Args:
+            conversation_id (str): Konuşma ID'si
+        
+        Returns:
+            dict: Mesajlarıyla birlikte konuşma ('archived': True), arşivde yoksa None
+        """
+        entry = self.store.get_archive_entry(conversation_id)
+        if entry is None:
+            return None
+        
+        conversation = self.archive.read(entry['segment'], entry['offset'], entry['length'])
+        for key in ('segment', 'offset', 'length'):
+            conversation.pop(key, None)
+        conversation['archived'] = True
+        return conversation
+    
+    def restore(self, conversation_id: str) -> bool:
+        """
+        Arşivlenmiş konuşmayı birincil depoya geri taşı (ör. yeni mesaj geldiğinde)
+        
+        Args:
+            conversation_id (str): Konuşma ID'si
+        
+        Returns:
+            bool: Konuşma artık birincil depodaysa True
+        """
+        conversation = self.load(conversation_id)
+        if conversation is None:
+            return self.store.get_entry(conversation_id) is not None
+        
+        conversation.pop('archived', None)
+        if self.store.restore_conversation(conversation):
+            with self._lock:
+                self.restored += 1
+            logger.info(f"📤 Konuşma arşivden geri alındı: {conversation_id}")
+        return True
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Saklama istatistikleri
+        
+        Returns:
+            dict: Sınır, depo/arşiv sayıları, taşınan ve geri kazanılan baytlar, süreler
+        """
+        with self._lock:
+            return {
+                'max_conversations': self.max_conversations,
+                'active_conversations': self.store.count_conversations(),
+                'archived_conversations': self.store.count_archived(),
+                'archive_mb': self.archive.size_bytes() / (1024 * 1024),
+                'runs': self.runs,
+                'archived': self.archived_conversations,
+                'archived_bytes': self.archived_bytes,
+                'compressed_bytes': self.compressed_bytes,
+                'reclaimed_bytes': self.reclaimed_bytes,
+                'released_bytes': self.released_bytes,
+                'total_seconds': self.total_seconds,
+                'restored': self.restored,
+                'last_run': self.last_run
+            }
+    
+    def close(self) -> None:
+        """Arka plan thread'ini durdur"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
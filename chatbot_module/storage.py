@@ -0,0 +1,845 @@
+"""
+Konuşma deposu - SQLite (WAL) tabanlı, mesaj başına O(1) ekleme
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+from collections.abc import Mapping
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from .config import TurkishLanguageConfig
+from .exceptions import ConversationHistoryError
+
+logger = logging.getLogger(__name__)
+
+_UPPER_TABLE = str.maketrans(TurkishLanguageConfig.UPPER_TO_LOWER)
+_FOLD_TABLE = str.maketrans(TurkishLanguageConfig.SEARCH_FOLDING)
+_WORD_RE = re.compile(r"\w+")
+
+def normalize_search_text(text: str) -> str:
+    """
+    Metni arama için normalleştir (Türkçe büyük/küçük harf ve karakter katlama)
+    
+    "İSTANBUL'da Işık" ve "istanbulda isik" aynı terimlere dönüşür.
+    
+    Args:
+        text (str): Ham metin
+    
+    Returns:
+        str: Küçük harfli, ç/ğ/ı/ö/ş/ü katlanmış metin
+    """
+    return text.translate(_UPPER_TABLE).lower().translate(_FOLD_TABLE)
+
+class ConversationStore:
+    """
+    Konuşmaları ve mesajları SQLite'ta saklayan depo
+    
+    Her mesaj tek bir INSERT ile eklenir; tüm geçmişi yeniden yazmak
+    gerekmez. WAL kipi okuma ve yazmaların birbirini beklemesini önler.
+    
+    Aynı dosyayı birden fazla bot ve birden fazla süreç paylaşabilir:
+    her thread kendi bağlantısını kullanır, okumalar paralel ilerler,
+    yazmalar kısa BEGIN IMMEDIATE işlemleridir ve kilit meşgulse
+    busy_timeout süresince beklenir. Süreç içinde aynı dosya için tek
+    depo örneği shared() ile alınır.
+    
+    Mesajlar normalleştirilmiş halleriyle bir FTS5 ters indeksinde de
+    tutulur; indeks her eklemede aynı işlem içinde güncellenir.
+    """
+    
+    _instances: Dict[str, "ConversationStore"] = {}
+    _instances_lock = threading.Lock()
+    
+    # Konuşma indeks kaydı (mesaj gövdeleri olmadan)
+    _ENTRY_COLUMNS = "id, title, created_at, updated_at, message_count"
+    
+    def __init__(self, db_path: str, busy_timeout: float = 10.0):
+        """
+        Depoyu aç (yoksa oluştur)
+        
+        Args:
+            db_path (str): SQLite dosya yolu
+            busy_timeout (float): Başka bir yazıcı kilidi tutarken bekleme süresi (saniye)
+        """
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        # Thread → bağlantı; sonlanan thread'lerin bağlantıları yeni bağlantı açılırken kapatılır
+        self._connections: Dict[threading.Thread, sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
+        self._closed = False
+        self.search_enabled = True
+        
+        # Depoyu paylaşan tüm geçmişler için tek saklama motoru (RetentionManager.shared)
+        self.retention = None
+        
+        try:
+            db = self._conn()
+            # Yeni depolarda silinen sayfalar dosyadan parça parça geri verilebilir
+            db.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            db.execute("PRAGMA journal_mode=WAL")
+            with self._transaction() as db:
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS conversations ("
+                    "  id TEXT PRIMARY KEY, title TEXT NOT NULL,"
+                    "  created_at TEXT NOT NULL, updated_at TEXT NOT NULL)"
+                )
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS messages ("
+                    "  id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                    "  conversation_id TEXT NOT NULL REFERENCES conversations(id) ON DELETE CASCADE,"
+                    "  role TEXT NOT NULL, content TEXT NOT NULL, timestamp TEXT NOT NULL)"
+                )
+                db.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_messages_conversation"
+                    "  ON messages (conversation_id, id)"
+                )
+                db.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_conversations_updated"
+                    "  ON conversations (updated_at, id)"
+                )
+                db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS archived_conversations ("
+                    "  id TEXT PRIMARY KEY, title TEXT NOT NULL,"
+                    "  created_at TEXT NOT NULL, updated_at TEXT NOT NULL,"
+                    "  message_count INTEGER NOT NULL, segment TEXT NOT NULL,"
+                    "  offset INTEGER NOT NULL, length INTEGER NOT NULL, archived_at TEXT NOT NULL)"
+                )
+                
+                # Kompakt indeks: mesaj sayısı konuşma satırında tutulur (eski depolar için bir kez doldurulur)
+                columns = [row[1] for row in db.execute("PRAGMA table_info(conversations)")]
+                if 'message_count' not in columns:
+                    db.execute(
+                        "ALTER TABLE conversations ADD COLUMN message_count INTEGER NOT NULL DEFAULT 0"
+                    )
+                    db.execute(
+                        "UPDATE conversations SET message_count = "
+                        "(SELECT COUNT(*) FROM messages WHERE conversation_id = conversations.id)"
+                    )
+                
+                self._create_search_index(db)
+        except ConversationHistoryError:
+            raise
+        except Exception as e:
+            raise ConversationHistoryError("open_store", str(e))
+    
+    @classmethod
+    def shared(cls, db_path: str) -> "ConversationStore":
+        """
+        Aynı dosya için süreç genelinde paylaşılan depo örneği
+        
+        Args:
+            db_path (str): SQLite dosya yolu
+        
+        Returns:
+            ConversationStore: Paylaşılan depo
+        """
+        key = str(Path(db_path).resolve())
+        with cls._instances_lock:
+            store = cls._instances.get(key)
+            if store is None or store._closed:
+                store = cls(db_path)
+                cls._instances[key] = store
+            return store
+    
+    @staticmethod
+    def _entry(row: tuple) -> Dict[str, Any]:
+        """Konuşma satırını indeks kaydına çevir"""
+        return {
+            'id': row[0],
+            'title': row[1],
+            'created_at': row[2],
+            'updated_at': row[3],
+            'message_count': row[4]
+        }
+    
+    def _create_search_index(self, db: sqlite3.Connection) -> None:
+        """FTS5 indeksini oluştur; yeni oluşturulduysa mevcut mesajlarla doldur"""
+        exists = db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'messages_fts'"
+        ).fetchone() is not None
+        if exists:
+            return
+        
+        try:
+            db.execute("CREATE VIRTUAL TABLE messages_fts USING fts5(content, tokenize = 'unicode61')")
+        except sqlite3.OperationalError as e:
+            # SQLite FTS5 olmadan derlenmişse arama LIKE taramasına düşer
+            self.search_enabled = False
+            logger.warning(f"⚠️ FTS5 kullanılamıyor, arama yavaş modda: {str(e)}")
+            return
+        
+        indexed = db.execute(
+            "INSERT INTO messages_fts (rowid, content) "
+            "SELECT id, search_normalize(content) FROM messages"
+        ).rowcount
+        if indexed:
+            logger.info(f"🔎 Arama indeksi oluşturuldu: {indexed} mesaj")
+    
+    def _conn(self) -> sqlite3.Connection:
+        """Bu thread'in bağlantısı (yoksa aç)"""
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            if self._closed:
+                raise ConversationHistoryError("connect", "Depo kapatıldı")
+            # isolation_level=None: işlemler _transaction ile açıkça yönetilir
+            db = sqlite3.connect(
+                self.db_path,
+                timeout=self.busy_timeout,
+                isolation_level=None,
+                check_same_thread=False
+            )
+            db.execute(f"PRAGMA busy_timeout={int(self.busy_timeout * 1000)}")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("PRAGMA foreign_keys=ON")
+            db.create_function("search_normalize", 1, normalize_search_text, deterministic=True)
+            self._local.db = db
+            with self._connections_lock:
+                self._prune_connections()
+                self._connections[threading.current_thread()] = db
+        return db
+    
+    def _prune_connections(self) -> None:
+        """Sonlanmış thread'lerin bağlantılarını kapat (_connections_lock tutulurken çağrılır)"""
+        dead = [thread for thread in self._connections if not thread.is_alive()]
+        for thread in dead:
+            try:
+                self._connections.pop(thread).close()
+            except Exception:
+                pass
+    
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Yazma işlemi: yazma kilidi baştan alınır, hata olursa geri alınır
+        
+        Yields:
+            sqlite3.Connection: Bu thread'in bağlantısı
+        """
+        db = self._conn()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        else:
+            db.execute("COMMIT")
+    
+    def migrate_from_json(self, json_path: str) -> int:
+        """
+        Eski conversations.json dosyasını bir kez içe aktar
+        
+        Aynı dosya ikinci kez aktarılmaz; kaynak dosyaya dokunulmaz.
+        Kontrol ve aktarım tek işlemde yapıldığından eşzamanlı açılan
+        süreçler dosyayı iki kez aktarmaz.
+        
+        Args:
+            json_path (str): JSON dosya yolu
+        
+        Returns:
+            int: Aktarılan konuşma sayısı
+        """
+        source = str(Path(json_path).resolve())
+        row = self._conn().execute(
+            "SELECT value FROM meta WHERE key = 'migrated_from'"
+        ).fetchone()
+        if (row is not None and row[0] == source) or not Path(json_path).exists():
+            return 0
+        
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                conversations = json.load(f)
+        except Exception:
+            # Bozuk dosya: eski davranıştaki gibi boş başla
+            conversations = {}
+        
+        try:
+            with self._transaction() as db:
+                row = db.execute("SELECT value FROM meta WHERE key = 'migrated_from'").fetchone()
+                if row is not None and row[0] == source:
+                    return 0
+                
+                for conversation in conversations.values():
+                    inserted = db.execute(
+                        "INSERT OR IGNORE INTO conversations "
+                        "(id, title, created_at, updated_at, message_count) VALUES (?, ?, ?, ?, ?)",
+                        (
+                            conversation['id'],
+                            conversation.get('title', ''),
+                            conversation['created_at'],
+                            conversation['updated_at'],
+                            len(conversation.get('messages', []))
+                        )
+                    ).rowcount
+                    if not inserted:
+                        # Depoda zaten var; mesajları çoğaltma
+                        continue
+                    db.executemany(
+                        "INSERT INTO messages (conversation_id, role, content, timestamp) "
+                        "VALUES (?, ?, ?, ?)",
+                        [
+                            (conversation['id'], m['role'], m['content'], m['timestamp'])
+                            for m in conversation.get('messages', [])
+                        ]
+                    )
+                    if self.search_enabled:
+                        db.execute(
+                            "INSERT INTO messages_fts (rowid, content) "
+                            "SELECT id, search_normalize(content) FROM messages WHERE conversation_id = ?",
+                            (conversation['id'],)
+                        )
+                db.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from', ?)",
+                    (source,)
+                )
+        except Exception as e:
+            raise ConversationHistoryError("migrate", str(e))
+        
+        return len(conversations)
+    
+    def load_all(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Tüm konuşmaları mesajlarıyla birlikte yükle
+        
+        Sadece dışa aktarım içindir; normal akışta konuşmalar tek tek
+        get_conversation ile, listeler list_conversations ile okunur.
+        
+        Returns:
+            dict: conversation_id -> konuşma verisi (conversations.json biçimi)
+        """
+        db = self._conn()
+        conversations = {
+            row[0]: {
+                'id': row[0],
+                'title': row[1],
+                'created_at': row[2],
+                'updated_at': row[3],
+                'messages': []
+            }
+            for row in db.execute(
+                "SELECT id, title, created_at, updated_at FROM conversations"
+            )
+        }
+        for conversation_id, role, content, timestamp in db.execute(
+            "SELECT conversation_id, role, content, timestamp FROM messages ORDER BY id"
+        ):
+            conversations[conversation_id]['messages'].append({
+                'role': role,
+                'content': content,
+                'timestamp': timestamp
+            })
+        return conversations
+    
+    def get_conversation(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Tek konuşmayı mesajlarıyla birlikte getir
+        
+        Args:
+            conversation_id (str): Konuşma ID'si
+        
+        Returns:
+            dict: Konuşma verisi (yoksa None)
+        """
+        conversation = self.get_entry(conversation_id)
+        if conversation is None:
+            return None
+        
+        conversation['messages'] = self.get_messages(conversation_id)
+        return conversation
+    
+    def get_entry(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Konuşmanın indeks kaydı (mesajlar olmadan)
+        
+        Args:
+            conversation_id (str): Konuşma ID'si
+        
+        Returns:
+            dict: id, title, created_at, updated_at, message_count (yoksa None)
+        """
+        row = self._conn().execute(
+            f"SELECT {self._ENTRY_COLUMNS} FROM conversations WHERE id = ?",
+            (conversation_id,)
+        ).fetchone()
+        return self._entry(row) if row is not None else None
+    
+    def count_conversations(self) -> int:
+        """
+        Konuşma sayısı
+        
+        Returns:
+            int: Depodaki konuşma sayısı
+        """
+        return self._conn().execute("SELECT COUNT(*) FROM conversations").fetchone()[0]
+    
+    def conversation_ids(self) -> List[str]:
+        """
+        Tüm konuşma ID'leri (son güncellenen önce)
+        
+        Returns:
+            list: Konuşma ID'leri
+        """
+        return [
+            row[0] for row in self._conn().execute(
+                "SELECT id FROM conversations ORDER BY updated_at DESC, id DESC"
+            )
+        ]
+    
+    def get_messages(self, conversation_id: str, limit: int = 0, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Konuşmanın mesajları (eskiden yeniye)
+        
+        Args:
+            conversation_id (str): Konuşma ID'si
+            limit (int): Son kaç mesaj (0: hepsi)
+            offset (int): limit verilmediğinde atlanacak ilk mesaj sayısı
+        
+        Returns:
+            list: role, content, timestamp alanlı mesajlar
+        """
+        if limit > 0:
+            rows = self._conn().execute(
+                "SELECT role, content, timestamp FROM ("
+                "  SELECT id, role, content, timestamp FROM messages"
+                "  WHERE conversation_id = ? ORDER BY id DESC LIMIT ?"
+                ") ORDER BY id",
+                (conversation_id, limit)
+            ).fetchall()
+        else:
+            rows = self._conn().execute(
+                "SELECT role, content, timestamp FROM messages "
+                "WHERE conversation_id = ? ORDER BY id LIMIT -1 OFFSET ?",
+                (conversation_id, max(0, offset))
+            ).fetchall()
+        return [{'role': r[0], 'content': r[1], 'timestamp': r[2]} for r in rows]
+    
+    def list_conversations(
+        self,
+        limit: int = 50,
+        before: Optional[Tuple[str, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Konuşmaları son güncellenene göre listele (mesajlar olmadan)
+        
+        updated_at indeksi üzerinde keyset sayfalama yapılır; sıralama
+        için tüm tablo taranmaz, maliyet limit ile orantılıdır.
+        
+        Args:
+            limit (int): En fazla konuşma sayısı
+            before (tuple, optional): (updated_at, id) - bu konuşmadan sonrakiler
+        
+        Returns:
+            list: id, title, created_at, updated_at, message_count alanlı kayıtlar
+        """
+        sql = f"SELECT {self._ENTRY_COLUMNS} FROM conversations"
+        params: tuple = ()
+        if before is not None:
+            sql += " WHERE (updated_at, id) < (?, ?)"
+            params = tuple(before)
+        sql += " ORDER BY updated_at DESC, id DESC LIMIT ?"
+        
+        rows = self._conn().execute(sql, params + (limit,)).fetchall()
+        return [self._entry(row) for row in rows]
+    
+    
+    def create_conversation(self, conversation: Dict[str, Any]) -> None:
+        """
+        Yeni konuşma kaydı ekle
+        
+        Args:
+            conversation (dict): id, title, created_at, updated_at alanları
+        """
+        self._write(
+            "INSERT INTO conversations (id, title, created_at, updated_at) VALUES (?, ?, ?, ?)",
+            (
+                conversation['id'],
+                conversation['title'],
+                conversation['created_at'],
+                conversation['updated_at']
+            )
+        )
+    
+    def append_message(
+        self,
+        conversation_id: str,
+        message: Dict[str, Any],
+        updated_at: str,
+        title: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Konuşmaya mesaj ekle (tek işlem: INSERT + başlık/zaman güncellemesi)
+        
+        Başlık sadece konuşmanın ilk mesajıyla yazılır; bu kontrol aynı
+        işlem içinde yapıldığından eşzamanlı yazıcılar birbirinin
+        başlığını ezmez.
+        
+        Args:
+            conversation_id (str): Konuşma ID'si
+            message (dict): role, content, timestamp alanları
+            updated_at (str): Konuşmanın yeni güncellenme zamanı
+            title (str, optional): İlk mesajsa kullanılacak başlık
+        
+        Returns:
+            str: Yazılan başlık (değişmediyse None)
+        
+        Raises:
+            ConversationHistoryError: Konuşma yoksa (ör. başka süreç sildiyse)
+        """
+        try:
+            with self._transaction() as db:
+                row = db.execute(
+                    "SELECT message_count FROM conversations WHERE id = ?", (conversation_id,)
+                ).fetchone()
+                if row is None:
+                    raise ConversationHistoryError(f"Konuşma bulunamadı: {conversation_id}")
+                
+                if row[0] > 0:
+                    title = None
+                
+                message_id = db.execute(
+                    "INSERT INTO messages (conversation_id, role, content, timestamp) "
+                    "VALUES (?, ?, ?, ?)",
+                    (conversation_id, message['role'], message['content'], message['timestamp'])
+                ).lastrowid
+                if self.search_enabled:
+                    db.execute(
+                        "INSERT INTO messages_fts (rowid, content) VALUES (?, ?)",
+                        (message_id, normalize_search_text(message['content']))
+                    )
+                db.execute(
+                    "UPDATE conversations SET updated_at = ?, title = COALESCE(?, title), "
+                    "message_count = message_count + 1 WHERE id = ?",
+                    (updated_at, title, conversation_id)
+                )
+        except ConversationHistoryError:
+            raise
+        except Exception as e:
+            raise ConversationHistoryError("append_message", str(e))
+        return title
+    
+    def delete_conversation(self, conversation_id: str) -> bool:
+        """
+        Konuşmayı ve mesajlarını sil (arşivlenmişse arşiv kaydını da)
+        
+        Arşiv segmentindeki sıkıştırılmış kopya yerinde kalır; indeks kaydı
+        silinince erişilemez olur.
+        
+        Args:
+            conversation_id (str): Konuşma ID'si
+        
+        Returns:
+            bool: Konuşma depoda veya arşivde vardıysa True
+        """
+        try:
+            with self._transaction() as db:
+                if self.search_enabled:
+                    db.execute(
+                        "DELETE FROM messages_fts WHERE rowid IN "
+                        "(SELECT id FROM messages WHERE conversation_id = ?)",
+                        (conversation_id,)
+                    )
+                deleted = db.execute(
+                    "DELETE FROM conversations WHERE id = ?", (conversation_id,)
+                ).rowcount
+                deleted += db.execute(
+                    "DELETE FROM archived_conversations WHERE id = ?", (conversation_id,)
+                ).rowcount
+                return deleted > 0
+        except Exception as e:
+            raise ConversationHistoryError("delete_conversation", str(e))
+    
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Mesajlarda tam metin arama (en yeni eşleşmeler önce)
+        
+        Sorgudaki her kelime (3 harf ve üzeri) önek olarak aranır ve hepsi
+        geçmelidir ("kitap" → "kitaplar", "Işık" → "ışıklı"). Türkçe
+        karakter ve büyük/küçük harf farkı gözetilmez.
+        
+        Args:
+            query (str): Arama metni
+            limit (int): En fazla sonuç sayısı
+        
+        Returns:
+            list: conversation_id, title, role, content, timestamp alanlı eşleşmeler
+        """
+        terms = _WORD_RE.findall(normalize_search_text(query or ""))
+        if not terms:
+            return []
+        
+        if self.search_enabled:
+            # Çok kısa önekler binlerce terime açılır; onlar tam kelime olarak aranır
+            match = " ".join(f'"{term}"*' if len(term) >= 3 else f'"{term}"' for term in terms)
+            sql = (
+                "SELECT m.conversation_id, c.title, m.role, m.content, m.timestamp "
+                "FROM messages_fts f "
+                "JOIN messages m ON m.id = f.rowid "
+                "JOIN conversations c ON c.id = m.conversation_id "
+                "WHERE messages_fts MATCH ? ORDER BY f.rowid DESC LIMIT ?"
+            )
+            params: tuple = (match, limit)
+        else:
+            conditions = " AND ".join("search_normalize(m.content) LIKE ?" for _ in terms)
+            sql = (
+                "SELECT m.conversation_id, c.title, m.role, m.content, m.timestamp "
+                "FROM messages m JOIN conversations c ON c.id = m.conversation_id "
+                f"WHERE {conditions} ORDER BY m.id DESC LIMIT ?"
+            )
+            params = tuple(f"%{term}%" for term in terms) + (limit,)
+        
+        try:
+            rows = self._conn().execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            raise ConversationHistoryError("search", str(e))
+        
+        return [
+            {
+                'conversation_id': row[0],
+                'title': row[1],
+                'role': row[2],
+                'content': row[3],
+                'timestamp': row[4]
+            }
+            for row in rows
+        ]
+    
+    def get_archive_candidates(self, keep: int, limit: int = 200) -> List[Dict[str, Any]]:
+        """
+        En yeni keep konuşmanın dışında kalanlar (arşivlenecekler, eskiden yeniye)
+        
+        Args:
+            keep (int): Birincil depoda tutulacak konuşma sayısı
+            limit (int): En fazla kaç aday döndürülsün
+        
+        Returns:
+            list: Mesajlarıyla birlikte konuşmalar
+        """
+        rows = self._conn().execute(
+            f"SELECT {self._ENTRY_COLUMNS} FROM conversations "
+            "ORDER BY updated_at ASC, id ASC LIMIT ?",
+            (max(0, min(limit, self.count_conversations() - keep)),)
+        ).fetchall()
+        
+        conversations = []
+        for row in rows:
+            conversation = self._entry(row)
+            conversation['messages'] = self.get_messages(conversation['id'])
+            conversations.append(conversation)
+        return conversations
+    
+    def move_to_archive(self, archived: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """
+        Arşive yazılmış konuşmaları birincil depodan çıkar (tek kısa işlem)
+        
+        Arşive yazıldıktan sonra yeni mesaj almış konuşmalar (updated_at
+        değişmiş) yerinde bırakılır; arşivdeki kopyaları indekslenmez.
+        
+        Args:
+            archived (list): id, updated_at, title, created_at, message_count,
+                segment, offset, length alanlı kayıtlar
+        
+        Returns:
+            Tuple: (taşınan konuşma sayısı, serbest kalan bayt)
+        """
+        try:
+            with self._transaction() as db:
+                free_before = db.execute("PRAGMA freelist_count").fetchone()[0]
+                moved = 0
+                archived_at = datetime.now().isoformat()
+                for item in archived:
+                    if db.execute(
+                        "SELECT 1 FROM conversations WHERE id = ? AND updated_at = ?",
+                        (item['id'], item['updated_at'])
+                    ).fetchone() is None:
+                        continue
+                    
+                    if self.search_enabled:
+                        db.execute(
+                            "DELETE FROM messages_fts WHERE rowid IN "
+                            "(SELECT id FROM messages WHERE conversation_id = ?)",
+                            (item['id'],)
+                        )
+                    db.execute("DELETE FROM conversations WHERE id = ?", (item['id'],))
+                    db.execute(
+                        "INSERT OR REPLACE INTO archived_conversations "
+                        "(id, title, created_at, updated_at, message_count, segment, offset, length, archived_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            item['id'], item['title'], item['created_at'], item['updated_at'],
+                            item['message_count'], item['segment'], item['offset'], item['length'],
+                            archived_at
+                        )
+                    )
+                    moved += 1
+                free_after = db.execute("PRAGMA freelist_count").fetchone()[0]
+                page_size = db.execute("PRAGMA page_size").fetchone()[0]
+        except Exception as e:
+            raise ConversationHistoryError("archive", str(e))
+        
+        return moved, max(0, free_after - free_before) * page_size
+    
+    def release_free_pages(self, pages_per_step: int = 256) -> int:
+        """
+        Boş sayfaları dosyadan küçük adımlarla geri ver (auto_vacuum=INCREMENTAL depolarda)
+        
+        Her adım ayrı kısa bir işlemdir; yazıcılar adımlar arasında ilerler.
+        
+        Args:
+            pages_per_step (int): Adım başına sayfa sayısı
+        
+        Returns:
+            int: Dosyadan geri verilen bayt
+        """
+        db = self._conn()
+        if db.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            return 0
+        
+        page_size = db.execute("PRAGMA page_size").fetchone()[0]
+        released = 0
+        free = db.execute("PRAGMA freelist_count").fetchone()[0]
+        while free > 0:
+            # executescript pragmayı sonuna kadar adımlar (execute tek sayfa bırakır)
+            db.executescript(
+                f"BEGIN IMMEDIATE; PRAGMA incremental_vacuum({pages_per_step}); COMMIT;"
+            )
+            remaining = db.execute("PRAGMA freelist_count").fetchone()[0]
+            if remaining >= free:
+                break
+            released += (free - remaining) * page_size
+            free = remaining
+        db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return released
+    
+    def get_archive_entry(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Arşivlenmiş konuşmanın konum kaydı
+        
+        Args:
+            conversation_id (str): Konuşma ID'si
+        
+        Returns:
+            dict: İndeks alanları + segment, offset, length, archived_at (yoksa None)
+        """
+        row = self._conn().execute(
+            "SELECT id, title, created_at, updated_at, message_count, segment, offset, length, archived_at "
+            "FROM archived_conversations WHERE id = ?",
+            (conversation_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        entry = self._entry(row)
+        entry.update({'segment': row[5], 'offset': row[6], 'length': row[7], 'archived_at': row[8]})
+        return entry
+    
+    def count_archived(self) -> int:
+        """
+        Arşivdeki konuşma sayısı
+        
+        Returns:
+            int: Arşivlenmiş konuşma sayısı
+        """
+        return self._conn().execute("SELECT COUNT(*) FROM archived_conversations").fetchone()[0]
+    
+    def restore_conversation(self, conversation: Dict[str, Any]) -> bool:
+        """
+        Arşivden okunan konuşmayı birincil depoya geri koy
+        
+        Args:
+            conversation (dict): Mesajlarıyla birlikte konuşma
+        
+        Returns:
+            bool: Geri konduysa True (başka yazıcı önce koyduysa False)
+        """
+        try:
+            with self._transaction() as db:
+                if not db.execute(
+                    "DELETE FROM archived_conversations WHERE id = ?", (conversation['id'],)
+                ).rowcount:
+                    return False
+                
+                messages = conversation.get('messages', [])
+                db.execute(
+                    "INSERT INTO conversations "
+                    "(id, title, created_at, updated_at, message_count) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        conversation['id'],
+                        conversation['title'],
+                        conversation['created_at'],
+                        conversation['updated_at'],
+                        len(messages)
+                    )
+                )
+                db.executemany(
+                    "INSERT INTO messages (conversation_id, role, content, timestamp) "
+                    "VALUES (?, ?, ?, ?)",
+                    [(conversation['id'], m['role'], m['content'], m['timestamp']) for m in messages]
+                )
+                if self.search_enabled:
+                    db.execute(
+                        "INSERT INTO messages_fts (rowid, content) "
+                        "SELECT id, search_normalize(content) FROM messages WHERE conversation_id = ?",
+                        (conversation['id'],)
+                    )
+        except Exception as e:
+            raise ConversationHistoryError("restore", str(e))
+        return True
+    
+    def _write(self, sql: str, params: tuple) -> int:
+        """Tek ifadelik yazma işlemi (etkilenen satır sayısını döndürür)"""
+        try:
+            with self._transaction() as db:
+                return db.execute(sql, params).rowcount
+        except Exception as e:
+            raise ConversationHistoryError("write", str(e))
+    
+    def close(self) -> None:
+        """Tüm thread'lerin bağlantılarını kapat"""
+        self._closed = True
+        with self._connections_lock:
+            connections, self._connections = list(self._connections.values()), {}
+        for db in connections:
+            try:
+                db.close()
+            except Exception:
+                pass
+        self._local = threading.local()
+
+class ConversationView(Mapping):
+    """
+    Depo üzerinde salt okunur, tembel conversation_id -> konuşma eşlemesi
+    
+    Eski ConversationHistory.conversations sözlüğünün yerini alır:
+    uzunluk ve anahtarlar indeksten gelir, mesaj gövdeleri sadece bir
+    konuşmaya erişildiğinde okunur.
+    """
+    
+    def __init__(self, store: ConversationStore):
+        """
+        Args:
+            store (ConversationStore): Okunacak depo
+        """
+        self._store = store
+    
+    def __getitem__(self, conversation_id: str) -> Dict[str, Any]:
+        conversation = self._store.get_conversation(conversation_id)
+        if conversation is None:
+            raise KeyError(conversation_id)
+        return conversation
+    
+    def __contains__(self, conversation_id: object) -> bool:
+        return isinstance(conversation_id, str) and self._store.get_entry(conversation_id) is not None
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store.conversation_ids())
+    
+    def __len__(self) -> int:
+        return self._store.count_conversations()
@@ -7,10 +7,175 @@ import re
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+import logging
 import random
 
+from .config import TurkishLanguageConfig
 from .exceptions import ConversationHistoryError, InvalidInputError
+from .storage import ConversationStore, ConversationView
+from .retention import RetentionManager
+
+logger = logging.getLogger(__name__)
+
+# clean_text her turda iki kez çalışır; desenler modül yüklenirken bir kez derlenir
+_WHITESPACE_RE = re.compile(r'\s+')
+_REPEATED_PUNCT_RE = re.compile(r'([.!?])\1+')
+_SYMBOL_RE = re.compile(
+    r'[^\w\s\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF.,!?;:()"-]'
+)
+
+class IntentMatcher:
+    """
+    Tek bir derlenmiş desenle niyet tespiti
+    
+    Tüm niyetlerin kalıpları ortak önekleri paylaşan (trie biçiminde) tek
+    bir alternatif regex'e derlenir; metin bir kez taranır ve yalnızca
+    kelime sınırlarındaki eşleşmeler sayılır ("ne", "neşe" ya da "gene"
+    içinde bulunmaz). Bir metinde birden çok niyet varsa önceliği en
+    yüksek olan seçilir; uzun bir kalıbın içindeki daha öncelikli kalıp
+    da sayılır ("nasıl yapılır" içindeki "nasıl" soru niyetidir).
+    """
+    
+    def __init__(self, intents: List[Tuple[str, List[str]]], question_intent: str = 'question'):
+        """
+        Deseni derle
+        
+        Args:
+            intents (list): Öncelik sırasıyla (niyet, kalıplar) çiftleri
+            question_intent (str): '?' ile biten metinlere verilecek niyet
+        """
+        self.intents = [intent for intent, _ in intents]
+        self.question_intent = question_intent
+        self._question_priority = (
+            self.intents.index(question_intent) if question_intent in self.intents else len(self.intents)
+        )
+        
+        # Kalıp → öncelik; aynı kalıp birden çok niyette varsa önceliği yüksek olan alır
+        self._priority: Dict[str, int] = {}
+        for priority, (_, patterns) in enumerate(intents):
+            for pattern in patterns:
+                self._priority.setdefault(' '.join(self._lower(pattern).split()), priority)
+        
+        # Desen her konumda en uzun kalıbı bulur; içerdiği kalıpların önceliği ona geçer
+        self._priority = {
+            pattern: min(
+                p for other, p in self._priority.items()
+                if re.search(r'(?<!\w)' + re.escape(other) + r'(?!\w)', pattern)
+            )
+            for pattern in self._priority
+        }
+        
+        # İleri bakış: örtüşen eşleşmeler de bulunur (her kelime başı ayrı denenir)
+        self.pattern = re.compile(
+            r'(?<!\w)(?=(' + self._trie_pattern(list(self._priority)) + r')(?!\w))'
+        )
+    
+    @classmethod
+    def from_config(cls) -> "IntentMatcher":
+        """
+        TurkishLanguageConfig listelerinden eşleştirici oluştur
+        
+        Returns:
+            IntentMatcher: greeting > farewell > question > help_request > thanks
+        """
+        return cls([
+            ('greeting', TurkishLanguageConfig.GREETING_PATTERNS),
+            ('farewell', TurkishLanguageConfig.FAREWELL_PATTERNS),
+            ('question', TurkishLanguageConfig.QUESTION_WORDS),
+            ('help_request', TurkishLanguageConfig.HELP_PATTERNS),
+            ('thanks', TurkishLanguageConfig.THANKS_PATTERNS)
+        ])
+    
+    @staticmethod
+    def _trie_pattern(patterns: List[str]) -> str:
+        """
+        Kalıpları ortak önekleri birleştirilmiş regex'e çevir
+        
+        Düz alternatifte regex motoru her konumda tüm kalıpları tek tek
+        dener; önek ağacında her karakter bir kez karşılaştırılır.
+        Kalıplardaki boşluk herhangi bir boşluk dizisiyle eşleşir.
+        """
+        trie: Dict[str, Any] = {}
+        for pattern in patterns:
+            node = trie
+            for char in pattern:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        
+        def build(node: Dict[str, Any]) -> str:
+            branches = [
+                (r'\s+' if char == ' ' else re.escape(char)) + build(child)
+                for char, child in sorted(node.items()) if char
+            ]
+            if not branches:
+                return ''
+            body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+            # Kalıp burada bitebiliyorsa devamı isteğe bağlı
+            return f'(?:{body})?' if '' in node else body
+        
+        return build(trie)
+    
+    @staticmethod
+    def _lower(text: str) -> str:
+        """Türkçe küçük harfe çevir (I → ı, İ → i)"""
+        for upper, lower in TurkishLanguageConfig.UPPER_TO_LOWER.items():
+            text = text.replace(upper, lower)
+        return text.lower()
+    
+    def _best(self, lowered: str, text: str) -> int:
+        """Metindeki en yüksek öncelikli kalıbın önceliği ('?' kuralı dahil)"""
+        best = len(self.intents)
+        priority = self._priority
+        for found in self.pattern.findall(lowered):
+            p = priority.get(found)
+            if p is None:
+                # Çok kelimeli kalıp farklı boşlukla yazılmış
+                p = priority[' '.join(found.split())]
+            if p < best:
+                best = p
+                if best == 0:
+                    break
+        if best > self._question_priority and text.endswith('?'):
+            best = self._question_priority
+        return best
+    
+    def match(self, text: str) -> str:
+        """
+        Tek metnin niyeti
+        
+        Args:
+            text (str): Kullanıcı metni
+        
+        Returns:
+            str: Niyet (eşleşme yoksa 'general')
+        """
+        best = self._best(self._lower(text), text)
+        return self.intents[best] if best < len(self.intents) else 'general'
+    
+    def match_batch(self, texts: Iterable[str]) -> List[str]:
+        """
+        Çok sayıda metnin niyeti
+        
+        Metinler birleştirilip tek seferde küçük harfe çevrilir; desen
+        her metinde ayrı çalışır (eşleşme metin sınırını aşmaz).
+        
+        Args:
+            texts (iterable): Kullanıcı metinleri
+        
+        Returns:
+            list: Metin başına niyet (aynı sırayla)
+        """
+        texts = [t.replace('\x00', ' ') if isinstance(t, str) else '' for t in texts]
+        if not texts:
+            return []
+        
+        names = self.intents + ['general']
+        best = self._best
+        lowered = self._lower('\x00'.join(texts)).split('\x00')
+        return [names[best(low, text)] for low, text in zip(lowered, texts)]
+
+_INTENT_MATCHER = IntentMatcher.from_config()
 
 class ChatUtils:
     """
@@ -32,13 +197,13 @@ class ChatUtils:
             return ""
         
         # Fazla boşlukları temizle
-        text = re.sub(r'\s+', ' ', text.strip())
+        text = _WHITESPACE_RE.sub(' ', text.strip())
         
         # Tekrarlayan noktalama işaretlerini temizle
-        text = re.sub(r'([.!?])\1+', r'\1', text)
+        text = _REPEATED_PUNCT_RE.sub(r'\1', text)
         
         # Emoji'leri koru ama fazla sembolleri temizle
-        text = re.sub(r'[^\w\s\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF.,!?;:()"-]', '', text)
+        text = _SYMBOL_RE.sub('', text)
         
         return text.strip()
     
@@ -83,7 +248,10 @@ class ChatUtils:
     @staticmethod
     def extract_intent(text: str) -> str:
         """
-        Metinden niyet çıkar (basit)
+        Metinden niyet çıkar
+        
+        Kalıplar TurkishLanguageConfig listelerinden derlenmiş tek bir
+        desenle kelime sınırlarında aranır (IntentMatcher).
         
         Args:
             text (str): Kullanıcı metni
@@ -91,34 +259,22 @@ class ChatUtils:
         Returns:
             str: Tespit edilen niyet
         """
-        text_lower = text.lower()
-        
-        # Selamlama
-        greetings = ['merhaba', 'selam', 'günaydın', 'iyi günler', 'naber', 'nasılsın']
-        if any(word in text_lower for word in greetings):
-            return 'greeting'
-        
-        # Veda
-        farewells = ['görüşürüz', 'bay', 'güle güle', 'hoşça kal', 'elveda']
-        if any(word in text_lower for word in farewells):
-            return 'farewell'
-        
-        # Soru
-        question_words = ['nasıl', 'ne', 'neden', 'nerede', 'kim', 'hangi', 'kaç']
-        if any(word in text_lower for word in question_words) or text.endswith('?'):
-            return 'question'
+        if not isinstance(text, str):
+            return 'general'
+        return _INTENT_MATCHER.match(text)
         
-        # Yardım isteği
-        help_words = ['yardım', 'help', 'nasıl yapılır', 'öğren', 'anlat']
-        if any(word in text_lower for word in help_words):
-            return 'help_request'
+    @staticmethod
+    def extract_intents(texts: Iterable[str]) -> List[str]:
+        """
+        Çok sayıda metnin niyetini toplu çıkar
         
-        # Teşekkür
-        thanks = ['teşekkür', 'sağol', 'mersi', 'thanks']
-        if any(word in text_lower for word in thanks):
-            return 'thanks'
+        Args:
+            texts (iterable): Kullanıcı metinleri
         
-        return 'general'
+        Returns:
+            list: Metin başına niyet (aynı sırayla)
+        """
+        return _INTENT_MATCHER.match_batch(texts)
     
     @staticmethod
     def format_response(response: str, intent: str = 'general') -> str:
@@ -161,14 +317,58 @@ class ChatUtils:
 class ConversationHistory:
     """
     Konuşma geçmişi yönetimi
+    
+    Kayıtlar SQLite deposunda (ConversationStore) tutulur; her mesaj tek
+    bir ekleme işlemidir. Eski conversations.json dosyası ilk açılışta
+    bir kez depoya aktarılır.
+    
+    Aynı dosyayı kullanan tüm örnekler (botlar) ve süreçler tek depoyu
+    paylaşır; örnek başına bellekte kopya tutulmaz, okumalar her zaman
+    depodaki güncel veriyi görür.
+    
+    Başlangıçta hiçbir konuşma belleğe okunmaz: listeler kompakt indeksten
+    (id, başlık, zamanlar, mesaj sayısı) gelir, mesaj gövdeleri konuşma
+    başına ve gerektiği kadar getirilir.
+    
+    max_conversations verilirse fazla konuşmalar arka planda sıkıştırılmış
+    arşive taşınır (RetentionManager); arşivdekiler okunabilir kalır.
     """
     
-    def __init__(self, file_path: str = "conversations.json"):
+    def __init__(
+        self,
+        file_path: str = "conversations.json",
+        db_path: Optional[str] = None,
+        max_conversations: Optional[int] = None,
+        archive_segment_mb: int = 64
+    ):
+        """
+        Konuşma geçmişini başlat
+        
+        Args:
+            file_path (str): Eski JSON dosyası (veya doğrudan .db dosyası)
+            db_path (str, optional): SQLite dosyası (varsayılan: file_path'in .db uzantılısı)
+            max_conversations (int, optional): Birincil depoda tutulacak konuşma sayısı (None: sınırsız)
+            archive_segment_mb (int): Arşiv segmenti başına en büyük boyut (MB)
+        """
         self.file_path = file_path
-        self.conversations: Dict[str, Dict] = {}
+        if db_path is None:
+            db_path = str(Path(file_path).with_suffix('.db'))
+        self.db_path = db_path
+        self.store = ConversationStore.shared(db_path)
         self.current_conversation_id: Optional[str] = None
+        
+        self.retention: Optional[RetentionManager] = None
+        if max_conversations:
+            self.retention = RetentionManager.shared(
+                self.store, max_conversations, segment_max_bytes=archive_segment_mb * 1024 * 1024
+            )
         self.load_conversations()
     
+    @property
+    def conversations(self) -> ConversationView:
+        """Konuşmaların tembel görünümü (erişilen konuşma depodan okunur)"""
+        return ConversationView(self.store)
+    
     def create_conversation(self, title: str = None) -> str:
         """
         Yeni konuşma oluştur
@@ -184,7 +384,7 @@ class ConversationHistory:
         if not title:
             title = f"Konuşma {datetime.now().strftime('%Y-%m-%d %H:%M')}"
         
-        self.conversations[conversation_id] = {
+        conversation = {
             'id': conversation_id,
             'title': title,
             'created_at': datetime.now().isoformat(),
@@ -192,8 +392,11 @@ class ConversationHistory:
             'messages': []
         }
         
+        self.store.create_conversation(conversation)
         self.current_conversation_id = conversation_id
-        self.save_conversations()
+        
+        if self.retention is not None:
+            self.retention.notify()
         return conversation_id
     
     def add_message(self, role: str, content: str, conversation_id: str = None) -> None:
@@ -211,24 +414,24 @@ class ConversationHistory:
         if conversation_id is None:
             conversation_id = self.create_conversation()
         
-        if conversation_id not in self.conversations:
-            raise ConversationHistoryError(f"Konuşma bulunamadı: {conversation_id}")
-        
         message = {
             'role': role,
             'content': content,
             'timestamp': datetime.now().isoformat()
         }
         
-        self.conversations[conversation_id]['messages'].append(message)
-        self.conversations[conversation_id]['updated_at'] = datetime.now().isoformat()
-        
-        # Başlığı ilk kullanıcı mesajından oluştur
-        if role == 'user' and len(self.conversations[conversation_id]['messages']) == 1:
+        # Başlık ilk kullanıcı mesajından oluşturulur (ilk mesaj olup olmadığına depo karar verir)
+        title = None
+        if role == 'user':
             title = content[:50] + "..." if len(content) > 50 else content
-            self.conversations[conversation_id]['title'] = title
         
-        self.save_conversations()
+        try:
+            self.store.append_message(conversation_id, message, datetime.now().isoformat(), title)
+        except ConversationHistoryError:
+            # Arşivlenmiş konuşmaya yeni mesaj: önce birincil depoya geri alınır
+            if self.retention is None or not self.retention.restore(conversation_id):
+                raise
+            self.store.append_message(conversation_id, message, datetime.now().isoformat(), title)
     
     def get_conversation(self, conversation_id: str) -> Dict:
         """
@@ -240,10 +443,55 @@ class ConversationHistory:
         Returns:
             dict: Konuşma verisi
         """
-        if conversation_id not in self.conversations:
+        conversation = self.store.get_conversation(conversation_id)
+        if conversation is None and self.retention is not None:
+            conversation = self.retention.load(conversation_id)
+        if conversation is None:
+            raise ConversationHistoryError(f"Konuşma bulunamadı: {conversation_id}")
+        
+        return conversation
+    
+    def get_conversation_info(self, conversation_id: str) -> Dict:
+        """
+        Konuşmanın indeks kaydı (mesajlar okunmadan)
+        
+        Args:
+            conversation_id (str): Konuşma ID'si
+        
+        Returns:
+            dict: id, title, created_at, updated_at, message_count
+        """
+        entry = self.store.get_entry(conversation_id)
+        if entry is None:
             raise ConversationHistoryError(f"Konuşma bulunamadı: {conversation_id}")
         
-        return self.conversations[conversation_id]
+        return entry
+    
+    def count_messages(self, conversation_id: str) -> int:
+        """
+        Konuşmadaki mesaj sayısı (indeksten, mesajlar okunmadan)
+        
+        Args:
+            conversation_id (str): Konuşma ID'si
+        
+        Returns:
+            int: Mesaj sayısı (konuşma yoksa 0)
+        """
+        entry = self.store.get_entry(conversation_id)
+        return entry['message_count'] if entry else 0
+    
+    def get_messages(self, conversation_id: str, offset: int = 0) -> List[Dict]:
+        """
+        Konuşmanın offset'ten itibaren mesajları
+        
+        Args:
+            conversation_id (str): Konuşma ID'si
+            offset (int): Atlanacak ilk mesaj sayısı
+        
+        Returns:
+            list: Mesaj listesi
+        """
+        return self.store.get_messages(conversation_id, offset=offset)
     
     def get_recent_messages(self, limit: int = 10, conversation_id: str = None) -> List[Dict]:
         """
@@ -259,29 +507,71 @@ class ConversationHistory:
         if conversation_id is None:
             conversation_id = self.current_conversation_id
         
-        if conversation_id is None or conversation_id not in self.conversations:
+        if conversation_id is None:
             return []
         
-        messages = self.conversations[conversation_id]['messages']
-        return messages[-limit:] if limit > 0 else messages
+        return self.store.get_messages(conversation_id, limit)
     
-    def list_conversations(self, limit: int = 50) -> List[Dict]:
+    def list_conversations(self, limit: int = 50, cursor: Optional[str] = None) -> List[Dict]:
         """
-        Konuşmaları listele
+        Konuşmaları listele (en son güncellenen önce)
         
         Args:
             limit (int): Konuşma sayısı limiti
+            cursor (str, optional): Önceki sayfanın devam imleci
             
         Returns:
             list: Konuşma listesi
         """
-        conversations = list(self.conversations.values())
-        conversations.sort(key=lambda x: x['updated_at'], reverse=True)
-        return conversations[:limit]
+        conversations, _ = self.list_conversations_page(limit, cursor)
+        return conversations
+    
+    def list_conversations_page(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Konuşmaların bir sayfasını getir
+        
+        Sıralama deponun updated_at indeksinden gelir; her çağrıda tüm
+        konuşmalar kopyalanıp sıralanmaz.
+        
+        Args:
+            limit (int): Sayfa boyutu
+            cursor (str, optional): Önceki sayfanın devam imleci
+        
+        Returns:
+            Tuple: (konuşma listesi, sonraki sayfanın imleci ya da None)
+        """
+        before = None
+        if cursor:
+            updated_at, _, conversation_id = cursor.partition('|')
+            before = (updated_at, conversation_id)
+        
+        conversations = self.store.list_conversations(limit, before)
+        
+        next_cursor = None
+        if conversations and len(conversations) == limit:
+            next_cursor = f"{conversations[-1]['updated_at']}|{conversations[-1]['id']}"
+        return conversations, next_cursor
+    
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        Konuşma geçmişinde tam metin arama
+        
+        Args:
+            query (str): Arama metni (Türkçe karakter/büyük harf duyarsız, kelime önekleri)
+            limit (int): En fazla sonuç sayısı
+        
+        Returns:
+            list: Eşleşen mesajlar (conversation_id, title, role, content, timestamp)
+        """
+        return self.store.search(query, limit)
     
     def delete_conversation(self, conversation_id: str) -> bool:
         """
-        Konuşmayı sil
+        Konuşmayı sil (arşivlenmiş konuşmalar dahil)
         
         Args:
             conversation_id (str): Konuşma ID'si
@@ -289,31 +579,38 @@ class ConversationHistory:
         Returns:
             bool: Başarılı ise True
         """
-        if conversation_id in self.conversations:
-            del self.conversations[conversation_id]
-            if self.current_conversation_id == conversation_id:
-                self.current_conversation_id = None
-            self.save_conversations()
-            return True
-        return False
+        if self.current_conversation_id == conversation_id:
+            self.current_conversation_id = None
+        return self.store.delete_conversation(conversation_id)
+    
+    def get_retention_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Saklama/arşivleme istatistikleri
+        
+        Returns:
+            dict: RetentionManager istatistikleri (sınır yoksa None)
+        """
+        return self.retention.get_stats() if self.retention is not None else None
     
     def save_conversations(self) -> None:
-        """Konuşmaları dosyaya kaydet"""
+        """
+        Konuşmaları JSON dosyasına dışa aktar
+        
+        Depo her değişikliği anında kaydettiği için normal akışta
+        gerekmez; yedekleme veya eski araçlarla uyumluluk içindir.
+        """
         try:
             with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.conversations, f, ensure_ascii=False, indent=2)
+                json.dump(self.store.load_all(), f, ensure_ascii=False, indent=2)
         except Exception as e:
             raise ConversationHistoryError("save", str(e))
     
     def load_conversations(self) -> None:
-        """Konuşmaları dosyadan yükle"""
-        try:
-            if Path(self.file_path).exists():
-                with open(self.file_path, 'r', encoding='utf-8') as f:
-                    self.conversations = json.load(f)
-        except Exception as e:
-            # Dosya yok veya bozuksa boş başla
-            self.conversations = {}
+        """Eski JSON dosyası varsa depoya bir kez aktar (kayıtlar belleğe yüklenmez)"""
+        if Path(self.file_path).suffix.lower() == '.json':
+            migrated = self.store.migrate_from_json(self.file_path)
+            if migrated:
+                logger.info(f"📦 {migrated} konuşma {self.file_path} dosyasından {self.db_path} deposuna aktarıldı")
 
 class ResponseGenerator:
     """
@@ -4,12 +4,15 @@ Komut Satırı Görsel Analizi
 Terminal'den direkt görsel analizi yapmak için kullanın.
 """
 
-from image_analysis import ImageAnalyzer, analyze_image, batch_analyze_folder
+from image_analysis import ImageAnalyzer, AnalysisConfig, JobManifest, analyze_image, batch_analyze_folder
+from image_analysis.utils import ProgressTracker, FileUtils
 import sys
 import os
-import glob
 import argparse
 
+# Klasör analizinde tek generate çağrısındaki görsel sayısı
+DEFAULT_BATCH_SIZE = 4
+
 def analyze_single_image(image_path, save_result=False):
     """
     Tek bir görseli analiz et
@@ -41,48 +44,86 @@ def analyze_single_image(image_path, save_result=False):
     
     return result['success']
 
-def analyze_folder(folder_path, save_results=False):
+def analyze_folder(folder_path, save_results=False, workers=1, recursive=False,
+                   resume=False, retry_failed=False, manifest_path=None, shard_size=None,
+                   batch_size=DEFAULT_BATCH_SIZE, pipelined=True):
     """
     Klasördeki tüm görselleri analiz et
-    """
-    # Desteklenen formatlar
-    image_extensions = ['*.jpg', '*.jpeg', '*.png', '*.gif', '*.bmp']
-    image_files = []
     
-    for ext in image_extensions:
-        image_files.extend(glob.glob(os.path.join(folder_path, ext)))
-        image_files.extend(glob.glob(os.path.join(folder_path, ext.upper())))
-    
-    if not image_files:
-        print(f"❌ {folder_path} klasöründe görsel dosyası bulunamadı")
+    Her sonuç manifeste yazılır; resume ile daha önce işlenmiş dosyalar
+    atlanır, retry_failed ile sadece başarısız olanlar yeniden işlenir.
+    Görseller batch_size'lık gruplar halinde tek generate çağrısıyla işlenir;
+    pipelined açıkken decode, model ve kaydetme aşamaları örtüşür.
+    """
+    if not os.path.isdir(folder_path):
+        print(f"❌ Klasör bulunamadı: {folder_path}")
         return False
     
-    print(f"📁 {len(image_files)} görsel bulundu")
-    
-    # Analyzer oluştur
-    analyzer = ImageAnalyzer()
-    
-    # Toplu analiz
-    results = analyzer.batch_analyze(image_files)
-    
-    # Sonuçları özetle
-    successful = sum(1 for r in results if r['success'])
-    failed = len(results) - successful
+    manifest_path = manifest_path or os.path.join(
+        AnalysisConfig().output_directory, "analysis_manifest.db"
+    )
+    manifest = JobManifest(manifest_path)
+    print(f"🗂️ Manifest: {manifest_path}")
+    
+    analysis_config = AnalysisConfig(batch_size=max(1, batch_size), pipelined=pipelined)
+    
+    try:
+        if retry_failed and not resume:
+            # Sadece manifestte başarısız görünen dosyalar
+            image_files = iter(manifest.failed_paths(folder_path))
+            print("🔁 Başarısız görseller yeniden işleniyor...")
+        else:
+            # Görseller tek geçişte, tembel olarak bulunur; analiz ilk dosyayla başlar
+            image_files = FileUtils.iter_images_in_directory(folder_path, recursive=recursive)
+            if resume:
+                image_files = manifest.pending(image_files, retry_failed=retry_failed)
+            print(f"📁 {folder_path} taranıyor...")
+        
+        if workers > 1:
+            from image_analysis import parallel_batch_analyze
+            
+            print(f"⚙️ {workers} worker süreci başlatılıyor...")
+            # Sonuçlar tamamlanma sırasıyla gelir; kaydetme worker'larda yapılır
+            results = parallel_batch_analyze(
+                image_files, workers, analysis_config=analysis_config,
+                save_results=save_results, shard_size=shard_size
+            )
+            progress = ProgressTracker(None, "Görsel Analizi")
+        else:
+            # Kaydetme her batch'ten hemen sonra yapılır
+            results = ImageAnalyzer(analysis_config=analysis_config).iter_batch_analyze(
+                image_files, save_results=save_results
+            )
+            progress = None
+        
+        successful = 0
+        failed = 0
+        for result in manifest.record_all(results):
+            if result['success']:
+                successful += 1
+            else:
+                failed += 1
+            if progress is not None:
+                progress.update()
+        
+        skipped = manifest.skipped
+    finally:
+        manifest.close()
+    
+    if successful + failed == 0:
+        if skipped:
+            print(f"\n✅ {skipped} görselin tamamı zaten işlenmiş")
+            return True
+        print(f"\n❌ {folder_path} klasöründe işlenecek görsel bulunamadı")
+        return False
     
     print(f"\n📊 Analiz Özeti:")
     print(f"✅ Başarılı: {successful}")
     print(f"❌ Başarısız: {failed}")
+    if skipped:
+        print(f"⏭️ Atlanan (daha önce işlenmiş): {skipped}")
     
-    # Kaydetme
     if save_results:
-        print("\n💾 Sonuçlar kaydediliyor...")
-        for result in results:
-            if result['success']:
-                analyzer.save_image_with_metadata(
-                    result['file_path'],
-                    result['title'], 
-                    result['caption']
-                )
         print("✅ Tüm sonuçlar kaydedildi!")
     
     return True
@@ -100,12 +141,31 @@ def main():
   python cli_analyzer.py image.jpg --save             # Analiz et ve kaydet
   python cli_analyzer.py --folder ./images            # Klasör analizi
   python cli_analyzer.py --folder ./images --save     # Klasör analizi + kaydetme
+  python cli_analyzer.py --folder ./images --workers 8  # 8 süreçle paralel analiz
+  python cli_analyzer.py --folder ./images --batch-size 8  # Tek çağrıda 8 görsel
+  python cli_analyzer.py --folder ./images --recursive  # Alt klasörlerle birlikte
+  python cli_analyzer.py --folder ./images --save --resume        # Yarıda kalan işi sürdür
+  python cli_analyzer.py --folder ./images --save --retry-failed  # Sadece başarısızları tekrarla
         """
     )
     
     parser.add_argument('image', nargs='?', help='Analiz edilecek görsel dosyası')
     parser.add_argument('--folder', '-f', help='Analiz edilecek klasör')
     parser.add_argument('--save', '-s', action='store_true', help='Sonuçları kaydet')
+    parser.add_argument('--batch-size', '-b', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Klasör analizinde tek seferde modele verilecek görsel sayısı (varsayılan: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--no-pipeline', action='store_true',
+                        help='Decode/model/kaydetme aşamalarını örtüştürmeden sırayla çalıştır')
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                        help='Klasör analizi için worker süreç sayısı (varsayılan: 1)')
+    parser.add_argument('--shard-size', type=int,
+                        help='Worker başına tek seferde gönderilecek görsel sayısı (varsayılan: batch_size x 8)')
+    parser.add_argument('--recursive', '-r', action='store_true', help='Alt klasörleri de tara')
+    parser.add_argument('--resume', action='store_true',
+                        help='Manifestte işlenmiş görünen (değişmemiş) görselleri atla')
+    parser.add_argument('--retry-failed', action='store_true',
+                        help='Sadece manifestte başarısız görünen görselleri yeniden işle')
+    parser.add_argument('--manifest', help='Manifest dosyası (varsayılan: captioned_images/analysis_manifest.db)')
     
     args = parser.parse_args()
     
@@ -121,7 +181,12 @@ def main():
     
     if args.folder:
         # Klasör analizi
-        success = analyze_folder(args.folder, args.save)
+        success = analyze_folder(
+            args.folder, args.save, args.workers, args.recursive,
+            resume=args.resume, retry_failed=args.retry_failed, manifest_path=args.manifest,
+            shard_size=args.shard_size, batch_size=args.batch_size,
+            pipelined=not args.no_pipeline
+        )
     elif args.image:
         # Tek görsel analizi
         success = analyze_single_image(args.image, args.save)
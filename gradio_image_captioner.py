@@ -1,15 +1,26 @@
+from model_loader import BackgroundLoader, mark_startup
 import gradio as gr
 import numpy as np
 import os
 from PIL import Image
-from transformers import AutoProcessor, BlipForConditionalGeneration
-import torch
 
-# Modeli ve işlemciyi yükle
-print("🤖 Model yükleniyor...")
-processor = AutoProcessor.from_pretrained("Salesforce/blip-image-captioning-base")
-model = BlipForConditionalGeneration.from_pretrained("Salesforce/blip-image-captioning-base")
-print("✅ Model başarıyla yüklendi!")
+def _load_blip():
+    """Modeli ve işlemciyi yükle (torch/transformers burada içe aktarılır)"""
+    from transformers import AutoProcessor, BlipForConditionalGeneration
+    processor = AutoProcessor.from_pretrained("Salesforce/blip-image-captioning-base")
+    model = BlipForConditionalGeneration.from_pretrained("Salesforce/blip-image-captioning-base")
+    return processor, model
+
+def _warmup_blip(loaded):
+    """Sentetik bir görselle modeli bir kez çalıştır"""
+    import torch
+    processor, model = loaded
+    image = Image.new("RGB", (512, 512), (128, 128, 128))
+    with torch.no_grad():
+        model.generate(**processor(images=image, return_tensors="pt"), max_length=10)
+
+# Model arka planda yüklenip ısınır; arayüz beklemeden açılır
+blip_loader = BackgroundLoader("BLIP modeli", _load_blip, _warmup_blip)
 
 def generate_caption_and_title(input_image):
     """
@@ -20,6 +31,10 @@ def generate_caption_and_title(input_image):
         if input_image is None:
             return "❌ Görsel yok", "Lütfen bir görsel yükleyin", "❌ Görsel seçilmedi"
         
+        # Model hazır değilse yüklenmesini bekle
+        import torch
+        processor, model = blip_loader.get()
+        
         # PIL Image'e çevir - farklı input tiplerini destekle
         if isinstance(input_image, np.ndarray):
             raw_image = Image.fromarray(input_image.astype('uint8')).convert('RGB')
@@ -238,9 +253,14 @@ with gr.Blocks(title="🤖 AI Görsel Açıklayıcı ve Başlık Üreteci", them
 # Uygulamayı başlat
 if __name__ == "__main__":
     print("🚀 Gradio uygulaması başlatılıyor...")
+    blip_loader.start()
+    # debug=True launch içinde thread'i kilitlediği için hatalar show_error ile gösterilir
     demo.launch(
         server_name="0.0.0.0",
         server_port=7860,
         share=False,
-        debug=True
-    )
\ No newline at end of file
+        show_error=True,
+        prevent_thread_lock=True
+    )
+    mark_startup("dinleme")
+    demo.block_thread()
\ No newline at end of file
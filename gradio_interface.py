@@ -1,32 +1,73 @@
+from model_loader import BackgroundLoader, mark_startup
 import gradio as gr
-from image_analysis import ImageAnalyzer, ModelConfig, AnalysisConfig
 import os
 
 # Global analyzer nesnesi
 analyzer = None
+batcher = None
+
+# Birleşik uygulamada sohbet modelleriyle paylaşılan model kaydı (use_model_registry)
+model_registry = None
+
+def use_model_registry(registry):
+    """
+    BLIP modelini paylaşılan bellek bütçesine dahil et (yüklemeden önce çağrılmalı)
+    
+    Model kayıtta sayılır; bütçe aşılınca boştaysa bellekten çıkarılır ve
+    sonraki istekte yeniden yüklenir.
+    """
+    global model_registry
+    model_registry = registry
+
+def _load_batcher():
+    """Analyzer'ı ve eşzamanlı istekleri birleştiren kuyruğu yükle"""
+    from image_analysis import ImageAnalyzer, MicroBatcher
+    image_analyzer = ImageAnalyzer()
+    if model_registry is None:
+        return MicroBatcher(image_analyzer)
+    
+    key = (
+        image_analyzer.model_config.model_name,
+        image_analyzer.device,
+        str(image_analyzer.dtype).replace('torch.', '')
+    )
+    model_registry.acquire(key, image_analyzer.load_model, on_evict=image_analyzer.unload_model)
+    return MicroBatcher(image_analyzer, model_guard=lambda: model_registry.use(key))
+
+# Model arka planda yüklenip ısınır; sunucu beklemeden dinlemeye başlar
+batcher_loader = BackgroundLoader(
+    "Görsel analiz", _load_batcher, lambda loaded: loaded.warmup()
+)
 
 def initialize_analyzer():
     """
-    Analyzer'ı başlat
+    Analyzer'ı başlat (hazır değilse yüklenmesini bekle)
     """
     global analyzer
-    if analyzer is None:
-        analyzer = ImageAnalyzer()
+    analyzer = initialize_batcher().analyzer
     return analyzer
 
+def initialize_batcher():
+    """
+    Eşzamanlı istekleri tek batch'te birleştiren kuyruğu başlat
+    """
+    global batcher
+    batcher = batcher_loader.get()
+    return batcher
+
 def process_image_gradio(image):
     """
     Gradio için görsel işleme fonksiyonu
     """
     try:
-        # Analyzer'ı başlat
-        current_analyzer = initialize_analyzer()
+        # Analyzer kuyruğunu başlat
+        current_batcher = initialize_batcher()
         
         if image is None:
             return None, "Lütfen bir görsel yükleyin", "❌ Görsel yok"
         
-        # Görseli analiz et
-        result = current_analyzer.analyze_image(image)
+        # Görseli analiz et (eşzamanlı isteklerle aynı batch'te)
+        result = current_batcher.analyze_image(image)
         
         # Sonuçları formatla
         formatted_result = f"📝 **Başlık:** {result['title']}\n\n🔍 **Açıklama:** {result['caption']}"
@@ -132,22 +173,34 @@ def create_gradio_interface():
     
     return tabbed_interface
 
-def launch_gradio_app(server_name="0.0.0.0", server_port=7860, share=False):
+def launch_gradio_app(server_name="0.0.0.0", server_port=7860, share=False, concurrency_limit=8):
     """
     Gradio uygulamasını başlat
+    
+    Model arka planda yüklenir; ilk istekler model hazır olana kadar bekler.
+    concurrency_limit, AnalysisConfig.micro_batch_size ile aynı tutulmalıdır.
     """
     print("🚀 Gradio uygulaması başlatılıyor...")
     
+    batcher_loader.start()
+    
     # Arayüzü oluştur
     demo = create_gradio_interface()
     
+    # Eşzamanlı isteklerin mikro-batch kuyruğuna ulaşabilmesi için
+    demo.queue(default_concurrency_limit=concurrency_limit)
+    
     # Uygulamayı başlat
     demo.launch(
         server_name=server_name,
         server_port=server_port,
         share=share,
-        show_error=True
+        show_error=True,
+        prevent_thread_lock=True
     )
+    
+    mark_startup("dinleme")
+    demo.block_thread()
 
 # Ana çalıştırma
 if __name__ == "__main__":
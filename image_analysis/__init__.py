@@ -14,6 +14,11 @@ Kullanım:
 from .analyzer import ImageAnalyzer
 from .config import ModelConfig, AnalysisConfig, PresetConfigs
 from .utils import ImageUtils, FileUtils
+from .cache import CaptionCache
+from .batching import MicroBatcher
+from .pipeline import BatchPipeline
+from .manifest import JobManifest
+from .parallel import parallel_batch_analyze
 from .exceptions import ImageAnalysisError, ModelLoadError
 
 __version__ = "1.0.0"
@@ -28,6 +33,11 @@ __all__ = [
     'PresetConfigs',
     'ImageUtils',
     'FileUtils',
+    'CaptionCache',
+    'MicroBatcher',
+    'BatchPipeline',
+    'JobManifest',
+    'parallel_batch_analyze',
     'ImageAnalysisError',
     'ModelLoadError'
 ]
@@ -47,7 +57,7 @@ def analyze_image(image_path, model_name=None):
     analyzer = ImageAnalyzer(model_name=model_name)
     return analyzer.analyze_image(image_path)
 
-def batch_analyze_folder(folder_path, model_name=None, save_results=False):
+def batch_analyze_folder(folder_path, model_name=None, save_results=False, workers=1, recursive=False):
     """
     Klasördeki tüm görselleri analiz et
     
@@ -55,34 +65,27 @@ def batch_analyze_folder(folder_path, model_name=None, save_results=False):
         folder_path (str): Klasör yolu
         model_name (str, optional): Model adı
         save_results (bool): Sonuçları kaydet
+        workers (int): Worker süreç sayısı (1'den büyükse çok süreçli)
+        recursive (bool): Alt klasörleri de tara
     
     Returns:
         list: Analiz sonuçları
     """
-    analyzer = ImageAnalyzer(model_name=model_name)
-    
-    # Klasördeki görselleri bul
-    from pathlib import Path
-    import glob
-    
-    image_extensions = ['*.jpg', '*.jpeg', '*.png', '*.gif', '*.bmp']
-    image_files = []
-    
-    for ext in image_extensions:
-        image_files.extend(glob.glob(str(Path(folder_path) / ext)))
-        image_files.extend(glob.glob(str(Path(folder_path) / ext.upper())))
+    # Klasördeki görselleri tek geçişte, tembel olarak bul
+    image_files = FileUtils.iter_images_in_directory(folder_path, recursive=recursive)
+    model_config = ModelConfig(model_name=model_name) if model_name else ModelConfig()
     
-    # Toplu analiz
-    results = analyzer.batch_analyze(image_files)
+    if workers > 1:
+        from .parallel import parallel_batch_analyze
+        
+        return list(parallel_batch_analyze(
+            image_files, 
+            workers, 
+            model_config=model_config, 
+            save_results=save_results
+        ))
     
-    # Kaydetme
-    if save_results:
-        for result in results:
-            if result['success']:
-                analyzer.save_image_with_metadata(
-                    result['file_path'],
-                    result['title'],
-                    result['caption']
-                )
+    analyzer = ImageAnalyzer(model_config)
     
-    return results
\ No newline at end of file
+    # Toplu analiz (kaydetme her batch'ten hemen sonra yapılır)
+    return analyzer.batch_analyze(image_files, save_results=save_results)
@@ -4,23 +4,58 @@ Ana görsel analiz sınıfı - Yeniden düzenlenmiş ve geliştirilmiş versiyon
 
 import torch
 from PIL import Image
-from transformers import AutoProcessor, BlipForConditionalGeneration
-from typing import Union, List, Dict, Any, Optional
+from transformers import AutoProcessor, BlipForConditionalGeneration, LogitsProcessor, LogitsProcessorList
+from itertools import islice
+from typing import Union, List, Dict, Any, Optional, Iterable, Iterator, Sized, Tuple
 import logging
+import time
 
 from .config import ModelConfig, AnalysisConfig
 from .utils import ImageUtils, FileUtils, ProgressTracker
+from .cache import CaptionCache
+from .pipeline import BatchPipeline
 from .exceptions import (
     ModelLoadError, 
     ImageProcessingError, 
     GenerationError, 
-    FileOperationError
+    FileOperationError,
+    ValidationError
 )
 
 # Logging ayarları
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _cpu_supports_bfloat16() -> bool:
+    """CPU'nun yerel bfloat16 desteği (AVX512-BF16 / AMX) var mı"""
+    try:
+        return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except Exception:
+        return False
+
+class _RowLengthLimit(LogitsProcessor):
+    """
+    Sola dolgulu batch'te her satırın kendi max_length sınırını uygula
+    
+    generate'in max_length'i dolgu dahil tek bir sınırdır; dolgusu çok
+    olan satır daha az token üretirdi. Sınırına ulaşan satıra yalnızca
+    bitiş token'ı bırakılır.
+    """
+    
+    def __init__(self, limits: torch.Tensor, eos_token_id: int):
+        self.limits = limits
+        self.eos_token_id = eos_token_id
+    
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        # Beam search'te satırlar num_beams kez tekrarlanır
+        limits = self.limits.repeat_interleave(input_ids.shape[0] // self.limits.shape[0])
+        done = input_ids.shape[1] >= limits
+        if bool(done.any()):
+            eos_scores = scores[done, self.eos_token_id].clone()
+            scores[done] = float('-inf')
+            scores[done, self.eos_token_id] = eos_scores
+        return scores
+
 class ImageAnalyzer:
     """
     Gelişmiş görsel analizi ve açıklama üretimi sınıfı
@@ -44,6 +79,17 @@ class ImageAnalyzer:
         # Model ve processor'u yükle
         self._load_model()
         
+        # Analiz önbelleği
+        self.cache: Optional[CaptionCache] = None
+        if self.analysis_config.cache_size > 0 or self.analysis_config.cache_path:
+            self.cache = CaptionCache(
+                max_size=self.analysis_config.cache_size,
+                db_path=self.analysis_config.cache_path
+            )
+        
+        # Son pipeline çalıştırmasının aşama istatistikleri
+        self.last_pipeline_stats: Dict[str, Any] = {}
+        
         logger.info(f"✅ ImageAnalyzer başlatıldı - Model: {self.model_config.model_name}")
     
     def _load_model(self) -> None:
@@ -51,6 +97,16 @@ class ImageAnalyzer:
         try:
             logger.info(f"🤖 Model yükleniyor: {self.model_config.model_name}")
             
+            # Device ayarları
+            if self.model_config.device == "auto":
+                self.device = "cuda" if torch.cuda.is_available() else "cpu"
+            else:
+                self.device = self.model_config.device
+            
+            # Hassasiyet ayarları
+            self.quantization = self._resolve_quantization()
+            self.dtype = torch.float32 if self.quantization else self._resolve_dtype()
+            
             # Processor yükle
             self.processor = AutoProcessor.from_pretrained(
                 self.model_config.model_name,
@@ -62,21 +118,177 @@ class ImageAnalyzer:
             self.model = BlipForConditionalGeneration.from_pretrained(
                 self.model_config.model_name,
                 cache_dir=self.model_config.cache_dir,
-                use_auth_token=self.model_config.use_auth_token
+                use_auth_token=self.model_config.use_auth_token,
+                torch_dtype=self.dtype
             )
             
-            # Device ayarları
-            if self.model_config.device == "auto":
-                self.device = "cuda" if torch.cuda.is_available() else "cpu"
-            else:
-                self.device = self.model_config.device
-            
             self.model.to(self.device)
-            logger.info(f"📱 Device: {self.device}")
+            self.model.eval()
+            
+            # Dinamik int8 quantization (Linear katmanları)
+            if self.quantization == "int8":
+                self.model = torch.quantization.quantize_dynamic(
+                    self.model, 
+                    {torch.nn.Linear}, 
+                    dtype=torch.qint8
+                )
+            
+            self._install_position_ids()
+            
+            logger.info(
+                f"📱 Device: {self.device} - dtype: {str(self.dtype).replace('torch.', '')}"
+                + (f" - quantization: {self.quantization}" if self.quantization else "")
+            )
             
         except Exception as e:
             raise ModelLoadError(self.model_config.model_name, str(e))
     
+    def _install_position_ids(self) -> None:
+        """
+        BLIP metin çözücüsünde sola dolgulu girdiler için pozisyonları maskeden hesapla
+        
+        BLIP metin çözücüsü mutlak pozisyon kullanır ve generate sırasında
+        position_ids iletmez; sola dolgulu bir satır dolgu kadar kaymış
+        pozisyonlarla çözülürdü. Dolgu yoksa (ilk sütun maskesi tamamen 1)
+        davranış değişmez.
+        """
+        decoder = getattr(self.model, 'text_decoder', None)
+        if decoder is None:
+            return
+        prepare = decoder.prepare_inputs_for_generation
+        
+        def prepare_with_positions(input_ids, past_key_values=None, attention_mask=None, **kwargs):
+            inputs = prepare(input_ids, past_key_values=past_key_values, attention_mask=attention_mask, **kwargs)
+            if attention_mask is not None and not bool(attention_mask[:, 0].all()):
+                position_ids = (attention_mask.long().cumsum(-1) - 1).clamp(min=0)
+                inputs['position_ids'] = position_ids[:, -inputs['input_ids'].shape[1]:]
+            return inputs
+        
+        decoder.prepare_inputs_for_generation = prepare_with_positions
+    
+    def load_model(self) -> Tuple[Any, Any]:
+        """
+        Model bellekten çıkarıldıysa yeniden yükle
+        
+        Returns:
+            Tuple: (processor, model)
+        """
+        if self.model is None:
+            self._load_model()
+        return self.processor, self.model
+    
+    def unload_model(self) -> None:
+        """
+        Model ağırlıklarını bırak (processor kalır); load_model ile geri gelir
+        
+        Çağıran, modelin o anda kullanılmadığını garanti etmelidir.
+        """
+        self.model = None
+    
+    def _resolve_dtype(self) -> torch.dtype:
+        """ModelConfig.torch_dtype değerini cihaza uygun torch dtype'ına çevir"""
+        requested = self.model_config.torch_dtype
+        
+        if requested == "auto":
+            if self.device.startswith("cuda"):
+                return torch.float16
+            return torch.bfloat16 if _cpu_supports_bfloat16() else torch.float32
+        
+        dtypes = {
+            'float32': torch.float32,
+            'bfloat16': torch.bfloat16,
+            'float16': torch.float16
+        }
+        if requested not in dtypes:
+            raise ValidationError("torch_dtype", requested, "auto, float32, bfloat16 or float16")
+        
+        dtype = dtypes[requested]
+        if self.device == "cpu":
+            if dtype == torch.float16:
+                logger.warning("⚠️ float16 CPU'da desteklenmiyor, float32 kullanılıyor")
+                return torch.float32
+            if dtype == torch.bfloat16 and not _cpu_supports_bfloat16():
+                logger.warning("⚠️ CPU bfloat16 desteklemiyor, float32 kullanılıyor")
+                return torch.float32
+        
+        return dtype
+    
+    def _resolve_quantization(self) -> Optional[str]:
+        """ModelConfig.quantization değerini doğrula"""
+        quantization = self.model_config.quantization
+        if not quantization:
+            return None
+        
+        if quantization != "int8":
+            raise ValidationError("quantization", quantization, "None or int8")
+        
+        if self.device != "cpu":
+            logger.warning("⚠️ int8 dinamik quantization sadece CPU'da destekleniyor, atlanıyor")
+            return None
+        
+        return quantization
+    
+    def _to_model_inputs(self, inputs):
+        """Processor çıktısını model cihazına ve dtype'ına taşı"""
+        inputs = inputs.to(self.device)
+        if 'pixel_values' in inputs:
+            inputs['pixel_values'] = inputs['pixel_values'].to(self.dtype)
+        return inputs
+    
+    def _generation_kwargs(self) -> Dict[str, Any]:
+        """model.generate için ortak parametreler"""
+        return {
+            'max_length': self.model_config.max_length,
+            'num_beams': self.model_config.num_beams,
+            'do_sample': self.model_config.do_sample,
+            'early_stopping': self.model_config.early_stopping,
+            'temperature': self.model_config.temperature if self.model_config.do_sample else 1.0
+        }
+    
+    def _cache_params(self) -> Dict[str, Any]:
+        """Önbellek anahtarına giren, çıktıyı etkileyen parametreler"""
+        params = self.model_config.to_dict()
+        for key in ('device', 'cache_dir', 'use_auth_token'):
+            params.pop(key, None)
+        params.update({
+            'max_image_size': self.analysis_config.max_image_size,
+            'resample_filter': self.analysis_config.resample_filter,
+            'fast_decode': self.analysis_config.fast_decode,
+            'title_prompt': self.analysis_config.title_prompt,
+            'title_max_length': self.analysis_config.title_max_length,
+            'caption_prompt': self.analysis_config.caption_prompt
+        })
+        return params
+    
+    def _cache_key(self, image: Union[str, Image.Image]) -> Optional[str]:
+        """Görsel için önbellek anahtarı (önbellek kapalı veya hata varsa None)"""
+        if self.cache is None:
+            return None
+        try:
+            return self.cache.make_key(image, self._cache_params())
+        except Exception as e:
+            logger.warning(f"Önbellek anahtarı oluşturulamadı: {str(e)}")
+            return None
+    
+    def _success_result(
+        self, 
+        title: str, 
+        caption: str, 
+        image_info: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Başarılı analiz sonucu oluştur"""
+        return {
+            'title': title,
+            'caption': caption,
+            'status': "✅ Analiz tamamlandı!",
+            'success': True,
+            'image_info': image_info,
+            'model_info': {
+                'model_name': self.model_config.model_name,
+                'device': self.device
+            }
+        }
+    
     def generate_caption(
         self, 
         image: Union[str, Image.Image], 
@@ -99,32 +311,27 @@ class ImageAnalyzer:
             # Görseli işle
             processed_image = ImageUtils.preprocess_image(
                 image, 
-                self.analysis_config.max_image_size
+                self.analysis_config.max_image_size,
+                self.analysis_config.resample_filter,
+                self.analysis_config.fast_decode
             )
             
             # Model girişi hazırla
             if conditional_text:
-                inputs = self.processor(
+                inputs = self._to_model_inputs(self.processor(
                     images=processed_image, 
                     text=conditional_text, 
                     return_tensors="pt"
-                ).to(self.device)
+                ))
             else:
-                inputs = self.processor(
+                inputs = self._to_model_inputs(self.processor(
                     images=processed_image, 
                     return_tensors="pt"
-                ).to(self.device)
+                ))
             
             # Açıklama üret
             with torch.no_grad():
-                outputs = self.model.generate(
-                    **inputs,
-                    max_length=self.model_config.max_length,
-                    num_beams=self.model_config.num_beams,
-                    do_sample=self.model_config.do_sample,
-                    early_stopping=self.model_config.early_stopping,
-                    temperature=self.model_config.temperature if self.model_config.do_sample else 1.0
-                )
+                outputs = self.model.generate(**inputs, **self._generation_kwargs())
             
             # Çıktıyı decode et
             caption = self.processor.decode(outputs[0], skip_special_tokens=True)
@@ -152,17 +359,177 @@ class ImageAnalyzer:
         """
         try:
             title = self.generate_caption(image, self.analysis_config.title_prompt)
-              # Başlığı formatla
-            title = title.capitalize()
-            if len(title) > self.analysis_config.title_max_length:
-                title = title[:self.analysis_config.title_max_length] + "..."
-            
-            return title if title else "Untitled"
+            return self._format_title(title)
             
         except Exception as e:
             logger.warning(f"Başlık üretme hatası: {str(e)}")
             return "Untitled"
     
+    def _format_title(self, title: str) -> str:
+        """Ham model çıktısını başlık olarak formatla"""
+        title = title.capitalize()
+        if len(title) > self.analysis_config.title_max_length:
+            title = title[:self.analysis_config.title_max_length] + "..."
+        
+        return title if title else "Untitled"
+    
+    def _generate_batch(
+        self, 
+        images: List[Image.Image], 
+        conditional_text: str = ""
+    ) -> List[str]:
+        """
+        Birden fazla ön işlenmiş görsel için tek seferde açıklama üret
+        
+        Görseller tek bir processor çağrısında tensöre dönüştürülür ve
+        tek bir model.generate çağrısıyla işlenir.
+        
+        Args:
+            images (List[Image.Image]): Ön işlenmiş görseller
+            conditional_text (str): Koşullu metin
+            
+        Returns:
+            List[str]: Girdi sırasıyla üretilen açıklamalar
+            
+        Raises:
+            GenerationError: Üretim hatası
+        """
+        try:
+            if conditional_text:
+                inputs = self._to_model_inputs(self.processor(
+                    images=images, 
+                    text=[conditional_text] * len(images), 
+                    padding=True,
+                    return_tensors="pt"
+                ))
+            else:
+                inputs = self._to_model_inputs(self.processor(
+                    images=images, 
+                    return_tensors="pt"
+                ))
+            
+            with torch.no_grad():
+                outputs = self.model.generate(**inputs, **self._generation_kwargs())
+            
+            captions = self.processor.batch_decode(outputs, skip_special_tokens=True)
+            
+            if conditional_text:
+                captions = [caption.replace(conditional_text, "") for caption in captions]
+            
+            return [caption.strip() for caption in captions]
+            
+        except Exception as e:
+            raise GenerationError("Batch caption generation", str(e))
+    
+    def _supports_shared_encoder(self) -> bool:
+        """Model, görsel kodlayıcı ve metin çözücüsüne ayrı ayrı erişime izin veriyor mu"""
+        return (
+            self.analysis_config.shared_encoder
+            and hasattr(self.model, 'vision_model')
+            and hasattr(self.model, 'text_decoder')
+        )
+    
+    def _encode_images(self, images: List[Image.Image]) -> torch.Tensor:
+        """
+        Görselleri tek bir görsel kodlayıcı geçişiyle embedding'e çevir
+        
+        Args:
+            images (List[Image.Image]): Ön işlenmiş görseller
+            
+        Returns:
+            torch.Tensor: Görsel embedding'leri (batch, patch, hidden)
+        """
+        pixel_values = self.processor(
+            images=images, 
+            return_tensors="pt"
+        )['pixel_values'].to(self.device, self.dtype)
+        
+        with torch.no_grad():
+            return self.model.vision_model(pixel_values=pixel_values)[0]
+    
+    def _generate_from_embeds(
+        self, 
+        image_embeds: torch.Tensor, 
+        prompts: List[str]
+    ) -> List[str]:
+        """
+        Hazır görsel embedding'lerinden metin üret
+        
+        image_embeds[i] satırı prompts[i] ile çözülür. Farklı uzunluktaki
+        koşullu metinler (ör. başlık "a photo of" ve boş açıklama) sola
+        dolgulanır ve tüm satırlar tek generate çağrısında çözülür; dikkat
+        maskesi dolguyu gizler, pozisyonlar maskeden hesaplanır
+        (_install_position_ids).
+        
+        Args:
+            image_embeds (torch.Tensor): Satır başına görsel embedding'i
+            prompts (List[str]): Satır başına koşullu metin
+            
+        Returns:
+            List[str]: Satır sırasıyla üretilen metinler
+            
+        Raises:
+            GenerationError: Üretim hatası
+        """
+        try:
+            text_config = self.model.config.text_config
+            
+            # [CLS] yerine BOS, sondaki [SEP] atılır; satırlar sola dolgulanır
+            encoded = []
+            for prompt in prompts:
+                ids = self.processor.tokenizer(prompt).input_ids[:-1]
+                ids[0] = text_config.bos_token_id
+                encoded.append(ids)
+            length = max(len(ids) for ids in encoded)
+            
+            input_ids = torch.full(
+                (len(encoded), length),
+                text_config.pad_token_id,
+                dtype=torch.long,
+                device=self.device
+            )
+            attention_mask = torch.zeros_like(input_ids)
+            for i, ids in enumerate(encoded):
+                input_ids[i, length - len(ids):] = torch.tensor(ids, dtype=torch.long)
+                attention_mask[i, length - len(ids):] = 1
+                
+            embeds_mask = torch.ones(
+                image_embeds.size()[:-1], 
+                dtype=torch.long, 
+                device=image_embeds.device
+            )
+            
+            # Her satır dolgusuz haliyle aynı sayıda token üretebilsin
+            generation_kwargs = self._generation_kwargs()
+            padding = attention_mask.shape[1] - attention_mask.sum(dim=1)
+            row_limits = generation_kwargs['max_length'] + padding
+            generation_kwargs['max_length'] = int(row_limits.max()) + 1
+                
+            with torch.no_grad():
+                outputs = self.model.text_decoder.generate(
+                    input_ids=input_ids,
+                    attention_mask=attention_mask,
+                    eos_token_id=text_config.sep_token_id,
+                    pad_token_id=text_config.pad_token_id,
+                    encoder_hidden_states=image_embeds,
+                    encoder_attention_mask=embeds_mask,
+                    logits_processor=LogitsProcessorList(
+                        [_RowLengthLimit(row_limits, text_config.sep_token_id)]
+                    ),
+                    **generation_kwargs
+                )
+                
+            texts = []
+            for prompt, text in zip(prompts, self.processor.batch_decode(outputs, skip_special_tokens=True)):
+                if prompt:
+                    text = text.replace(prompt, "")
+                texts.append(text.strip())
+            
+            return texts
+            
+        except Exception as e:
+            raise GenerationError("Shared encoder generation", str(e))
+    
     def analyze_image(self, image: Union[str, Image.Image]) -> Dict[str, Any]:
         """
         Görsel için kapsamlı analiz yap
@@ -183,43 +550,70 @@ class ImageAnalyzer:
                     'image_info': None
                 }
             
-            # Görsel bilgilerini al (hata durumunda None)
-            try:
-                image_info = ImageUtils.get_image_info(image)
-            except Exception:
-                image_info = None
-            
-            # Başlık üret
-            title = self.generate_title(image)
+            # Önbellek kontrolü
+            cache_key = self._cache_key(image)
+            if cache_key is not None:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    return self._success_result(
+                        cached['title'], 
+                        cached['caption'], 
+                        cached['image_info']
+                    )
             
-            # Açıklama üret
-            caption = self.generate_caption(image, self.analysis_config.caption_prompt)
+            if self._supports_shared_encoder():
+                # Görseli bir kez decode et, embedding'leri bir kez hesapla
+                processed_image, image_info = ImageUtils.load_image(
+                    image, 
+                    self.analysis_config.max_image_size,
+                    self.analysis_config.resample_filter,
+                    self.analysis_config.fast_decode
+                )
+                image_embeds = self._encode_images([processed_image])
+                title, caption = self._generate_from_embeds(
+                    image_embeds.expand(2, -1, -1),
+                    [self.analysis_config.title_prompt, self.analysis_config.caption_prompt]
+                )
+                title = self._format_title(title)
+            else:
+                # Görsel bilgilerini al (hata durumunda None)
+                try:
+                    image_info = ImageUtils.get_image_info(image)
+                except Exception:
+                    image_info = None
+                
+                # Başlık üret
+                title = self.generate_title(image)
+                
+                # Açıklama üret
+                caption = self.generate_caption(image, self.analysis_config.caption_prompt)
             
             logger.info(f"✅ Analiz tamamlandı - Başlık: {title}")
             
-            return {
-                'title': title,
-                'caption': caption,
-                'status': "✅ Analiz tamamlandı!",
-                'success': True,
-                'image_info': image_info,
-                'model_info': {
-                    'model_name': self.model_config.model_name,
-                    'device': self.device
-                }
-            }
+            if cache_key is not None:
+                self.cache.put(cache_key, {
+                    'title': title,
+                    'caption': caption,
+                    'image_info': image_info
+                })
+            
+            return self._success_result(title, caption, image_info)
             
         except Exception as e:
-            error_msg = str(e)
-            logger.error(f"❌ Analiz hatası: {error_msg}")
-            return {
-                'title': "❌ Analiz hatası",
-                'caption': f"Hata detayı: {error_msg}",
-                'status': "❌ İşlem başarısız",
-                'success': False,
-                'image_info': None,
-                'error': error_msg
-            }
+            return self._failure_result(e)
+    
+    def _failure_result(self, error: Exception) -> Dict[str, Any]:
+        """Başarısız analiz sonucu oluştur"""
+        error_msg = str(error)
+        logger.error(f"❌ Analiz hatası: {error_msg}")
+        return {
+            'title': "❌ Analiz hatası",
+            'caption': f"Hata detayı: {error_msg}",
+            'status': "❌ İşlem başarısız",
+            'success': False,
+            'image_info': None,
+            'error': error_msg
+        }
     
     def save_image_with_metadata(
         self, 
@@ -240,128 +634,346 @@ class ImageAnalyzer:
         Returns:
             str: İşlem sonucu mesajı
         """
+        if image is None:
+            return "❌ Kaydedilecek görsel yok"
+        
         try:
-            if image is None:
-                return "❌ Kaydedilecek görsel yok"
-            
-            # Çıktı klasörünü belirle
-            if output_dir is None:
-                output_dir = self.analysis_config.output_directory
-            
-            # Klasörü oluştur
-            FileUtils.ensure_directory(output_dir)
-            
-            # Görseli PIL Image'e çevir
-            if isinstance(image, str):
-                pil_image = Image.open(image).convert('RGB')
-            else:
-                pil_image = ImageUtils.preprocess_image(image)
-            
-            # Dosya adını oluştur
-            safe_title = FileUtils.create_safe_filename(title)
-            file_path = FileUtils.get_unique_filepath(
-                f"{output_dir}/{safe_title}.jpg"
-            )
-              # Görseli kaydet
-            pil_image.save(
-                file_path, 
-                self.analysis_config.output_format,
-                quality=self.analysis_config.image_quality,
-                optimize=True
-            )
-            
-            # Metadata kaydet
-            if self.analysis_config.save_metadata:
-                try:
-                    image_info = ImageUtils.get_image_info(pil_image)
-                    additional_info = {
-                        'Original Size': f"{image_info['width']}x{image_info['height']}",
-                        'File Format': image_info['format'],
-                        'Device': self.device
-                    }
-                except Exception:
-                    # Image info alınamazsa basit bilgi kaydet
-                    additional_info = {
-                        'Device': self.device,
-                        'Processing': 'Successful'
-                    }
-                
-                FileUtils.save_metadata(
-                    file_path, 
-                    title, 
-                    caption, 
-                    self.model_config.model_name,
-                    additional_info
-                )
-            
-            logger.info(f"💾 Görsel kaydedildi: {file_path}")
-            return f"✅ Görsel kaydedildi: {file_path}"
-            
+            file_path = self._save_image(image, title, caption, output_dir)
         except Exception as e:
             error_msg = f"Kaydetme hatası: {str(e)}"
             logger.error(f"❌ {error_msg}")
             return f"❌ {error_msg}"
+        
+        return f"✅ Görsel kaydedildi: {file_path}"
+    
+    def _save_result(self, result: Dict[str, Any]) -> None:
+        """
+        Analiz sonucunun görselini kaydet ve sonucu işaretle
+        
+        'saved' alanı kaydın başarılı olup olmadığını, 'save_error' hata
+        mesajını, 'save_result' kullanıcıya gösterilen mesajı taşır.
+        
+        Args:
+            result (dict): file_path, title ve caption içeren analiz sonucu
+        """
+        try:
+            file_path = self._save_image(result['file_path'], result['title'], result['caption'])
+        except Exception as e:
+            error_msg = f"Kaydetme hatası: {str(e)}"
+            logger.error(f"❌ {error_msg}")
+            result['saved'] = False
+            result['save_error'] = error_msg
+            result['save_result'] = f"❌ {error_msg}"
+            return
+        
+        result['saved'] = True
+        result['save_result'] = f"✅ Görsel kaydedildi: {file_path}"
+    
+    def _save_image(
+        self,
+        image: Union[str, Image.Image],
+        title: str,
+        caption: str,
+        output_dir: Optional[str] = None
+    ) -> str:
+        """Görseli ve metadata'sını yaz, kaydedilen dosya yolunu döndür (hata fırlatır)"""
+        # Çıktı klasörünü belirle
+        if output_dir is None:
+            output_dir = self.analysis_config.output_directory
+        
+        # Klasörü oluştur
+        FileUtils.ensure_directory(output_dir)
+        
+        # Görseli PIL Image'e çevir
+        if isinstance(image, str):
+            pil_image = Image.open(image).convert('RGB')
+        else:
+            pil_image = ImageUtils.preprocess_image(image)
+        
+        # Dosya adını oluştur
+        safe_title = FileUtils.create_safe_filename(title)
+        file_path = FileUtils.get_unique_filepath(
+            f"{output_dir}/{safe_title}.jpg",
+            reserve=True
+        )
+        
+        # Görseli kaydet
+        pil_image.save(
+            file_path, 
+            self.analysis_config.output_format,
+            quality=self.analysis_config.image_quality,
+            optimize=True
+        )
+        
+        # Metadata kaydet
+        if self.analysis_config.save_metadata:
+            try:
+                image_info = ImageUtils.get_image_info(pil_image)
+                additional_info = {
+                    'Original Size': f"{image_info['width']}x{image_info['height']}",
+                    'File Format': image_info['format'],
+                    'Device': self.device
+                }
+            except Exception:
+                # Image info alınamazsa basit bilgi kaydet
+                additional_info = {
+                    'Device': self.device,
+                    'Processing': 'Successful'
+                }
+            
+            FileUtils.save_metadata(
+                file_path, 
+                title, 
+                caption, 
+                self.model_config.model_name,
+                additional_info
+            )
+        
+        logger.info(f"💾 Görsel kaydedildi: {file_path}")
+        return file_path
     
     def batch_analyze(
         self, 
-        image_paths: List[str],
+        image_paths: Iterable[str],
         save_results: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Birden fazla görseli toplu analiz et
         
+        AnalysisConfig.batch_size 1'den büyükse görseller bu boyuttaki
+        gruplar halinde tek bir model.generate çağrısıyla işlenir.
+        AnalysisConfig.pipelined açıksa decode, model ve kaydetme
+        aşamaları BatchPipeline ile örtüşerek çalışır.
+        
         Args:
-            image_paths (List[str]): Görsel dosya yolları
+            image_paths (Iterable[str]): Görsel dosya yolları (liste veya tembel üretici)
             save_results (bool): Sonuçları kaydet
             
         Returns:
-            List[dict]: Analiz sonuçları
+            List[dict]: Girdi sırasıyla analiz sonuçları
         """
-        results = []
+        return list(self.iter_batch_analyze(image_paths, save_results))
+    
+    def iter_batch_analyze(
+        self, 
+        image_paths: Iterable[str],
+        save_results: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Görselleri toplu analiz et, sonuçları hazır oldukça döndür
+        
+        Dosya yolları tembel tüketilir: FileUtils.iter_images_in_directory ile
+        birlikte kullanıldığında çok büyük klasörlerde bile ilk batch hemen
+        işlenir ve tam liste bellekte tutulmaz.
+        
+        Args:
+            image_paths (Iterable[str]): Görsel dosya yolları
+            save_results (bool): Sonuçları kaydet
+            
+        Yields:
+            dict: Girdi sırasıyla analiz sonucu
+        """
+        batch_size = max(1, self.analysis_config.batch_size)
         
-        # İlerleme takibi
+        # İlerleme takibi (toplam bilinmiyorsa sadece sayaç)
+        progress = None
         if self.analysis_config.show_progress:
-            progress = ProgressTracker(len(image_paths), "Görsel Analizi")
+            total = len(image_paths) if isinstance(image_paths, Sized) else None
+            progress = ProgressTracker(total, "Görsel Analizi")
         
-        for i, image_path in enumerate(image_paths):
-            try:
-                # Analiz yap
-                result = self.analyze_image(image_path)
-                result['file_path'] = image_path
-                
+        # Decode / model / kaydetme aşamalarını örtüştür
+        if self.analysis_config.pipelined:
+            pipeline = BatchPipeline(self)
+            yield from pipeline.stream(image_paths, save_results, progress)
+            self.last_pipeline_stats = pipeline.stats
+            logger.info(pipeline.format_stats())
+            return
+        
+        image_paths = iter(image_paths)
+        while True:
+            chunk = list(islice(image_paths, batch_size))
+            if not chunk:
+                break
+            
+            if batch_size > 1:
+                chunk_results = self.analyze_images(chunk)
+                for image_path, result in zip(chunk, chunk_results):
+                    result['file_path'] = image_path
+            else:
+                chunk_results = [self._analyze_single(path) for path in chunk]
+            
+            for result in chunk_results:
                 # Kaydetme
                 if save_results and result['success']:
-                    save_result = self.save_image_with_metadata(
-                        image_path,
-                        result['title'],
-                        result['caption']
-                    )
-                    result['save_result'] = save_result
-                
-                results.append(result)
+                    self._save_result(result)
                 
                 # İlerleme güncelle
-                if self.analysis_config.show_progress:
+                if progress is not None:
                     progress.update()
                 
+                yield result
+    
+    def _analyze_single(self, image_path: str) -> Dict[str, Any]:
+        """Tek görseli analiz et, hatayı sonuç sözlüğüne çevir"""
+        try:
+            result = self.analyze_image(image_path)
+            result['file_path'] = image_path
+            return result
+        except Exception as e:
+            return self._error_result(image_path, e)
+    
+    def analyze_images(
+        self, 
+        images: List[Union[str, Image.Image]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Bir grup görseli tek batch olarak analiz et
+        
+        Açılamayan görseller gruptan çıkarılır ve kendi hata sonuçlarını
+        alır; batch üretimi başarısız olursa grup tek tek işlenir.
+        
+        Args:
+            images (List): Görseller (dosya yolu, numpy array veya PIL Image)
+            
+        Returns:
+            List[dict]: Girdi sırasıyla analyze_image ile aynı biçimde sonuçlar
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(images)
+        prepared = []
+        positions = []
+        
+        # Görselleri ön işle (hatalar yalnızca ilgili öğeyi etkiler)
+        for i, image in enumerate(images):
+            result, entry = self._prepare_image(image)
+            if result is not None:
+                results[i] = result
+            else:
+                prepared.append(entry)
+                positions.append(i)
+        
+        if prepared:
+            try:
+                for i, result in zip(positions, self._infer_prepared(prepared)):
+                    results[i] = result
             except Exception as e:
-                error_result = {
-                    'file_path': image_path,
-                    'title': "❌ Hata",
-                    'caption': str(e),
-                    'status': "❌ Başarısız",
-                    'success': False,
-                    'error': str(e)
-                }
-                results.append(error_result)
-                
-                logger.error(f"❌ Hata: {image_path} - {str(e)}")
-                
-                if self.analysis_config.show_progress:
-                    progress.update()
+                # Batch başarısız: grubu tek tek işle
+                logger.warning(f"Batch analiz hatası, tekli moda geçiliyor: {str(e)}")
+                for i in positions:
+                    results[i] = self.analyze_image(images[i])
         
         return results
     
+    def _prepare_image(
+        self, 
+        image: Union[str, Image.Image]
+    ) -> tuple:
+        """
+        Batch için görseli hazırla: önbellek kontrolü ve tek seferlik decode
+        
+        Args:
+            image: Görsel (dosya yolu, numpy array veya PIL Image)
+            
+        Returns:
+            tuple: (hazır sonuç, None) veya (None, (görsel, bilgi, önbellek anahtarı))
+        """
+        if image is None:
+            return self.analyze_image(image), None
+        
+        try:
+            cache_key = self._cache_key(image)
+            if cache_key is not None:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    return self._success_result(
+                        cached['title'], 
+                        cached['caption'], 
+                        cached['image_info']
+                    ), None
+            
+            processed_image, image_info = ImageUtils.load_image(
+                image, 
+                self.analysis_config.max_image_size,
+                self.analysis_config.resample_filter,
+                self.analysis_config.fast_decode
+            )
+            return None, (processed_image, image_info, cache_key)
+        except Exception as e:
+            return self._failure_result(e), None
+    
+    def _infer_prepared(self, prepared: List[tuple]) -> List[Dict[str, Any]]:
+        """
+        Hazırlanmış görselleri tek batch olarak modelden geçir
+        
+        Args:
+            prepared (List[tuple]): _prepare_image çıktıları (görsel, bilgi, anahtar)
+            
+        Returns:
+            List[dict]: Sırasıyla analiz sonuçları
+            
+        Raises:
+            GenerationError: Üretim hatası
+        """
+        processed_images = [entry[0] for entry in prepared]
+        count = len(processed_images)
+        
+        if self._supports_shared_encoder():
+            image_embeds = self._encode_images(processed_images)
+            texts = self._generate_from_embeds(
+                torch.cat([image_embeds, image_embeds]),
+                [self.analysis_config.title_prompt] * count
+                + [self.analysis_config.caption_prompt] * count
+            )
+            titles, captions = texts[:count], texts[count:]
+        else:
+            titles = self._generate_batch(processed_images, self.analysis_config.title_prompt)
+            captions = self._generate_batch(processed_images, self.analysis_config.caption_prompt)
+        
+        results = []
+        for (_, image_info, cache_key), title, caption in zip(prepared, titles, captions):
+            title = self._format_title(title)
+            results.append(self._success_result(title, caption, image_info))
+            
+            if cache_key is not None:
+                self.cache.put(cache_key, {
+                    'title': title,
+                    'caption': caption,
+                    'image_info': image_info
+                })
+        
+        logger.info(f"✅ Batch analiz tamamlandı - {count} görsel")
+        return results
+    
+    def _error_result(self, image_path: str, error: Exception) -> Dict[str, Any]:
+        """Toplu analiz için hata sonucu oluştur"""
+        logger.error(f"❌ Hata: {image_path} - {str(error)}")
+        return {
+            'file_path': image_path,
+            'title': "❌ Hata",
+            'caption': str(error),
+            'status': "❌ Başarısız",
+            'success': False,
+            'error': str(error)
+        }
+    
+    def warmup(self) -> float:
+        """
+        Sentetik bir görselle modeli bir kez çalıştır
+        
+        İlk gerçek istek; çekirdek seçimi, bellek ayırıcı ve tembel
+        başlatma maliyetlerini ödemez. Sonuç önbelleğe yazılmaz.
+        
+        Returns:
+            float: Isınma süresi (saniye)
+        """
+        start = time.perf_counter()
+        size = self.analysis_config.max_image_size
+        image = Image.new("RGB", (size, size), (128, 128, 128))
+        self._infer_prepared([(image, None, None)])
+        
+        elapsed = time.perf_counter() - start
+        logger.info(f"🔥 Isınma tamamlandı: {elapsed:.2f} sn")
+        return elapsed
+    
     def get_model_info(self) -> Dict[str, Any]:
         """
         Model bilgilerini al
@@ -372,9 +984,12 @@ class ImageAnalyzer:
         return {
             'model_name': self.model_config.model_name,
             'device': self.device,
+            'dtype': str(self.dtype).replace('torch.', ''),
+            'quantization': self.quantization,
             'cuda_available': torch.cuda.is_available(),
             'model_config': self.model_config.to_dict(),
-            'analysis_config': self.analysis_config.to_dict()
+            'analysis_config': self.analysis_config.to_dict(),
+            'cache': self.cache.get_stats() if self.cache else None
         }
 
 # Geriye uyumluluk için eski sınıf adı
@@ -0,0 +1,199 @@
+"""
+Dinamik mikro-batch kuyruğu - Eşzamanlı analiz isteklerini birleştirir
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import nullcontext
+from typing import Callable, ContextManager, Union, Dict, Any, Optional
+
+import numpy as np
+from PIL import Image
+
+from .analyzer import ImageAnalyzer
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+class MicroBatcher:
+    """
+    ImageAnalyzer önünde süreç içi istek kuyruğu
+    
+    Gelen istekler en fazla `max_wait_ms` süre boyunca veya `max_batch_size`
+    isteğe ulaşana kadar toplanır, tek bir analyze_images çağrısıyla (tek
+    batched generate) işlenir ve sonuçlar bekleyen Future'lara dağıtılır.
+    Model tek bir arka plan iş parçacığından çağrıldığı için eşzamanlı
+    kullanıcılar aynı model örneğini güvenle paylaşır.
+    
+    model_guard verilirse her batch onun döndürdüğü bağlamda çalışır
+    (ör. paylaşılan bellek bütçesindeki modeli kullanım süresince tutmak
+    ve çıkarılmışsa yeniden yüklemek için).
+    """
+    
+    def __init__(
+        self,
+        analyzer: ImageAnalyzer,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+        model_guard: Optional[Callable[[], ContextManager]] = None
+    ):
+        """
+        Kuyruğu başlat
+        
+        Args:
+            analyzer (ImageAnalyzer): Kullanılacak analyzer
+            max_batch_size (int, optional): Batch başına maksimum istek
+            max_wait_ms (float, optional): İlk istekten sonra bekleme penceresi (ms)
+            model_guard (callable, optional): Model kullanımını saran bağlam yöneticisi üreticisi
+        """
+        self.analyzer = analyzer
+        self.model_guard = model_guard
+        self.max_batch_size = max(1, max_batch_size or analyzer.analysis_config.micro_batch_size)
+        if max_wait_ms is None:
+            max_wait_ms = analyzer.analysis_config.micro_batch_wait_ms
+        self.max_wait = max_wait_ms / 1000.0
+        
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        
+        self.total_requests = 0
+        self.total_batches = 0
+        self.max_observed_batch = 0
+        
+        self._worker = threading.Thread(target=self._run, name="MicroBatcher", daemon=True)
+        self._worker.start()
+    
+    def submit(self, image: Union[str, np.ndarray, Image.Image]) -> Future:
+        """
+        Görseli analiz kuyruğuna ekle
+        
+        Args:
+            image: Görsel (dosya yolu, numpy array veya PIL Image)
+        
+        Returns:
+            Future: analyze_image ile aynı biçimde sonuç döndürecek Future
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher kapatıldı")
+            self._queue.put((image, future))
+        return future
+    
+    def analyze_image(
+        self,
+        image: Union[str, np.ndarray, Image.Image],
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Görseli kuyruk üzerinden analiz et (ImageAnalyzer.analyze_image yerine geçer)
+        
+        Args:
+            image: Görsel (dosya yolu, numpy array veya PIL Image)
+            timeout (float, optional): Maksimum bekleme süresi (saniye)
+        
+        Returns:
+            dict: Analiz sonucu
+        """
+        return self.submit(image).result(timeout=timeout)
+    
+    def _collect_batch(self, first) -> tuple:
+        """İlk istekten sonra pencere dolana kadar istek topla"""
+        batch = [first]
+        stop = False
+        deadline = time.monotonic() + self.max_wait
+        
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if item is _STOP:
+                stop = True
+                break
+            batch.append(item)
+        
+        return batch, stop
+    
+    def _run(self) -> None:
+        """Arka plan iş parçacığı: batch topla, analiz et, sonuçları dağıt"""
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            
+            batch, stop = self._collect_batch(first)
+            pending = [(image, future) for image, future in batch if future.set_running_or_notify_cancel()]
+            if not pending:
+                continue
+            
+            try:
+                with self._guard():
+                    results = self.analyzer.analyze_images([image for image, _ in pending])
+                for (_, future), result in zip(pending, results):
+                    future.set_result(result)
+            except Exception as e:
+                logger.error(f"❌ Mikro-batch hatası: {str(e)}")
+                for _, future in pending:
+                    future.set_exception(e)
+            
+            with self._lock:
+                self.total_requests += len(pending)
+                self.total_batches += 1
+                self.max_observed_batch = max(self.max_observed_batch, len(pending))
+    
+    def _guard(self) -> ContextManager:
+        """Batch süresince modeli tutan bağlam (model_guard yoksa boş)"""
+        return self.model_guard() if self.model_guard is not None else nullcontext()
+    
+    def warmup(self) -> float:
+        """
+        Analyzer'ı model_guard bağlamında ısıt
+        
+        Returns:
+            float: Isınma süresi (saniye)
+        """
+        with self._guard():
+            return self.analyzer.warmup()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Kuyruk istatistiklerini al
+        
+        Returns:
+            dict: İstek/batch sayaçları ve ortalama batch boyutu
+        """
+        with self._lock:
+            return {
+                'total_requests': self.total_requests,
+                'total_batches': self.total_batches,
+                'average_batch_size': (
+                    self.total_requests / self.total_batches if self.total_batches else 0.0
+                ),
+                'max_observed_batch': self.max_observed_batch,
+                'queue_depth': self._queue.qsize(),
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000.0
+            }
+    
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Kuyruğu kapat; bekleyen istekler işlendikten sonra iş parçacığı durur
+        
+        Args:
+            timeout (float, optional): İş parçacığını bekleme süresi (saniye)
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._worker.join(timeout)
@@ -0,0 +1,198 @@
+"""
+İçerik adresli analiz önbelleği - Bellek içi LRU ve SQLite katmanları
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Union, Dict, Any, Optional
+
+import numpy as np
+from PIL import Image
+
+from .exceptions import FileOperationError
+
+class CaptionCache:
+    """
+    Aynı görsel tekrar geldiğinde modeli atlamak için analiz önbelleği
+    
+    Anahtar; görsel içeriğinin özeti ile model adı, prompt'lar ve üretim
+    parametrelerinden oluşur. Bellek katmanı LRU ile sınırlanır, disk
+    katmanı (SQLite) yeniden başlatmalardan sonra da korunur.
+    """
+    
+    _READ_CHUNK_SIZE = 1024 * 1024
+    
+    def __init__(self, max_size: int = 256, db_path: Optional[str] = None):
+        """
+        Önbelleği başlat
+        
+        Args:
+            max_size (int): Bellekte tutulacak maksimum kayıt sayısı
+            db_path (str, optional): SQLite dosya yolu (None ise disk katmanı yok)
+        """
+        self.max_size = max_size
+        self.db_path = db_path
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        
+        if db_path:
+            self._open_db(db_path)
+    
+    def _open_db(self, db_path: str) -> None:
+        """SQLite disk katmanını aç"""
+        try:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS captions ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self._db.commit()
+        except Exception as e:
+            raise FileOperationError("open_cache", db_path, str(e))
+    
+    @staticmethod
+    def image_digest(image: Union[str, np.ndarray, Image.Image]) -> str:
+        """
+        Görsel içeriğinin SHA-256 özetini hesapla
+        
+        Dosya yolları için dosya baytları, numpy array ve PIL Image için
+        piksel verisi kullanılır.
+        
+        Args:
+            image: Görsel (dosya yolu, numpy array veya PIL Image)
+        
+        Returns:
+            str: Hex özet
+        """
+        digest = hashlib.sha256()
+        
+        if isinstance(image, str):
+            with open(image, 'rb') as f:
+                for chunk in iter(lambda: f.read(CaptionCache._READ_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+        elif isinstance(image, np.ndarray):
+            digest.update(f"{image.shape}:{image.dtype}".encode())
+            digest.update(np.ascontiguousarray(image).tobytes())
+        else:
+            digest.update(f"{image.size}:{image.mode}".encode())
+            digest.update(image.tobytes())
+        
+        return digest.hexdigest()
+    
+    @staticmethod
+    def make_key(image: Union[str, np.ndarray, Image.Image], params: Dict[str, Any]) -> str:
+        """
+        Görsel ve analiz parametrelerinden önbellek anahtarı oluştur
+        
+        Args:
+            image: Görsel (dosya yolu, numpy array veya PIL Image)
+            params (dict): Model adı, prompt'lar ve üretim parametreleri
+        
+        Returns:
+            str: Önbellek anahtarı
+        """
+        params_digest = hashlib.sha256(
+            json.dumps(params, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return f"{CaptionCache.image_digest(image)}:{params_digest}"
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Önbellekten kayıt getir
+        
+        Args:
+            key (str): Önbellek anahtarı
+        
+        Returns:
+            dict: Kayıt (yoksa None)
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return dict(self._memory[key])
+            
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value FROM captions WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value = json.loads(row[0])
+                    self._remember(key, value)
+                    self.disk_hits += 1
+                    return dict(value)
+            
+            self.misses += 1
+            return None
+    
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Önbelleğe kayıt ekle
+        
+        Args:
+            key (str): Önbellek anahtarı
+            value (dict): JSON'a çevrilebilir kayıt
+        """
+        with self._lock:
+            self._remember(key, value)
+            
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO captions (key, value) VALUES (?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False, default=str))
+                )
+                self._db.commit()
+    
+    def _remember(self, key: str, value: Dict[str, Any]) -> None:
+        """Bellek katmanına ekle ve LRU sınırını uygula"""
+        if self.max_size <= 0:
+            return
+        
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Tüm katmanları temizle"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM captions")
+                self._db.commit()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Önbellek istatistiklerini al
+        
+        Returns:
+            dict: İsabet/ıskalama sayaçları ve boyutlar
+        """
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            total = hits + self.misses
+            return {
+                'hits': hits,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': hits / total if total else 0.0,
+                'memory_entries': len(self._memory),
+                'max_size': self.max_size,
+                'db_path': self.db_path
+            }
+    
+    def close(self) -> None:
+        """Disk bağlantısını kapat"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -13,7 +13,8 @@ class ModelConfig:
     model_name: str = "Salesforce/blip-image-captioning-base"
     device: str = "auto"  # "auto", "cpu", "cuda"
     cache_dir: Optional[str] = None
-    torch_dtype: str = "float32"
+    torch_dtype: str = "float32"  # "auto", "float32", "bfloat16", "float16"
+    quantization: Optional[str] = None  # None, "int8" (dinamik, sadece CPU)
     use_auth_token: Optional[str] = None
     
     # Generation parametreleri
@@ -30,6 +31,7 @@ class ModelConfig:
             'device': self.device,
             'cache_dir': self.cache_dir,
             'torch_dtype': self.torch_dtype,
+            'quantization': self.quantization,
             'use_auth_token': self.use_auth_token,
             'max_length': self.max_length,
             'num_beams': self.num_beams,
@@ -45,6 +47,10 @@ class AnalysisConfig:
     """
     max_image_size: int = 512
     image_quality: int = 95
+    
+    # Ön işleme: küçültme filtresi ve JPEG draft (DCT ölçekleme) ile hızlı decode
+    resample_filter: str = "lanczos"  # nearest, box, bilinear, hamming, bicubic, lanczos
+    fast_decode: bool = True
     output_format: str = "JPEG"
     
     # Başlık ayarları
@@ -54,6 +60,9 @@ class AnalysisConfig:
     # Açıklama ayarları
     caption_prompt: str = ""
     
+    # Başlık ve açıklama için görsel kodlayıcıyı tek sefer çalıştır
+    shared_encoder: bool = True
+    
     # Kaydetme ayarları
     save_metadata: bool = True
     output_directory: str = "captioned_images"
@@ -62,19 +71,44 @@ class AnalysisConfig:
     batch_size: int = 1
     show_progress: bool = True
     
+    # Boru hattı: decode / model / kaydetme aşamalarını örtüştür (BatchPipeline)
+    pipelined: bool = False
+    decode_workers: int = 4
+    write_workers: int = 2
+    pipeline_queue_size: int = 16
+    
+    # Eşzamanlı istekler için mikro-batch kuyruğu (MicroBatcher)
+    micro_batch_size: int = 8
+    micro_batch_wait_ms: float = 10.0
+    
+    # Önbellek ayarları (0 ve None ise önbellek kapalı)
+    cache_size: int = 256
+    cache_path: Optional[str] = None
+    
     def to_dict(self) -> Dict[str, Any]:
         """Sözlük olarak döndür"""
         return {
             'max_image_size': self.max_image_size,
             'image_quality': self.image_quality,
+            'resample_filter': self.resample_filter,
+            'fast_decode': self.fast_decode,
             'output_format': self.output_format,
             'title_max_length': self.title_max_length,
             'title_prompt': self.title_prompt,
             'caption_prompt': self.caption_prompt,
+            'shared_encoder': self.shared_encoder,
             'save_metadata': self.save_metadata,
             'output_directory': self.output_directory,
             'batch_size': self.batch_size,
-            'show_progress': self.show_progress
+            'show_progress': self.show_progress,
+            'pipelined': self.pipelined,
+            'decode_workers': self.decode_workers,
+            'write_workers': self.write_workers,
+            'pipeline_queue_size': self.pipeline_queue_size,
+            'micro_batch_size': self.micro_batch_size,
+            'micro_batch_wait_ms': self.micro_batch_wait_ms,
+            'cache_size': self.cache_size,
+            'cache_path': self.cache_path
         }
 
 # Önceden tanımlı konfigürasyonlar
@@ -129,7 +163,8 @@ class PresetConfigs:
         analysis_config = AnalysisConfig(
             max_image_size=512,
             batch_size=4,
-            show_progress=True
+            show_progress=True,
+            pipelined=True
         )
         
         return model_config, analysis_config
\ No newline at end of file
@@ -0,0 +1,233 @@
+"""
+Kalıcı iş manifesti - Yarıda kalan toplu analizleri kaldığı yerden sürdürür
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional, Iterable, Iterator, List, Tuple
+
+from .exceptions import FileOperationError
+
+class JobManifest:
+    """
+    İşlenen dosyaların SQLite kaydı
+    
+    Her dosya mutlak yolu ile (PRIMARY KEY) saklanır; böylece sürdürme
+    sırasında dosya başına kontrol tek bir indeks aramasıdır. Dosyanın
+    mtime/size değeri değişmişse kayıt geçersiz sayılır ve yeniden işlenir.
+    Her kayıt ayrı commit edilir (WAL + synchronous=NORMAL ile ucuz); çökme
+    sonrasında kaydedilmiş bir görsel yeniden işlenip kopyası yazılmaz.
+    """
+    
+    def __init__(self, db_path: str):
+        """
+        Manifesti aç (yoksa oluştur)
+        
+        Args:
+            db_path (str): SQLite dosya yolu
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        
+        self.skipped = 0
+        self.recorded = 0
+        
+        try:
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS items ("
+                "path TEXT PRIMARY KEY, mtime REAL, size INTEGER, "
+                "success INTEGER NOT NULL, title TEXT, caption TEXT, "
+                "error TEXT, updated_at TEXT NOT NULL)"
+            )
+            self._db.commit()
+        except Exception as e:
+            raise FileOperationError("open_manifest", db_path, str(e))
+    
+    @staticmethod
+    def _stat(image_path: str) -> Tuple[Optional[float], Optional[int]]:
+        """Dosyanın mtime ve boyutu (dosya yoksa None)"""
+        try:
+            stat = os.stat(image_path)
+            return stat.st_mtime, stat.st_size
+        except OSError:
+            return None, None
+    
+    def lookup(self, image_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Dosyanın manifest kaydını getir
+        
+        Args:
+            image_path (str): Görsel dosya yolu
+        
+        Returns:
+            dict: Kayıt (yoksa None)
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT mtime, size, success, title, caption, error FROM items WHERE path = ?",
+                (os.path.abspath(image_path),)
+            ).fetchone()
+        
+        if row is None:
+            return None
+        
+        return {
+            'mtime': row[0],
+            'size': row[1],
+            'success': bool(row[2]),
+            'title': row[3],
+            'caption': row[4],
+            'error': row[5]
+        }
+    
+    def is_done(self, image_path: str, include_failed: bool = True) -> bool:
+        """
+        Dosya daha önce (değişmeden) işlendi mi?
+        
+        Args:
+            image_path (str): Görsel dosya yolu
+            include_failed (bool): Başarısız kayıtları da tamamlanmış say
+        
+        Returns:
+            bool: Atlanabilirse True
+        """
+        entry = self.lookup(image_path)
+        if entry is None:
+            return False
+        
+        if (entry['mtime'], entry['size']) != self._stat(image_path):
+            return False
+        
+        return entry['success'] or include_failed
+    
+    def pending(
+        self,
+        image_paths: Iterable[str],
+        retry_failed: bool = False
+    ) -> Iterator[str]:
+        """
+        Daha önce işlenmiş dosyaları atlayarak yolları tembel olarak döndür
+        
+        Args:
+            image_paths (Iterable[str]): Görsel dosya yolları
+            retry_failed (bool): Başarısız kayıtları yeniden işle
+        
+        Yields:
+            str: İşlenmesi gereken dosya yolu
+        """
+        for image_path in image_paths:
+            if self.is_done(image_path, include_failed=not retry_failed):
+                self.skipped += 1
+                continue
+            yield image_path
+    
+    def failed_paths(self, directory: Optional[str] = None) -> List[str]:
+        """
+        Başarısız kaydedilmiş dosya yolları
+        
+        Args:
+            directory (str, optional): Sadece bu klasör altındakiler
+        
+        Returns:
+            List[str]: Mutlak dosya yolları
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT path FROM items WHERE success = 0 ORDER BY path"
+            ).fetchall()
+        
+        paths = [row[0] for row in rows]
+        if directory:
+            prefix = os.path.join(os.path.abspath(directory), "")
+            paths = [path for path in paths if path.startswith(prefix)]
+        return paths
+    
+    def record(self, result: Dict[str, Any]) -> None:
+        """
+        Analiz sonucunu manifeste yaz
+        
+        Sonuç kaydedildikten sonra ('saved' alanı dolduktan sonra) çağrılmalıdır;
+        kaydı başarısız olan görsel başarısız olarak işaretlenir.
+        
+        Args:
+            result (dict): file_path içeren analiz sonucu
+        """
+        image_path = result['file_path']
+        mtime, size = self._stat(image_path)
+        
+        # Analiz başarılı ama kayıt başarısızsa görsel yeniden işlenmeli
+        success = bool(result.get('success'))
+        error = result.get('error')
+        if success and result.get('saved') is False:
+            success, error = False, result.get('save_error')
+        
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO items "
+                "(path, mtime, size, success, title, caption, error, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    os.path.abspath(image_path),
+                    mtime,
+                    size,
+                    int(success),
+                    result.get('title'),
+                    result.get('caption'),
+                    error,
+                    datetime.now().isoformat()
+                )
+            )
+            self._db.commit()
+            self.recorded += 1
+    
+    def record_all(self, results: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Sonuçları manifeste yazarken aynen geçir
+        
+        Args:
+            results (Iterable[dict]): Analiz sonuçları
+        
+        Yields:
+            dict: Aynı analiz sonucu
+        """
+        for result in results:
+            self.record(result)
+            yield result
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Manifest istatistiklerini al
+        
+        Returns:
+            dict: Toplam/başarılı/başarısız kayıt sayıları ve bu çalıştırmanın sayaçları
+        """
+        with self._lock:
+            total, successful = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(success), 0) FROM items"
+            ).fetchone()
+        
+        return {
+            'total': total,
+            'successful': successful,
+            'failed': total - successful,
+            'skipped': self.skipped,
+            'recorded': self.recorded,
+            'db_path': self.db_path
+        }
+    
+    def close(self) -> None:
+        """Bağlantıyı kapat"""
+        with self._lock:
+            if self._db is not None:
+                self._db.commit()
+                self._db.close()
+                self._db = None
@@ -0,0 +1,130 @@
+"""
+Çok süreçli toplu analiz - Dosya listesini worker süreçlerine dağıtır
+"""
+
+import multiprocessing as mp
+import os
+import queue
+from typing import List, Dict, Any, Optional, Iterator, Iterable
+
+import torch
+
+from .config import ModelConfig, AnalysisConfig
+
+# Her worker sürecinde bir kez yüklenen analyzer
+_worker_analyzer = None
+
+# Varsayılan parça boyutu: model batch'inin katı (IPC turu başına birden çok batch)
+SHARD_BATCHES = 8
+
+# Worker başına aynı anda havuzda bekleyebilecek parça sayısı
+SHARDS_IN_FLIGHT = 2
+
+def _init_worker(
+    model_config: ModelConfig,
+    analysis_config: AnalysisConfig,
+    num_threads: int
+) -> None:
+    """Worker başlatıcısı: thread sayısını ayarla ve modeli bir kez yükle"""
+    global _worker_analyzer
+    from .analyzer import ImageAnalyzer
+    
+    torch.set_num_threads(num_threads)
+    analysis_config.show_progress = False
+    _worker_analyzer = ImageAnalyzer(model_config, analysis_config)
+
+def _analyze_shard(task: tuple) -> List[Dict[str, Any]]:
+    """Bir parça dosyayı worker'ın analyzer'ı ile analiz et"""
+    image_paths, save_results = task
+    return _worker_analyzer.batch_analyze(image_paths, save_results=save_results)
+
+def _shards(image_paths: Iterable[str], shard_size: int) -> Iterator[List[str]]:
+    """Dosya yollarını sabit boyutlu parçalara ayır"""
+    shard = []
+    for image_path in image_paths:
+        shard.append(image_path)
+        if len(shard) >= shard_size:
+            yield shard
+            shard = []
+    if shard:
+        yield shard
+
+def parallel_batch_analyze(
+    image_paths: Iterable[str],
+    workers: int,
+    model_config: Optional[ModelConfig] = None,
+    analysis_config: Optional[AnalysisConfig] = None,
+    save_results: bool = False,
+    threads_per_worker: Optional[int] = None,
+    shard_size: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Görselleri N worker süreciyle analiz et, sonuçları tamamlanma sırasıyla döndür
+    
+    Her worker modeli bir kez yükler; torch intra-op thread sayısı
+    çekirdekler worker'lar arasında paylaşılacak şekilde bölünür. Dosya
+    listesi shard_size boyutlu parçalara ayrılarak worker'lara dağıtılır;
+    parça boyutu model batch boyutundan bağımsızdır, böylece her IPC turu
+    (dosya listesi gidişi, sonuç dönüşü) birden çok batch'i kapsar.
+    Parçalar listeden tembel çekilir; havuzda en fazla
+    workers * SHARDS_IN_FLIGHT parça bulunur, böylece dosya taraması ve
+    manifest sorguları sonuçlarla birlikte ilerler.
+    
+    Args:
+        image_paths (Iterable[str]): Görsel dosya yolları
+        workers (int): Worker süreç sayısı
+        model_config (ModelConfig, optional): Model konfigürasyonu
+        analysis_config (AnalysisConfig, optional): Analiz konfigürasyonu
+        save_results (bool): Sonuçları worker içinde kaydet
+        threads_per_worker (int, optional): Worker başına torch thread sayısı
+        shard_size (int, optional): Worker'a tek seferde gönderilecek görsel sayısı
+            (varsayılan: batch_size * SHARD_BATCHES)
+    
+    Yields:
+        dict: file_path içeren analiz sonucu (tamamlanma sırasıyla)
+    """
+    model_config = model_config or ModelConfig()
+    analysis_config = analysis_config or AnalysisConfig()
+    workers = max(1, workers)
+    
+    if threads_per_worker is None:
+        threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+    
+    if shard_size is None:
+        shard_size = max(1, analysis_config.batch_size) * SHARD_BATCHES
+    shard_size = max(1, shard_size)
+    shards = _shards(image_paths, shard_size)
+    max_in_flight = workers * SHARDS_IN_FLIGHT
+    
+    # fork, torch'un thread havuzlarıyla güvenli değil; spawn kullan
+    ctx = mp.get_context("spawn")
+    with ctx.Pool(
+        processes=workers,
+        initializer=_init_worker,
+        initargs=(model_config, analysis_config, threads_per_worker)
+    ) as pool:
+        # imap_unordered tüm girdiyi hemen tüketir; gönderimi elle sınırla
+        completed = queue.Queue()
+        in_flight = 0
+        exhausted = False
+        while True:
+            while not exhausted and in_flight < max_in_flight:
+                shard = next(shards, None)
+                if shard is None:
+                    exhausted = True
+                    break
+                pool.apply_async(
+                    _analyze_shard, ((shard, save_results),),
+                    callback=completed.put, error_callback=completed.put
+                )
+                in_flight += 1
+            
+            if in_flight == 0:
+                break
+            
+            shard_results = completed.get()
+            in_flight -= 1
+            if isinstance(shard_results, BaseException):
+                raise shard_results
+            for result in shard_results:
+                yield result
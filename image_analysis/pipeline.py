@@ -0,0 +1,318 @@
+"""
+Boru hattı (pipeline) toplu analiz motoru - decode / model / kaydetme aşamaları
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Iterable, Iterator
+
+from .utils import ProgressTracker
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+class _StageStats:
+    """Bir aşamanın toplam meşgul süresi ve iş sayısı (thread-safe)"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.busy = 0.0
+        self.count = 0
+    
+    def add(self, seconds: float, count: int = 1) -> None:
+        with self._lock:
+            self.busy += seconds
+            self.count += count
+    
+    def to_dict(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                'busy_seconds': self.busy,
+                'items': self.count,
+                'avg_ms': (self.busy / self.count * 1000.0) if self.count else 0.0
+            }
+
+class _DepthStats:
+    """Kuyruk derinliği örnekleri (maksimum ve ortalama)"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = 0
+        self.total = 0
+        self.max = 0
+    
+    def sample(self, depth: int) -> None:
+        with self._lock:
+            self.samples += 1
+            self.total += depth
+            self.max = max(self.max, depth)
+    
+    def to_dict(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                'max': self.max,
+                'avg': self.total / self.samples if self.samples else 0.0
+            }
+
+class BatchPipeline:
+    """
+    Decode, model ve kaydetme aşamalarını örtüştüren toplu analiz motoru
+    
+    - Decode: thread havuzu görselleri önceden açar ve küçültür (prefetch)
+    - Model: çağıran thread, hazır görselleri batch_size gruplarla işler
+    - Kaydetme: thread havuzu JPEG ve metadata yazımını arka planda yapar
+    
+    Aşamalar sınırlı kuyruklarla bağlıdır; böylece bellek kullanımı
+    pipeline_queue_size ile sınırlı kalır.
+    """
+    
+    def __init__(
+        self,
+        analyzer,
+        decode_workers: Optional[int] = None,
+        write_workers: Optional[int] = None,
+        queue_size: Optional[int] = None
+    ):
+        """
+        Pipeline'ı başlat
+        
+        Args:
+            analyzer (ImageAnalyzer): Kullanılacak analyzer
+            decode_workers (int, optional): Decode thread sayısı
+            write_workers (int, optional): Kaydetme thread sayısı
+            queue_size (int, optional): Aşamalar arası kuyruk kapasitesi
+        """
+        config = analyzer.analysis_config
+        self.analyzer = analyzer
+        self.batch_size = max(1, config.batch_size)
+        self.decode_workers = max(1, decode_workers or config.decode_workers)
+        self.write_workers = max(1, write_workers or config.write_workers)
+        self.queue_size = max(self.batch_size, queue_size or config.pipeline_queue_size)
+        self.stats: Dict[str, Any] = {}
+    
+    def run(
+        self,
+        image_paths: Iterable[str],
+        save_results: bool = False,
+        progress: Optional[ProgressTracker] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Görselleri pipeline üzerinden analiz et
+        
+        Args:
+            image_paths (Iterable[str]): Görsel dosya yolları (tembel olabilir)
+            save_results (bool): Sonuçları kaydet
+            progress (ProgressTracker, optional): İlerleme göstergesi
+        
+        Returns:
+            List[dict]: Girdi sırasıyla analiz sonuçları
+        """
+        return list(self.stream(image_paths, save_results, progress))
+    
+    def stream(
+        self,
+        image_paths: Iterable[str],
+        save_results: bool = False,
+        progress: Optional[ProgressTracker] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Görselleri pipeline üzerinden analiz et, sonuçları hazır oldukça döndür
+        
+        Kaydetme arka planda sürer; save_results açıkken bir sonuç ancak
+        kaydı bitip 'saved' alanı dolduktan sonra döndürülür. Böylece
+        çağıran (ör. JobManifest) diske yazılmamış bir görseli tamamlanmış
+        sayamaz. Kayıt beklenirken çıkarım bir sonraki batch ile sürer.
+        
+        Args:
+            image_paths (Iterable[str]): Görsel dosya yolları (tembel olabilir)
+            save_results (bool): Sonuçları kaydet
+            progress (ProgressTracker, optional): İlerleme göstergesi
+        
+        Yields:
+            dict: Girdi sırasıyla analiz sonucu
+        """
+        decode_stats = _StageStats()
+        infer_stats = _StageStats()
+        write_stats = _StageStats()
+        decode_depth = _DepthStats()
+        write_depth = _DepthStats()
+        model_wait = _StageStats()
+        
+        decoded: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        write_slots = threading.BoundedSemaphore(self.queue_size)
+        pending_writes = [0]
+        pending_lock = threading.Lock()
+        stop = threading.Event()
+        feeder_error: List[Exception] = []
+        
+        decode_pool = ThreadPoolExecutor(self.decode_workers, thread_name_prefix="decode")
+        write_pool = ThreadPoolExecutor(self.write_workers, thread_name_prefix="write")
+        
+        def decode(image_path):
+            start = time.perf_counter()
+            try:
+                return self.analyzer._prepare_image(image_path)
+            finally:
+                decode_stats.add(time.perf_counter() - start)
+        
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    decoded.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def feed():
+            try:
+                for image_path in image_paths:
+                    if not put((image_path, decode_pool.submit(decode, image_path))):
+                        return
+            except Exception as e:
+                feeder_error.append(e)
+            finally:
+                put(_DONE)
+        
+        def write(result):
+            start = time.perf_counter()
+            try:
+                self.analyzer._save_result(result)
+            finally:
+                write_stats.add(time.perf_counter() - start)
+                with pending_lock:
+                    pending_writes[0] -= 1
+                write_slots.release()
+        
+        def submit_write(result):
+            write_slots.acquire()
+            with pending_lock:
+                pending_writes[0] += 1
+                write_depth.sample(pending_writes[0])
+            return write_pool.submit(write, result)
+        
+        def infer(batch):
+            # Decode sonuçlarını sırayla bekle
+            wait_start = time.perf_counter()
+            ready = [(image_path, future.result()) for image_path, future in batch]
+            model_wait.add(time.perf_counter() - wait_start, 0)
+            
+            batch_results = [result for _, (result, _) in ready]
+            prepared = [(i, entry) for i, (_, (_, entry)) in enumerate(ready) if entry is not None]
+            
+            if prepared:
+                start = time.perf_counter()
+                try:
+                    inferred = self.analyzer._infer_prepared([entry for _, entry in prepared])
+                    for (i, _), result in zip(prepared, inferred):
+                        batch_results[i] = result
+                except Exception as e:
+                    logger.warning(f"Batch analiz hatası, tekli moda geçiliyor: {str(e)}")
+                    for i, _ in prepared:
+                        batch_results[i] = self.analyzer.analyze_image(ready[i][0])
+                infer_stats.add(time.perf_counter() - start, len(prepared))
+            
+            written = []
+            for (image_path, _), result in zip(ready, batch_results):
+                result['file_path'] = image_path
+                
+                write_future = None
+                if save_results and result['success']:
+                    write_future = submit_write(result)
+                written.append((result, write_future))
+                
+                if progress is not None:
+                    progress.update()
+            return written
+        
+        processed = 0
+        wall_start = time.perf_counter()
+        feeder = threading.Thread(target=feed, name="pipeline-feeder", daemon=True)
+        feeder.start()
+        
+        # Kaydı süren sonuçlar; girdi sırası korunarak baştan, kaydı bitince döndürülür
+        unsaved: "deque" = deque()
+        
+        def finished(wait_all: bool):
+            while unsaved and (wait_all or unsaved[0][1] is None or unsaved[0][1].done()):
+                result, write_future = unsaved.popleft()
+                if write_future is not None:
+                    write_future.result()
+                yield result
+        
+        try:
+            batch = []
+            while True:
+                decode_depth.sample(decoded.qsize())
+                item = decoded.get()
+                if item is _DONE:
+                    break
+                
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    unsaved.extend(infer(batch))
+                    batch = []
+                    for result in finished(wait_all=False):
+                        processed += 1
+                        yield result
+            
+            if batch:
+                unsaved.extend(infer(batch))
+            for result in finished(wait_all=True):
+                processed += 1
+                yield result
+        finally:
+            stop.set()
+            feeder.join()
+            decode_pool.shutdown(wait=True)
+            write_pool.shutdown(wait=True)
+        
+        if feeder_error:
+            raise feeder_error[0]
+        
+        self.stats = {
+            'images': processed,
+            'wall_seconds': time.perf_counter() - wall_start,
+            'model_wait_seconds': model_wait.to_dict()['busy_seconds'],
+            'stages': {
+                'decode': decode_stats.to_dict(),
+                'infer': infer_stats.to_dict(),
+                'write': write_stats.to_dict()
+            },
+            'queues': {
+                'decode': decode_depth.to_dict(),
+                'write': write_depth.to_dict()
+            }
+        }
+    
+    def format_stats(self) -> str:
+        """
+        Son çalıştırmanın aşama sürelerini ve kuyruk derinliklerini metin olarak döndür
+        
+        Returns:
+            str: Okunabilir özet
+        """
+        if not self.stats:
+            return "Pipeline henüz çalıştırılmadı"
+        
+        lines = [
+            f"⏱️ Pipeline: {self.stats['images']} görsel, "
+            f"{self.stats['wall_seconds']:.2f} sn "
+            f"(modelin decode beklemesi: {self.stats['model_wait_seconds']:.2f} sn)"
+        ]
+        for stage, stage_stats in self.stats['stages'].items():
+            lines.append(
+                f"  {stage:<7} meşgul {stage_stats['busy_seconds']:.2f} sn, "
+                f"{stage_stats['items']} öğe, ort. {stage_stats['avg_ms']:.1f} ms"
+            )
+        for name, depth in self.stats['queues'].items():
+            lines.append(
+                f"  {name} kuyruğu: maks {depth['max']}, ort. {depth['avg']:.1f} "
+                f"(kapasite {self.queue_size})"
+            )
+        return "\n".join(lines)
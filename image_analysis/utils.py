@@ -7,7 +7,7 @@ import os
 import re
 from pathlib import Path
 from PIL import Image
-from typing import Union, List, Optional, Tuple
+from typing import Union, List, Optional, Tuple, Iterator
 from datetime import datetime
 
 from .exceptions import ImageProcessingError, FileOperationError, ValidationError
@@ -19,6 +19,18 @@ class ImageUtils:
     
     SUPPORTED_FORMATS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tiff'}
     
+    RESAMPLE_FILTERS = {
+        'nearest': Image.Resampling.NEAREST,
+        'box': Image.Resampling.BOX,
+        'bilinear': Image.Resampling.BILINEAR,
+        'hamming': Image.Resampling.HAMMING,
+        'bicubic': Image.Resampling.BICUBIC,
+        'lanczos': Image.Resampling.LANCZOS
+    }
+    
+    # JPEG'ler DCT ölçekleme ile hedef boyutun en az bu katına kadar küçültülerek açılır
+    DRAFT_REDUCING_GAP = 2
+    
     @staticmethod
     def validate_image_path(image_path: str) -> bool:
         """
@@ -50,10 +62,59 @@ class ImageUtils:
         
         return True
     
+    @staticmethod
+    def get_resample_filter(name: str) -> int:
+        """
+        Yeniden boyutlandırma filtresini adından çözümle
+        
+        Args:
+            name (str): Filtre adı (nearest, box, bilinear, hamming, bicubic, lanczos)
+            
+        Returns:
+            int: PIL resample sabiti
+            
+        Raises:
+            ValidationError: Bilinmeyen filtre adı
+        """
+        try:
+            return ImageUtils.RESAMPLE_FILTERS[name.lower()]
+        except (KeyError, AttributeError):
+            raise ValidationError("resample", str(name), ", ".join(ImageUtils.RESAMPLE_FILTERS))
+    
+    @staticmethod
+    def draft_for_size(img: Image.Image, max_size: int) -> None:
+        """
+        Henüz decode edilmemiş JPEG'i hedef boyuta yakın açılacak şekilde ayarla
+        
+        libjpeg DCT ölçekleme (1/2, 1/4, 1/8) ile tam çözünürlükte decode
+        atlanır; görsel en uzun kenarı max_size * DRAFT_REDUCING_GAP altına
+        inmeyecek kadar küçültülür. JPEG dışı formatlarda etkisizdir.
+        
+        Args:
+            img (PIL.Image): Image.open ile açılmış görsel (yerinde değişir)
+            max_size (int): Hedef maksimum boyut
+        """
+        if img.format != 'JPEG':
+            return
+        
+        target = max_size * ImageUtils.DRAFT_REDUCING_GAP
+        width, height = img.size
+        longest = max(width, height)
+        if longest <= target:
+            return
+        
+        # En-boy oranını koruyan hedef kutu (thumbnail ile aynı mantık)
+        img.draft('RGB', (
+            max(1, -(-width * target // longest)),
+            max(1, -(-height * target // longest))
+        ))
+    
     @staticmethod
     def preprocess_image(
         input_image: Union[str, np.ndarray, Image.Image], 
-        max_size: int = 512
+        max_size: int = 512,
+        resample: str = "lanczos",
+        fast_decode: bool = True
     ) -> Image.Image:
         """
         Görseli işleme için hazırla
@@ -61,6 +122,8 @@ class ImageUtils:
         Args:
             input_image: Görsel (dosya yolu, numpy array veya PIL Image)
             max_size (int): Maksimum boyut
+            resample (str): Küçültme filtresi
+            fast_decode (bool): JPEG dosyalarını draft modunda (küçültülerek) aç
             
         Returns:
             PIL.Image: İşlenmiş görsel
@@ -69,10 +132,15 @@ class ImageUtils:
             ImageProcessingError: İşleme hatası
         """
         try:
+            resample_filter = ImageUtils.get_resample_filter(resample)
+            
             # Tip kontrolü ve dönüşüm
             if isinstance(input_image, str):
                 ImageUtils.validate_image_path(input_image)
-                raw_image = Image.open(input_image).convert('RGB')
+                with Image.open(input_image) as img:
+                    if fast_decode:
+                        ImageUtils.draft_for_size(img, max_size)
+                    raw_image = img.convert('RGB')
             elif isinstance(input_image, np.ndarray):
                 raw_image = Image.fromarray(input_image.astype('uint8')).convert('RGB')
             elif isinstance(input_image, Image.Image):
@@ -86,7 +154,7 @@ class ImageUtils:
             
             # Boyut kontrolü ve yeniden boyutlandırma
             if max(raw_image.size) > max_size:
-                raw_image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+                raw_image.thumbnail((max_size, max_size), resample_filter)
             
             return raw_image
             
@@ -95,6 +163,50 @@ class ImageUtils:
                 raise
             raise ImageProcessingError(str(input_image), str(e))
     
+    @staticmethod
+    def load_image(
+        input_image: Union[str, np.ndarray, Image.Image], 
+        max_size: int = 512,
+        resample: str = "lanczos",
+        fast_decode: bool = True
+    ) -> Tuple[Image.Image, dict]:
+        """
+        Görseli tek seferde aç, bilgilerini al ve işleme için hazırla
+        
+        Dosya yolu verildiğinde dosya yalnızca bir kez açılır; bilgiler
+        (orijinal boyutlarla) ve ön işlenmiş görsel aynı açılıştan elde edilir.
+        
+        Args:
+            input_image: Görsel (dosya yolu, numpy array veya PIL Image)
+            max_size (int): Maksimum boyut
+            resample (str): Küçültme filtresi
+            fast_decode (bool): JPEG dosyalarını draft modunda (küçültülerek) aç
+            
+        Returns:
+            Tuple[PIL.Image, dict]: İşlenmiş görsel ve görsel bilgileri
+            
+        Raises:
+            ImageProcessingError: İşleme hatası
+        """
+        if not isinstance(input_image, str):
+            image_info = ImageUtils.get_image_info(input_image)
+            return ImageUtils.preprocess_image(input_image, max_size, resample), image_info
+        
+        ImageUtils.validate_image_path(input_image)
+        try:
+            with Image.open(input_image) as img:
+                image_info = ImageUtils.get_image_info(img)
+                image_info['file_size'] = os.path.getsize(input_image)
+                if fast_decode:
+                    ImageUtils.draft_for_size(img, max_size)
+                processed_image = ImageUtils.preprocess_image(img, max_size, resample)
+        except Exception as e:
+            if isinstance(e, (ValidationError, ImageProcessingError)):
+                raise
+            raise ImageProcessingError(input_image, str(e))
+        
+        return processed_image, image_info
+    
     @staticmethod
     def get_image_info(image: Union[str, Image.Image, np.ndarray]) -> dict:
         """
@@ -189,29 +301,36 @@ class FileUtils:
         return safe_text
     
     @staticmethod
-    def get_unique_filepath(file_path: str) -> str:
+    def get_unique_filepath(file_path: str, reserve: bool = False) -> str:
         """
         Benzersiz dosya yolu oluştur
         
         Args:
             file_path (str): Dosya yolu
+            reserve (bool): Dosyayı atomik olarak oluşturup adı ayır
+                (eşzamanlı kaydeden süreç/thread'ler aynı adı almasın)
             
         Returns:
             str: Benzersiz dosya yolu
         """
-        if not os.path.exists(file_path):
-            return file_path
-        
         base_path = Path(file_path)
         name = base_path.stem
         ext = base_path.suffix
         parent = base_path.parent
         
+        candidate = file_path
         counter = 1
         while True:
-            new_path = parent / f"{name}_{counter}{ext}"
-            if not new_path.exists():
-                return str(new_path)
+            if reserve:
+                try:
+                    os.close(os.open(candidate, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                    return candidate
+                except FileExistsError:
+                    pass
+            elif not os.path.exists(candidate):
+                return candidate
+            
+            candidate = str(parent / f"{name}_{counter}{ext}")
             counter += 1
     
     @staticmethod
@@ -281,39 +400,72 @@ class FileUtils:
             raise FileOperationError("save_metadata", file_path, str(e))
     
     @staticmethod
-    def find_images_in_directory(directory: str, recursive: bool = False) -> List[str]:
+    def iter_images_in_directory(directory: str, recursive: bool = False) -> Iterator[str]:
         """
-        Klasörde görsel dosyalarını bul
+        Klasördeki görsel dosyalarını tek geçişte, tembel olarak üret
+        
+        os.scandir ile her klasör bir kez okunur; uzantı eşleşmesi büyük/küçük
+        harf duyarsızdır. Liste bellekte tutulmaz, ilk dosya hemen döner.
+        Klasör doğrulaması çağrı anında yapılır, ilk next() beklenmez.
         
         Args:
             directory (str): Klasör yolu
             recursive (bool): Alt klasörleri de tara
             
         Returns:
-            List[str]: Görsel dosya yolları
+            Iterator[str]: Görsel dosya yolları
         """
-        if not os.path.exists(directory):
+        if not os.path.isdir(directory):
             raise ValidationError("directory", directory, "existing directory")
+        if not os.access(directory, os.R_OK | os.X_OK):
+            raise ValidationError("directory", directory, "readable directory")
         
-        image_files = []
-        search_pattern = "**/*" if recursive else "*"
+        return FileUtils._scan_images(directory, recursive)
+    
+    @staticmethod
+    def _scan_images(directory: str, recursive: bool) -> Iterator[str]:
+        """Doğrulanmış klasörü tara ve görsel yollarını üret"""
+        pending = [directory]
+        while pending:
+            current = pending.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        try:
+                            # Sembolik bağlantılı klasörler döngü oluşturabilir, izleme
+                            if entry.is_dir(follow_symlinks=False):
+                                if recursive:
+                                    pending.append(entry.path)
+                            elif (os.path.splitext(entry.name)[1].lower() in ImageUtils.SUPPORTED_FORMATS
+                                  and entry.is_file()):
+                                yield entry.path
+                        except OSError:
+                            continue
+            except OSError:
+                # Okunamayan alt klasörleri atla; kök klasör hatası yukarı iletilir
+                if current == directory:
+                    raise
+    
+    @staticmethod
+    def find_images_in_directory(directory: str, recursive: bool = False) -> List[str]:
+        """
+        Klasörde görsel dosyalarını bul
         
-        for ext in ImageUtils.SUPPORTED_FORMATS:
-            pattern = str(Path(directory) / search_pattern) + ext
-            image_files.extend(Path(directory).glob(pattern))
+        Args:
+            directory (str): Klasör yolu
+            recursive (bool): Alt klasörleri de tara
             
-            # Büyük harf versiyonları da ekle
-            pattern = str(Path(directory) / search_pattern) + ext.upper()
-            image_files.extend(Path(directory).glob(pattern))
-        
-        return [str(f) for f in image_files]
+        Returns:
+            List[str]: Görsel dosya yolları
+        """
+        return list(FileUtils.iter_images_in_directory(directory, recursive))
 
 class ProgressTracker:
     """
     İlerleme takibi için yardımcı sınıf
     """
     
-    def __init__(self, total: int, description: str = "Processing"):
+    def __init__(self, total: Optional[int], description: str = "Processing"):
         self.total = total
         self.current = 0
         self.description = description
@@ -325,6 +477,11 @@ class ProgressTracker:
     
     def _print_progress(self) -> None:
         """İlerlemeyi yazdır"""
+        # Toplam bilinmiyorsa (tembel dosya listesi) sadece sayacı göster
+        if not self.total:
+            print(f'\r{self.description}: {self.current} işlendi', end='')
+            return
+        
         percentage = (self.current / self.total) * 100
         bar_length = 30
         filled_length = int(bar_length * self.current // self.total)
@@ -0,0 +1,181 @@
+"""
+Arka plan model yükleyici - Sunucu hemen dinlemeye başlar, modeller arkada yüklenip ısınır
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+# Sürecin başlangıcı (bu modül giriş noktalarında ilk içe aktarılanlardandır)
+PROCESS_START = time.perf_counter()
+
+_events: Dict[str, float] = {}
+_events_lock = threading.Lock()
+
+def mark_startup(event: str) -> float:
+    """
+    Başlangıçtan bu yana geçen süreyi kaydet ve yazdır
+    
+    Args:
+        event (str): Olay adı (ör. "dinleme", "sohbet hazır")
+    
+    Returns:
+        float: Başlangıçtan geçen süre (saniye)
+    """
+    elapsed = time.perf_counter() - PROCESS_START
+    with _events_lock:
+        _events[event] = elapsed
+    print(f"⏱️ Başlangıç → {event}: {elapsed:.2f} sn")
+    return elapsed
+
+def startup_timings() -> Dict[str, float]:
+    """
+    Kaydedilen başlangıç olayları
+    
+    Returns:
+        dict: Olay adı -> başlangıçtan geçen süre (saniye)
+    """
+    with _events_lock:
+        return dict(_events)
+
+class BackgroundLoader:
+    """
+    Bir modeli arka plan thread'inde yükleyip ısıtan tembel yükleyici
+    
+    Durumlar: bekliyor → yükleniyor → ısınıyor → hazır (ya da hata).
+    get() çağrısı yükleme başlamadıysa başlatır ve hazır olana kadar bekler;
+    aynı model iki kez yüklenmez.
+    """
+    
+    PENDING = "bekliyor"
+    LOADING = "yükleniyor"
+    WARMING_UP = "ısınıyor"
+    READY = "hazır"
+    FAILED = "hata"
+    
+    def __init__(
+        self,
+        name: str,
+        load_fn: Callable[[], Any],
+        warmup_fn: Optional[Callable[[Any], Any]] = None
+    ):
+        """
+        Yükleyiciyi oluştur (yükleme start() ile başlar)
+        
+        Args:
+            name (str): Görünen ad (ör. "Sohbet botları")
+            load_fn (callable): Yüklenen nesneyi döndüren fonksiyon
+            warmup_fn (callable, optional): Yüklenen nesneyle sentetik bir çalıştırma
+        """
+        self.name = name
+        self.load_fn = load_fn
+        self.warmup_fn = warmup_fn
+        
+        self.state = self.PENDING
+        self.error: Optional[Exception] = None
+        self.load_seconds: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+        
+        self._value: Any = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> "BackgroundLoader":
+        """
+        Yüklemeyi arka planda başlat (birden fazla çağrı güvenlidir)
+        
+        Returns:
+            BackgroundLoader: Zincirleme kullanım için kendisi
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"loader-{self.name}", daemon=True
+                )
+                self._thread.start()
+        return self
+    
+    def _run(self) -> None:
+        """Yükle, ısıt ve hazır olduğunu bildir"""
+        try:
+            self.state = self.LOADING
+            print(f"⏳ {self.name} yükleniyor...")
+            start = time.perf_counter()
+            value = self.load_fn()
+            self.load_seconds = time.perf_counter() - start
+            
+            if self.warmup_fn is not None:
+                self.state = self.WARMING_UP
+                start = time.perf_counter()
+                try:
+                    self.warmup_fn(value)
+                except Exception as e:
+                    # Isınma başarısızsa model yine de kullanılabilir
+                    print(f"⚠️ {self.name} ısınma hatası: {str(e)}")
+                self.warmup_seconds = time.perf_counter() - start
+            
+            self._value = value
+            self.state = self.READY
+            mark_startup(f"{self.name} hazır")
+        except Exception as e:
+            self.error = e
+            self.state = self.FAILED
+            print(f"❌ {self.name} yüklenemedi: {str(e)}")
+        finally:
+            self._ready.set()
+    
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """
+        Yüklenen nesneyi getir; gerekirse yüklemeyi başlatıp bekle
+        
+        Args:
+            timeout (float, optional): En fazla bekleme süresi (saniye)
+        
+        Returns:
+            Any: load_fn'in döndürdüğü nesne
+        
+        Raises:
+            TimeoutError: Süre içinde hazır olmazsa
+            Exception: Yükleme hatası (olduğu gibi)
+        """
+        self.start()
+        if not self._ready.wait(timeout):
+            raise TimeoutError(f"{self.name} henüz hazır değil ({self.state})")
+        if self.error is not None:
+            raise self.error
+        return self._value
+    
+    @property
+    def is_ready(self) -> bool:
+        """Model kullanıma hazır mı?"""
+        return self.state == self.READY
+    
+    def status(self) -> Dict[str, Any]:
+        """
+        Yükleme durumu
+        
+        Returns:
+            dict: Durum, hata ve yükleme/ısınma süreleri
+        """
+        return {
+            'name': self.name,
+            'state': self.state,
+            'error': str(self.error) if self.error else None,
+            'load_seconds': self.load_seconds,
+            'warmup_seconds': self.warmup_seconds
+        }
+    
+    def describe(self) -> str:
+        """
+        Arayüzde gösterilecek kısa durum metni
+        
+        Returns:
+            str: Ör. "✅ Sohbet botları hazır (12.3 sn)"
+        """
+        if self.state == self.READY:
+            total = (self.load_seconds or 0.0) + (self.warmup_seconds or 0.0)
+            return f"✅ {self.name} hazır ({total:.1f} sn)"
+        if self.state == self.FAILED:
+            return f"❌ {self.name} yüklenemedi: {self.error}"
+        return f"⏳ {self.name} {self.state}..."
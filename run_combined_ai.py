@@ -3,10 +3,15 @@ Birleşik AI Modülleri - Görsel Analiz + ChatGPT Benzeri Sohbet
 Ana uygulama launcher'ı
 """
 
+from model_loader import mark_startup, startup_timings
 import gradio as gr
-from gradio_interface import create_gradio_interface as create_image_interface
-from chatbot_gradio_interface import create_chatbot_interface
+from gradio_interface import create_gradio_interface as create_image_interface, batcher_loader, use_model_registry
+from chatbot_gradio_interface import create_chatbot_interface, conversation_loader
 import sys
+from typing import Optional
+
+# Arka planda yüklenen modeller (sohbet + görsel analiz)
+_LOADERS = (conversation_loader, batcher_loader)
 
 def create_combined_interface():
     """
@@ -113,7 +118,8 @@ def create_combined_interface():
                     chat_with_bot,
                     analyze_image_and_chat,
                     clear_conversation,
-                    get_conversation_list
+                    get_conversation_list,
+                    search_conversations
                 )
                 
                 with gr.Row():
@@ -155,7 +161,12 @@ def create_combined_interface():
                         </div>
                         """)
                         
-                        # Konuşma geçmişi
+                        # Konuşma geçmişi ve arama
+                        history_search = gr.Textbox(
+                            label="🔎 Geçmişte Ara",
+                            placeholder="Kelime yazıp Enter'a basın"
+                        )
+                        
                         conv_history = gr.Textbox(
                             label="📋 Konuşma Geçmişi",
                             lines=8,
@@ -185,6 +196,12 @@ def create_combined_interface():
                     outputs=[conv_history]
                 )
                 
+                history_search.submit(
+                    search_conversations,
+                    inputs=[history_search],
+                    outputs=[conv_history]
+                )
+                
             except ImportError as e:
                 gr.HTML(f"<p style='color: red;'>❌ Sohbet botu modülü yüklenemedi: {str(e)}</p>")
         
@@ -253,13 +270,30 @@ def create_combined_interface():
                     </div>
                     """
                     
-                    module_html = """
+                    # Modellerin hazır olma durumu ve başlangıç süreleri
+                    loader_lines = "".join(f"<p>{loader.describe()}</p>" for loader in _LOADERS)
+                    memory_line = ""
+                    if conversation_loader.is_ready or batcher_loader.is_ready:
+                        from chatbot_module.registry import model_registry
+                        memory = model_registry.get_memory_stats()
+                        budget = f"{memory['budget_mb']:.0f} MB" if memory['budget_mb'] else "sınırsız"
+                        memory_line = (
+                            f"<p>💾 Modeller (BLIP + sohbet): {memory['loaded_mb']:.0f} MB / {budget} - "
+                            f"{memory['loaded_models']}/{memory['registered_models']} yüklü, "
+                            f"{memory['evictions']} çıkarma, {memory['reloads']} yeniden yükleme</p>"
+                        )
+                    timing_lines = "".join(
+                        f"<p>⏱️ Başlangıç → {event}: {seconds:.1f} sn</p>"
+                        for event, seconds in startup_timings().items()
+                    )
+                    module_html = f"""
                     <div style="padding: 20px; background: #e8f5e8; border-radius: 10px;">
                         <h4>📦 Modül Durumu</h4>
-                        <p>✅ Görsel Analiz Modülü</p>
-                        <p>✅ ChatGPT Sohbet Modülü</p>
+                        {loader_lines}
+                        {memory_line}
                         <p>✅ Gradio Arayüz</p>
                         <p>✅ Birleşik AI Hub</p>
+                        {timing_lines}
                     </div>
                     """
                     
@@ -294,28 +328,51 @@ def create_combined_interface():
 def launch_combined_app(
     server_name: str = "0.0.0.0",
     server_port: int = 7862,
-    share: bool = False
+    share: bool = False,
+    concurrency_limit: int = 8,
+    memory_budget_mb: Optional[float] = None
 ):
     """
     Birleşik AI uygulamasını başlat
     
+    Modeller arka planda yüklenir; sunucu yükleme bitmeden dinlemeye başlar.
+    
     Args:
         server_name (str): Sunucu adı
         server_port (int): Port numarası  
         share (bool): Public link oluştur
+        concurrency_limit (int): Eşzamanlı istek sayısı (AnalysisConfig.micro_batch_size)
+        memory_budget_mb (float, optional): BLIP ve sohbet modelleri için ortak bellek
+            bütçesi (MB); aşılınca en uzun süredir kullanılmayan model çıkarılır
     """
     print("🚀 AI Modülleri Hub başlatılıyor...")
     print("📸 Görsel Analiz + 💬 ChatGPT Sohbet")
     
+    # BLIP ve sohbet modelleri tek bütçeyi paylaşır
+    from chatbot_module.registry import model_registry
+    use_model_registry(model_registry)
+    if memory_budget_mb:
+        model_registry.set_memory_budget(memory_budget_mb)
+    
+    for loader in _LOADERS:
+        loader.start()
+    
     interface = create_combined_interface()
     
+    # Eşzamanlı görsel isteklerinin mikro-batch kuyruğuna ulaşabilmesi için
+    interface.queue(default_concurrency_limit=concurrency_limit)
+    
     interface.launch(
         server_name=server_name,
         server_port=server_port,
         share=share,
         show_api=False,
-        favicon_path=None
+        favicon_path=None,
+        prevent_thread_lock=True
     )
+    
+    mark_startup("dinleme")
+    interface.block_thread()
 
 if __name__ == "__main__":
     launch_combined_app()
\ No newline at end of file